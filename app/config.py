@@ -1,6 +1,7 @@
 """
 应用配置文件
 """
+import os
 from pydantic_settings import BaseSettings
 from typing import Optional
 from dotenv import load_dotenv
@@ -19,12 +20,22 @@ class Settings(BaseSettings):
     PORT: int = 8000
     
     # 数据库配置
-    MYSQL_HOST: str
+    MYSQL_HOST: str = "localhost"
     MYSQL_PORT: int = 3306
-    MYSQL_USER: str
-    MYSQL_PASSWORD: str
+    MYSQL_USER: str = "root"
+    MYSQL_PASSWORD: str = "password"
     MYSQL_DATABASE: str = "pokemon_api"
     
+    # 连接池配置（同步、异步引擎各自持有一个池，均使用这组参数）
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 3600
+    # True: 每次取连接先 ping 一次（悲观）；False: 只依赖 recycle 定期回收（乐观）
+    DB_POOL_PRE_PING: bool = True
+    # True: 优先复用最近归还的连接，空闲连接能按 recycle 自然淘汰
+    DB_POOL_USE_LIFO: bool = False
+    
     # 安全配置
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
     ALGORITHM: str = "HS256"
@@ -34,11 +45,39 @@ class Settings(BaseSettings):
     SCRAPER_DELAY: float = 1.0
     SCRAPER_MAX_RETRIES: int = 3
     SCRAPER_TIMEOUT: int = 30
+    # 异步爬虫：同时进行的请求数和每秒请求数上限（令牌桶，<=0 表示不限速）
+    SCRAPER_CONCURRENCY: int = 10
+    SCRAPER_RATE_LIMIT: float = 20.0
+    POKEAPI_BASE_URL: str = "https://pokeapi.co/api/v2"
+    # 解析进程数（JSON 解码 + 字段转换），默认与CPU核数相同；0 表示在事件循环线程内直接解析
+    SCRAPER_PARSE_WORKERS: int = os.cpu_count() or 1
+    # 响应磁盘缓存：default 有效期内直接使用、过期后条件请求验证；offline 只读缓存；off 关闭
+    SCRAPER_CACHE_DIR: str = ".cache/pokeapi"
+    SCRAPER_CACHE_MODE: str = "default"
+    SCRAPER_CACHE_MAX_AGE: float = 86400.0
+    # 可续跑爬取任务（python scraper.py crawl/resume）的进度文件
+    SCRAPER_STATE_FILE: str = ".cache/crawl_state.json"
+    
+    # 批量写入：每个事务 upsert 的行数
+    BULK_CHUNK_SIZE: int = 500
+    
+    # 种子数据快照目录（manifest.json + 每表一个 gzip NDJSON 文件），init_db.py 按版本导入
+    SEED_SNAPSHOT_DIR: str = "data/seed"
     
     # 分页配置
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
     
+    # 详情缓存配置
+    DETAIL_CACHE_SIZE: int = 4096
+    DETAIL_CACHE_TTL: float = 300.0
+    # 内存索引（名称搜索、输入提示、种族值统计与分析）检查表数据版本的间隔秒数，
+    # 其他进程写入的数据最多延迟这么久可见；0 表示每次请求都检查
+    INDEX_REFRESH_INTERVAL: float = 1.0
+    
+    # 启动时将全部数据预加载到内存，GET 请求不再访问数据库
+    PRELOAD_CATALOG: bool = False
+    
     # 跨域配置
     CORS_ORIGINS: list = ["*"]
     
@@ -3,6 +3,7 @@
 """
 from typing import List, Optional
 from sqlalchemy.orm import Session
+from sqlalchemy import select, Select
 
 from app.crud.base import CRUDBase
 from app.models.pokemon import Ability
@@ -10,6 +11,11 @@ from app.schemas import AbilityCreate, AbilityUpdate
 
 
 class CRUDAbility(CRUDBase[Ability, AbilityCreate, AbilityUpdate]):
+    cursor_field = "ability_id"
+    number_field = "ability_id"
+    index_fields = {"generation": ("generation",)}
+    search_fields = ("name", "english_name", "japanese_name")
+
     def get_by_ability_id(self, db: Session, *, ability_id: int) -> Optional[Ability]:
         return db.query(Ability).filter(Ability.ability_id == ability_id).first()
 
@@ -32,6 +38,17 @@ class CRUDAbility(CRUDBase[Ability, AbilityCreate, AbilityUpdate]):
     def get_count_by_generation(self, db: Session, *, generation: str) -> int:
         return db.query(Ability).filter(Ability.generation == generation).count()
 
+    def _filter_statement(
+        self,
+        stmt: Select,
+        *,
+        generation: Optional[str] = None
+    ) -> Select:
+        if generation:
+            stmt = stmt.where(Ability.generation == generation)
+
+        return stmt
+
     def get_with_filters(
         self,
         db: Session,
@@ -40,12 +57,8 @@ class CRUDAbility(CRUDBase[Ability, AbilityCreate, AbilityUpdate]):
         limit: int = 100,
         generation: Optional[str] = None
     ) -> List[Ability]:
-        query = db.query(Ability)
-
-        if generation:
-            query = query.filter(Ability.generation == generation)
-
-        return query.offset(skip).limit(limit).all()
+        stmt = self._filter_statement(select(Ability), generation=generation)
+        return db.execute(stmt.offset(skip).limit(limit)).scalars().all()
 
     def get_count_with_filters(
         self,
@@ -53,12 +66,7 @@ class CRUDAbility(CRUDBase[Ability, AbilityCreate, AbilityUpdate]):
         *,
         generation: Optional[str] = None
     ) -> int:
-        query = db.query(Ability)
-
-        if generation:
-            query = query.filter(Ability.generation == generation)
-
-        return query.count()
+        return self.get_filtered_count(db, generation=generation)
 
 
 ability_crud = CRUDAbility(Ability)
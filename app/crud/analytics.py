@@ -0,0 +1,195 @@
+"""
+种族值分析：全部宝可梦的数值列存成 NumPy 数组，百分位、排名、Top-K、直方图、z-score 向量化计算
+"""
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.crud.pokemon import pokemon_crud
+
+NUMERIC_FIELDS = (
+    "hp", "attack", "defense", "sp_attack", "sp_defense", "speed", "total_stats",
+    "height", "weight", "catch_rate",
+)
+# 随数值一起返回、用于标识宝可梦的列
+LABEL_FIELDS = ("id", "national_dex", "name", "english_name", "type1", "type2")
+
+
+def _number(value: Any) -> Optional[float]:
+    """NumPy 标量转成可直接输出的 Python 数值：NaN 为 None，整数值（种族值等）输出为 int"""
+    value = float(value)
+    if np.isnan(value):
+        return None
+    return int(value) if value.is_integer() else round(value, 4)
+
+
+class StatMatrix:
+    """全部宝可梦数值列的不可变快照
+
+    每个数值列一个 float64 数组（空值为 NaN），行按图鉴编号排列；
+    属性编码成整数数组，按属性筛选是一次向量比较。
+    快照构造后不再修改，数据变化时整体重建，读请求看到的要么是旧快照要么是新快照。
+    """
+
+    __slots__ = ("columns", "labels", "type1", "type2", "type_codes", "positions")
+
+    def __init__(self, records: List[dict]):
+        records = sorted(records, key=lambda record: record["national_dex"])
+        self.columns: Dict[str, np.ndarray] = {
+            field: np.array(
+                [np.nan if record[field] is None else record[field] for record in records], dtype=np.float64
+            )
+            for field in NUMERIC_FIELDS
+        }
+        self.labels: List[dict] = [{field: record[field] for field in LABEL_FIELDS} for record in records]
+        types = sorted({record[field] for record in records for field in ("type1", "type2") if record[field]})
+        self.type_codes: Dict[str, int] = {type: code for code, type in enumerate(types, start=1)}
+        # 0 表示没有第二属性
+        self.type1 = np.array([self.type_codes.get(record["type1"], 0) for record in records], dtype=np.int16)
+        self.type2 = np.array([self.type_codes.get(record["type2"], 0) for record in records], dtype=np.int16)
+        self.positions: Dict[int, int] = {record["id"]: position for position, record in enumerate(records)}
+
+    def mask(self, type_name: Optional[str]) -> np.ndarray:
+        """属性筛选的布尔掩码；未知属性得到全 False"""
+        if not type_name:
+            return np.ones(len(self.labels), dtype=bool)
+        code = self.type_codes.get(type_name)
+        if code is None:
+            return np.zeros(len(self.labels), dtype=bool)
+        return (self.type1 == code) | (self.type2 == code)
+
+    def values(self, field: str, type_name: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(行号, 数值)：筛选后去掉空值"""
+        column = self.columns[field]
+        selected = np.flatnonzero(self.mask(type_name) & ~np.isnan(column))
+        return selected, column[selected]
+
+    def percentiles(self, field: str, quantiles: Sequence[float], type_name: Optional[str] = None) -> dict:
+        _, values = self.values(field, type_name)
+        if not len(values):
+            return {"count": 0, "percentiles": {str(q): None for q in quantiles}}
+        result = np.percentile(values, quantiles)
+        return {
+            "count": int(len(values)),
+            "percentiles": {f"{q:g}": _number(value) for q, value in zip(quantiles, result)},
+        }
+
+    def rank(self, id: int, field: str, type_name: Optional[str] = None) -> Optional[dict]:
+        """名次（数值越大越靠前，并列取最好名次）和百分位（不高于该值的比例）"""
+        position = self.positions.get(id)
+        if position is None:
+            return None
+        value = self.columns[field][position]
+        _, values = self.values(field, type_name)
+        if np.isnan(value):
+            return {"value": None, "rank": None, "percentile": None, "count": int(len(values))}
+        return {
+            "value": _number(value),
+            "rank": int(np.count_nonzero(values > value)) + 1,
+            "percentile": _number(np.count_nonzero(values <= value) / len(values) * 100),
+            "count": int(len(values)),
+        }
+
+    def top(self, field: str, k: int, type_name: Optional[str] = None, ascending: bool = False) -> List[dict]:
+        """数值最大（ascending 时最小）的 k 只；argpartition 选出 k 个后只对这 k 个排序"""
+        selected, values = self.values(field, type_name)
+        if not len(values):
+            return []
+        keys = values if ascending else -values
+        k = min(k, len(values))
+        chosen = np.argpartition(keys, k - 1)[:k]
+        # 同值按图鉴编号（即行号）排列
+        chosen = chosen[np.lexsort((selected[chosen], keys[chosen]))]
+        return [
+            {**self.labels[selected[index]], field: _number(values[index])}
+            for index in chosen
+        ]
+
+    def histogram(self, field: str, bins: int, type_name: Optional[str] = None) -> dict:
+        _, values = self.values(field, type_name)
+        if not len(values):
+            return {"count": 0, "bins": []}
+        counts, edges = np.histogram(values, bins=bins)
+        return {
+            "count": int(len(values)),
+            "bins": [
+                {"from": _number(edges[index]), "to": _number(edges[index + 1]), "count": int(count)}
+                for index, count in enumerate(counts)
+            ],
+        }
+
+    def zscores(self, id: int, type_name: Optional[str] = None) -> Optional[dict]:
+        """该宝可梦每项数值相对（同属性）群体的 z-score：一次对全部数值列计算均值和标准差"""
+        position = self.positions.get(id)
+        if position is None:
+            return None
+        matrix = np.column_stack([self.columns[field] for field in NUMERIC_FIELDS])[self.mask(type_name)]
+        if not len(matrix):
+            return {field: None for field in NUMERIC_FIELDS}
+        row = np.array([self.columns[field][position] for field in NUMERIC_FIELDS])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.nanmean(matrix, axis=0)
+            stds = np.nanstd(matrix, axis=0)
+            scores = np.where(stds > 0, (row - means) / stds, np.nan)
+        return {
+            field: {"value": _number(value), "mean": _number(mean), "std": _number(std), "z": _number(score)}
+            for field, value, mean, std, score in zip(NUMERIC_FIELDS, row, means, stds, scores)
+        }
+
+
+class Analytics:
+    """管理数值列快照
+
+    首次查询时加载；写操作（本进程的增删改、批量写入）只把快照标记为失效，
+    下一次查询时从数据库重建一次，连续多次写入只触发一次重建。
+    其他进程的写入由表数据版本发现，同样在下一次查询时重建。
+    """
+
+    def __init__(self, crud: CRUDBase):
+        self.crud = crud
+        self._lock = threading.Lock()
+        self.matrix: Optional[StatMatrix] = None
+        self._version = None
+        crud.add_write_listener(self._on_write)
+
+    @property
+    def loaded(self) -> bool:
+        return self.matrix is not None
+
+    def load(self, db: Session, version: Any = None) -> StatMatrix:
+        """version 为读取前的表数据版本"""
+        columns = LABEL_FIELDS + NUMERIC_FIELDS
+        stmt = select(*(getattr(self.crud.model, column) for column in columns))
+        matrix = StatMatrix([dict(zip(columns, row)) for row in db.execute(stmt)])
+        with self._lock:
+            self.matrix = matrix
+            self._version = version
+        return matrix
+
+    def _current(self, version: Any) -> Optional[StatMatrix]:
+        with self._lock:
+            if self.matrix is not None and self.crud.version.is_current(self._version, version):
+                return self.matrix
+        return None
+
+    # 返回本次拿到的快照，期间被写操作置为失效也不影响当前请求
+    def ensure(self, db: Session) -> StatMatrix:
+        version = self.crud.version.current(db)
+        matrix = self._current(version)
+        return matrix if matrix is not None else self.load(db, version)
+
+    async def aensure(self, db: AsyncSession) -> StatMatrix:
+        version = await self.crud.version.acurrent(db)
+        matrix = self._current(version)
+        return matrix if matrix is not None else await db.run_sync(self.load, version)
+
+    def _on_write(self, db: Session, crud: CRUDBase, action: str, data: Optional[dict]):
+        with self._lock:
+            self.matrix = None
+
+pokemon_analytics = Analytics(pokemon_crud)
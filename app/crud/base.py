@@ -1,19 +1,70 @@
 """
 基础CRUD类
 """
-from typing import TypeVar, Generic, Type, Optional, List, Any
+from bisect import bisect_right
+from operator import itemgetter
+from typing import TypeVar, Generic, Type, Optional, List, Any, Tuple, Dict, Callable, Sequence, FrozenSet
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, or_, Select
+
+from app.config import settings
+from app.crud.cache import LRUCache
+from app.crud.search import SearchIndex
+from app.crud.version import TableVersion
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.serializer import RowSerializer, model_to_dict, public_columns, table_serializer
 
 ModelType = TypeVar("ModelType")
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
+WriteListener = Callable[[Session, Any, str, Optional[dict]], None]
 
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    # 游标分页使用的排序键，必须是带唯一索引的列
+    cursor_field: str = "id"
+    # 详情查询的别名字段：输入为整数时先按 number_field 查找，再依次尝试 alias_fields
+    number_field: Optional[str] = None
+    alias_fields: Tuple[str, ...] = ("name", "english_name")
+    # 内存目录的二级索引（筛选参数 -> 参与索引的列）
+    index_fields: Dict[str, Tuple[str, ...]] = {}
+    # 名称搜索字段，非空时为该表建立 n-gram 搜索索引（search 筛选参数）
+    search_fields: Tuple[str, ...] = ()
+    # 以 JOIN 派生表实现的筛选参数：总数若作为标量子查询附在每行上，派生表要再算一遍，
+    # 实测比单独 COUNT 慢一倍，因此带这些筛选时分页改为数据 + 计数两条查询
+    joined_filters: Tuple[str, ...] = ()
+
     def __init__(self, model: Type[ModelType]):
         self.model = model
+        # 列表/详情查询直接选取表的列，结果行交给预编译的序列化器，不再构造ORM实例
+        self.columns = tuple(public_columns(model.__table__))
+        self.serializer = table_serializer(model.__table__)
+        self._projections: Dict[FrozenSet[str], Tuple[tuple, RowSerializer]] = {}
+        self.cache = LRUCache(
+            maxsize=settings.DETAIL_CACHE_SIZE, ttl=settings.DETAIL_CACHE_TTL
+        )
+        # 由 app.crud.catalog 在预加载模式下设置，非空时读操作直接走内存
+        self.memory_table = None
+        self._write_listeners: List[WriteListener] = []
+        # 表数据版本：内存索引据此发现其他进程的写入
+        self.version = TableVersion(model)
+        self.search_index = SearchIndex(self) if self.search_fields else None
+
+    def add_write_listener(self, listener: "WriteListener"):
+        """注册写操作回调
+
+        create/update/remove 提交后以 (db, crud, action, data) 调用，
+        action 为 "create"/"update"/"remove"，data 是实体序列化后的字典
+        （remove 时为删除前的状态）；批量写入（app.crud.bulk）提交后
+        action 为 "bulk"、data 为 None，监听方应整体重建。
+        """
+        self._write_listeners.append(listener)
+
+    def _notify_write(self, db: Session, action: str, data: Optional[dict]):
+        for listener in self._write_listeners:
+            listener(db, self, action, data)
 
     def get(self, db: Session, id: int) -> Optional[ModelType]:
         return db.query(self.model).filter(self.model.id == id).first()
@@ -26,12 +77,477 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def get_count(self, db: Session) -> int:
         return db.query(func.count(self.model.id)).scalar()
 
+    def _filter_statement(self, stmt: Select, **filters: Any) -> Select:
+        """为查询语句追加筛选条件，子类按各自的筛选参数覆盖"""
+        return stmt
+
+    def _search_condition(self, query: str, fields: Optional[Sequence[str]] = None):
+        """名称搜索条件：索引已加载时用主键 IN，否则退回 ILIKE"""
+        fields = tuple(fields or self.search_fields)
+        index = self.search_index
+        if index is not None and index.ready and set(fields) == set(index.fields):
+            return index.condition(query)
+        return or_(*(getattr(self.model, field).ilike(f"%{query}%") for field in fields))
+
+    def _prepare_search(self, db: Session, filters: dict):
+        if filters.get("search") and self.search_index is not None:
+            self.search_index.ensure(db)
+
+    async def _aprepare_search(self, db: AsyncSession, filters: dict):
+        if filters.get("search") and self.search_index is not None:
+            await self.search_index.aensure(db)
+
+    def _index_search(self, filters: dict) -> Tuple[Optional[str], dict]:
+        """索引可用时把 search 从筛选参数中拆出来交给索引，其余筛选仍由SQL处理
+
+        命中集合可能很大（单字查询），因此不把它拼成 IN 列表：
+        先在索引里得到排好序的主键，分页后只按主键取当前页的行。
+        """
+        search = filters.get("search")
+        if not search or self.search_index is None or not self.search_index.ready:
+            return None, filters
+        return search, {name: value for name, value in filters.items() if name != "search"}
+
+    def _allowed_ids_statement(self, filters: dict) -> Optional[Select]:
+        if not any(filters.values()):
+            return None
+        return self._filter_statement(select(self.model.id), **filters)
+
+    def _ranked_ids(self, search: str, allowed: Optional[set]) -> List[int]:
+        ids = self.search_index.search(search)
+        if allowed is None:
+            return list(ids)
+        return [id for id in ids if id in allowed]
+
+    def _keyset_ids(
+        self, ids: List[int], cursor: Optional[str], limit: int
+    ) -> Tuple[List[int], Optional[str]]:
+        keyed = self.search_index.keyed(ids)
+        if cursor:
+            keyed = keyed[bisect_right(keyed, decode_cursor(cursor), key=itemgetter(0)):]
+        window = keyed[:limit + 1]
+        next_cursor = encode_cursor(window[limit - 1][0]) if len(window) > limit else None
+        return [id for _, id in window[:limit]], next_cursor
+
+    def _ids_statement(self, ids: List[int], columns: tuple) -> Select:
+        # 主键不在字段集里时追加到末尾，只用于恢复顺序
+        if all(column.name != "id" for column in columns):
+            columns = (*columns, self.model.id)
+        return select(*columns).where(self.model.id.in_(ids))
+
+    @staticmethod
+    def _in_order(rows: List[Any], ids: List[int]) -> List[Any]:
+        position = {id: index for index, id in enumerate(ids)}
+        return sorted(rows, key=lambda row: position[row.id])
+
+    def _search_ids(self, db: Session, search: str, filters: dict) -> List[int]:
+        stmt = self._allowed_ids_statement(filters)
+        allowed = None if stmt is None else set(db.execute(stmt).scalars())
+        return self._ranked_ids(search, allowed)
+
+    def _fetch_ids(self, db: Session, ids: List[int], columns: tuple) -> List[Any]:
+        if not ids:
+            return []
+        return self._in_order(db.execute(self._ids_statement(ids, columns)).all(), ids)
+
+    async def _asearch_ids(self, db: AsyncSession, search: str, filters: dict) -> List[int]:
+        stmt = self._allowed_ids_statement(filters)
+        allowed = None if stmt is None else set((await db.execute(stmt)).scalars())
+        return self._ranked_ids(search, allowed)
+
+    async def _afetch_ids(self, db: AsyncSession, ids: List[int], columns: tuple) -> List[Any]:
+        if not ids:
+            return []
+        return self._in_order((await db.execute(self._ids_statement(ids, columns))).all(), ids)
+
+    def projection(self, fields: Optional[Sequence[str]]) -> Tuple[tuple, RowSerializer]:
+        """解析稀疏字段集，返回要 SELECT 的列（按表定义顺序）和对应的序列化器
+
+        fields 为空时是全部公开列；含未知或内部字段时抛出 ValueError。
+        其他模块（如招式表）据此查询并序列化本表的行。
+        """
+        if not fields:
+            return self.columns, self.serializer
+        wanted = frozenset(fields)
+        projection = self._projections.get(wanted)
+        if projection is None:
+            known = self.serializer.names
+            unknown = [field for field in fields if field not in known]
+            if unknown:
+                raise ValueError(f"未知字段: {', '.join(unknown)}")
+            columns = tuple(column for column in self.columns if column.name in wanted)
+            projection = (columns, RowSerializer(columns))
+            # 合法组合有限，但仍设上限防止被任意组合撑大
+            if len(self._projections) < 256:
+                self._projections[wanted] = projection
+        return projection
+
+    @staticmethod
+    def _project(data: Optional[dict], serializer: RowSerializer) -> Optional[dict]:
+        if data is None or len(serializer.names) == len(data):
+            return data
+        return {name: data[name] for name in serializer.names}
+
+    def _count_separately(self, filters: dict) -> bool:
+        return any(filters.get(name) for name in self.joined_filters)
+
+    def _page_statement(
+        self, skip: int, limit: int, filters: dict, columns: tuple, with_total: bool = True
+    ) -> Select:
+        if with_total:
+            # 总数以不相关标量子查询（SELECT COUNT(*) ...）的形式附在每一行上，数据库只计算一次
+            total_column = self._count_statement(filters).scalar_subquery().label("total")
+            columns = (*columns, total_column)
+        stmt = self._filter_statement(select(*columns), **filters)
+        # 显式按排序键排列，与内存目录和游标分页一致，不依赖所选索引的物理顺序
+        return stmt.order_by(getattr(self.model, self.cursor_field)).offset(skip).limit(limit)
+
+    def _count_statement(self, filters: dict) -> Select:
+        return self._filter_statement(
+            select(func.count()).select_from(self.model), **filters
+        )
+
+    def _keyset_statement(
+        self, cursor: Optional[str], limit: int, filters: dict, columns: tuple
+    ) -> Select:
+        key = getattr(self.model, self.cursor_field)
+        # 排序键不在字段集里时追加到末尾，只用于生成游标，不会被序列化
+        if all(column.name != self.cursor_field for column in columns):
+            columns = (*columns, key)
+        stmt = self._filter_statement(select(*columns), **filters)
+        if cursor:
+            stmt = stmt.where(key > decode_cursor(cursor))
+        # 多取一行用于判断是否还有下一页
+        return stmt.order_by(key).limit(limit + 1)
+
+    def _keyset_result(
+        self, rows: List[Any], limit: int, serializer: RowSerializer
+    ) -> Tuple[List[dict], Optional[str]]:
+        if len(rows) <= limit:
+            return serializer.many(rows), None
+        rows = rows[:limit]
+        return serializer.many(rows), encode_cursor(getattr(rows[-1], self.cursor_field))
+
+    def _alias_statements(self, key: str) -> List[Select]:
+        """按查找顺序生成别名查询：编号（输入为整数时）> 各名称字段"""
+        statements = []
+        if self.number_field:
+            try:
+                number = int(key)
+            except ValueError:
+                number = None
+            if number is not None:
+                statements.append(
+                    select(*self.columns).where(getattr(self.model, self.number_field) == number).limit(1)
+                )
+        for field in self.alias_fields:
+            statements.append(
+                select(*self.columns).where(getattr(self.model, field) == key).limit(1)
+            )
+        return statements
+
+    def _cache_resolved(self, key: str, row: Any) -> dict:
+        data = self.serializer(row)
+        self.cache.set_many({key, *self._alias_keys(row)}, data, tag=row.id)
+        return data
+
+    def get_page(
+        self,
+        db: Session,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[Sequence[str]] = None,
+        **filters: Any
+    ) -> Tuple[List[dict], int]:
+        """单次查询同时返回当前页数据（已序列化）和筛选后的总数
+
+        fields 为稀疏字段集，只 SELECT 并返回这些列。
+        """
+        columns, serializer = self.projection(fields)
+        self._prepare_search(db, filters)
+        if self.memory_table is not None:
+            return self.memory_table.page(
+                skip=skip, limit=limit, fields=fields and serializer.names, **filters
+            )
+
+        # 名称搜索：结果按相关度排序
+        search, filters = self._index_search(filters)
+        if search is not None:
+            ids = self._search_ids(db, search, filters)
+            return serializer.many(self._fetch_ids(db, ids[skip:skip + limit], columns)), len(ids)
+
+        if self._count_separately(filters):
+            rows = db.execute(self._page_statement(skip, limit, filters, columns, with_total=False)).all()
+            return serializer.many(rows), db.execute(self._count_statement(filters)).scalar()
+
+        rows = db.execute(self._page_statement(skip, limit, filters, columns)).all()
+        if rows:
+            return serializer.many(rows), rows[0].total
+
+        # 页码超出范围时没有返回行，退回单独计数
+        if skip == 0:
+            return [], 0
+        return [], self.get_filtered_count(db, **filters)
+
+    def get_keyset_page(
+        self,
+        db: Session,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        fields: Optional[Sequence[str]] = None,
+        **filters: Any
+    ) -> Tuple[List[dict], Optional[str]]:
+        """游标分页：按排序键向后翻页，返回当前页数据和下一页游标（没有下一页时为None）"""
+        columns, serializer = self.projection(fields)
+        self._prepare_search(db, filters)
+        if self.memory_table is not None:
+            return self.memory_table.keyset_page(
+                cursor=cursor, limit=limit, fields=fields and serializer.names, **filters
+            )
+
+        search, filters = self._index_search(filters)
+        if search is not None:
+            ids, next_cursor = self._keyset_ids(self._search_ids(db, search, filters), cursor, limit)
+            return serializer.many(self._fetch_ids(db, ids, columns)), next_cursor
+
+        rows = db.execute(self._keyset_statement(cursor, limit, filters, columns)).all()
+        return self._keyset_result(rows, limit, serializer)
+
+    def get_filtered_count(self, db: Session, **filters: Any) -> int:
+        self._prepare_search(db, filters)
+        search, filters = self._index_search(filters)
+        if search is not None:
+            return len(self._search_ids(db, search, filters))
+        return db.execute(self._count_statement(filters)).scalar()
+
+    def lookup(
+        self, db: Session, *, key: str, fields: Optional[Sequence[str]] = None
+    ) -> Optional[dict]:
+        """按编号或任一名称查找详情（读穿缓存），返回序列化后的字典
+
+        单行查询总是读取完整记录以便缓存复用，fields 只裁剪返回的键。
+        """
+        _, serializer = self.projection(fields)
+        return self._project(self._lookup(db, key), serializer)
+
+    def _lookup(self, db: Session, key: str) -> Optional[dict]:
+        if self.memory_table is not None:
+            return self.memory_table.lookup(key)
+
+        data = self.cache.get(key)
+        if data is not None:
+            return data
+
+        for stmt in self._alias_statements(key):
+            row = db.execute(stmt).first()
+            if row is not None:
+                return self._cache_resolved(key, row)
+        return None
+
+    def lookup_many(
+        self, db: Session, *, keys: Sequence[str], fields: Optional[Sequence[str]] = None
+    ) -> List[Optional[dict]]:
+        """批量查找详情，结果按 keys 的顺序排列，未找到的为 None
+
+        查找顺序与 lookup 相同，但每种键（编号、各名称字段）只发一条 IN 查询，
+        后一种只查前面还没解析到的键：N 个键至多 1 + len(alias_fields) 次查询。
+        """
+        _, serializer = self.projection(fields)
+        return [self._project(data, serializer) for data in self._lookup_many(db, keys)]
+
+    def _lookup_many(self, db: Session, keys: Sequence[str]) -> List[Optional[dict]]:
+        if self.memory_table is not None:
+            return [self.memory_table.lookup(key) for key in keys]
+
+        resolved, pending = self._cached_many(keys)
+        for field in self._batch_fields():
+            values = self._batch_values(field, pending)
+            if values:
+                rows = db.execute(self._batch_statement(field, values)).all()
+                pending = self._resolve_batch(field, values, rows, resolved, pending)
+        return [resolved.get(key) for key in keys]
+
+    def _cached_many(self, keys: Sequence[str]) -> Tuple[Dict[str, dict], List[str]]:
+        resolved, pending = {}, []
+        for key in dict.fromkeys(keys):
+            data = self.cache.get(key)
+            if data is not None:
+                resolved[key] = data
+            else:
+                pending.append(key)
+        return resolved, pending
+
+    def _batch_fields(self) -> Tuple[str, ...]:
+        return ((self.number_field,) if self.number_field else ()) + self.alias_fields
+
+    def _batch_values(self, field: str, keys: Sequence[str]) -> Dict[Any, List[str]]:
+        """本轮查询的值 -> 原始键；编号字段只取能转成整数的键
+
+        名称按 casefold 归组：MySQL 默认排序规则不区分大小写，返回行的名称可能与输入大小写不同。
+        """
+        values: Dict[Any, List[str]] = {}
+        for key in keys:
+            if field == self.number_field:
+                try:
+                    value = int(key)
+                except ValueError:
+                    continue
+            else:
+                value = key
+            values.setdefault(self._batch_group(value), []).append(key)
+        return values
+
+    @staticmethod
+    def _batch_group(value: Any) -> Any:
+        return value.casefold() if isinstance(value, str) else value
+
+    def _batch_statement(self, field: str, values: Dict[Any, List[str]]) -> Select:
+        if field == self.number_field:
+            keys = list(values)
+        else:
+            keys = [key for group in values.values() for key in group]
+        # 同名的多行取主键最小的一行
+        return select(*self.columns).where(getattr(self.model, field).in_(keys)).order_by(self.model.id)
+
+    def _resolve_batch(
+        self, field: str, values: Dict[Any, List[str]], rows: Sequence[Any],
+        resolved: Dict[str, dict], pending: List[str]
+    ) -> List[str]:
+        for row in rows:
+            for key in values.pop(self._batch_group(getattr(row, field)), ()):
+                resolved[key] = self._cache_resolved(key, row)
+        return [key for key in pending if key not in resolved]
+
+    # 异步版本：供 async 路由通过 AsyncSession 调用，语义与同步版本一致
+
+    async def aget_page(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[Sequence[str]] = None,
+        **filters: Any
+    ) -> Tuple[List[dict], int]:
+        columns, serializer = self.projection(fields)
+        await self._aprepare_search(db, filters)
+        if self.memory_table is not None:
+            return self.memory_table.page(
+                skip=skip, limit=limit, fields=fields and serializer.names, **filters
+            )
+
+        search, filters = self._index_search(filters)
+        if search is not None:
+            ids = await self._asearch_ids(db, search, filters)
+            return serializer.many(await self._afetch_ids(db, ids[skip:skip + limit], columns)), len(ids)
+
+        if self._count_separately(filters):
+            stmt = self._page_statement(skip, limit, filters, columns, with_total=False)
+            rows = (await db.execute(stmt)).all()
+            return serializer.many(rows), (await db.execute(self._count_statement(filters))).scalar()
+
+        rows = (await db.execute(self._page_statement(skip, limit, filters, columns))).all()
+        if rows:
+            return serializer.many(rows), rows[0].total
+
+        if skip == 0:
+            return [], 0
+        return [], await self.aget_filtered_count(db, **filters)
+
+    async def aget_keyset_page(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        fields: Optional[Sequence[str]] = None,
+        **filters: Any
+    ) -> Tuple[List[dict], Optional[str]]:
+        columns, serializer = self.projection(fields)
+        await self._aprepare_search(db, filters)
+        if self.memory_table is not None:
+            return self.memory_table.keyset_page(
+                cursor=cursor, limit=limit, fields=fields and serializer.names, **filters
+            )
+
+        search, filters = self._index_search(filters)
+        if search is not None:
+            ids, next_cursor = self._keyset_ids(await self._asearch_ids(db, search, filters), cursor, limit)
+            return serializer.many(await self._afetch_ids(db, ids, columns)), next_cursor
+
+        rows = (await db.execute(self._keyset_statement(cursor, limit, filters, columns))).all()
+        return self._keyset_result(rows, limit, serializer)
+
+    async def aget_filtered_count(self, db: AsyncSession, **filters: Any) -> int:
+        await self._aprepare_search(db, filters)
+        search, filters = self._index_search(filters)
+        if search is not None:
+            return len(await self._asearch_ids(db, search, filters))
+        return (await db.execute(self._count_statement(filters))).scalar()
+
+    async def alookup(
+        self, db: AsyncSession, *, key: str, fields: Optional[Sequence[str]] = None
+    ) -> Optional[dict]:
+        _, serializer = self.projection(fields)
+        return self._project(await self._alookup(db, key), serializer)
+
+    async def _alookup(self, db: AsyncSession, key: str) -> Optional[dict]:
+        if self.memory_table is not None:
+            return self.memory_table.lookup(key)
+
+        data = self.cache.get(key)
+        if data is not None:
+            return data
+
+        for stmt in self._alias_statements(key):
+            row = (await db.execute(stmt)).first()
+            if row is not None:
+                return self._cache_resolved(key, row)
+        return None
+
+    async def alookup_many(
+        self, db: AsyncSession, *, keys: Sequence[str], fields: Optional[Sequence[str]] = None
+    ) -> List[Optional[dict]]:
+        _, serializer = self.projection(fields)
+        return [self._project(data, serializer) for data in await self._alookup_many(db, keys)]
+
+    async def _alookup_many(self, db: AsyncSession, keys: Sequence[str]) -> List[Optional[dict]]:
+        if self.memory_table is not None:
+            return [self.memory_table.lookup(key) for key in keys]
+
+        resolved, pending = self._cached_many(keys)
+        for field in self._batch_fields():
+            values = self._batch_values(field, pending)
+            if values:
+                rows = (await db.execute(self._batch_statement(field, values))).all()
+                pending = self._resolve_batch(field, values, rows, resolved, pending)
+        return [resolved.get(key) for key in keys]
+
+    def _alias_keys(self, obj: Any) -> List[str]:
+        keys = []
+        if self.number_field:
+            keys.append(str(getattr(obj, self.number_field)))
+        for field in self.alias_fields:
+            value = getattr(obj, field)
+            if value:
+                keys.append(value)
+        return keys
+
+    def _invalidate(self, obj: ModelType):
+        """失效该实体的缓存，以及与它的新别名同名、此前可能解析到其他实体的键"""
+        self.cache.invalidate_tag(obj.id)
+        self.cache.delete_many(self._alias_keys(obj))
+
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = obj_in.dict() if hasattr(obj_in, 'dict') else obj_in
         db_obj = self.model(**obj_in_data)
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        self._invalidate(db_obj)
+        self._notify_write(db, "create", model_to_dict(db_obj))
         return db_obj
 
     def update(
@@ -50,12 +566,17 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        self._invalidate(db_obj)
+        self._notify_write(db, "update", model_to_dict(db_obj))
         return db_obj
 
     def remove(self, db: Session, *, id: int) -> ModelType:
         obj = db.query(self.model).get(id)
+        self._invalidate(obj)
+        data = model_to_dict(obj)
         db.delete(obj)
         db.commit()
+        self._notify_write(db, "remove", data)
         return obj
 
     def get_by_field(
@@ -87,13 +608,17 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         skip: int = 0,
         limit: int = 100
     ) -> List[ModelType]:
-        conditions = []
-        for field in search_fields:
-            conditions.append(
-                getattr(self.model, field).ilike(f"%{query}%")
+        index = self.search_index
+        if index is not None and set(search_fields) == set(index.fields):
+            index.ensure(db)
+            ids = list(index.search(query)[skip:skip + limit])
+            if not ids:
+                return []
+            return self._in_order(
+                db.query(self.model).filter(self.model.id.in_(ids)).all(), ids
             )
         return db.query(self.model).filter(
-            func.or_(*conditions)
+            self._search_condition(query, search_fields)
         ).offset(skip).limit(limit).all()
 
     def get_count_by_field(
@@ -106,11 +631,10 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def get_search_count(
         self, db: Session, *, query: str, search_fields: List[str]
     ) -> int:
-        conditions = []
-        for field in search_fields:
-            conditions.append(
-                getattr(self.model, field).ilike(f"%{query}%")
-            )
+        index = self.search_index
+        if index is not None and set(search_fields) == set(index.fields):
+            index.ensure(db)
+            return len(index.search(query))
         return db.query(func.count(self.model.id)).filter(
-            func.or_(*conditions)
+            self._search_condition(query, search_fields)
         ).scalar()
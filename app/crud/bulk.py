@@ -0,0 +1,151 @@
+"""
+批量写入：按自然键分块 upsert，每块一个事务
+"""
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.crud.base import CRUDBase
+
+
+def natural_key(table: Table) -> str:
+    """表的自然键：主键以外第一个带唯一约束的列（图鉴编号、招式编号、道具名等）"""
+    for column in table.columns:
+        if column.unique and not column.primary_key:
+            return column.name
+    raise ValueError(f"表 {table.name} 没有可用于 upsert 的唯一列")
+
+
+def upsert_statement(table: Table, dialect: str, key: str, columns: Sequence[str]):
+    """INSERT ... 冲突时更新 columns 中除自然键外的列
+
+    MySQL 用 ON DUPLICATE KEY UPDATE，SQLite/PostgreSQL 用 ON CONFLICT (key) DO UPDATE。
+    created_at 只在插入时写入。
+    """
+    updated = [column for column in columns if column != key and column != "created_at"]
+    if dialect == "mysql":
+        stmt = mysql.insert(table)
+        return stmt.on_duplicate_key_update({column: stmt.inserted[column] for column in updated})
+    if dialect in ("sqlite", "postgresql"):
+        stmt = (sqlite if dialect == "sqlite" else postgresql).insert(table)
+        return stmt.on_conflict_do_update(
+            index_elements=[key], set_={column: stmt.excluded[column] for column in updated}
+        )
+    raise ValueError(f"不支持批量 upsert 的数据库: {dialect}")
+
+
+@dataclass
+class UpsertReport:
+    table: str
+    rows: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return (f"{self.table}: {self.rows} 行, {self.batches} 个事务, "
+                f"{self.seconds:.2f}s, {self.rows_per_sec:.0f} 行/秒")
+
+
+class BulkUpserter:
+    """缓冲记录，攒满 chunk_size 条后在一个事务内 upsert
+
+    用法：
+        with BulkUpserter(db, pokemon_crud) as writer:
+            for record in records:
+                writer.add(record)
+        print(writer.report)
+
+    每个事务提交后清空该表的详情缓存，并以 action="bulk" 通知写监听器
+    （内存目录、搜索索引、输入提示整体重建），而不是逐行通知。
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        crud: CRUDBase,
+        *,
+        chunk_size: int = settings.BULK_CHUNK_SIZE,
+        key: Optional[str] = None
+    ):
+        self.db = db
+        self.crud = crud
+        self.table: Table = crud.model.__table__
+        self.key = key or natural_key(self.table)
+        self.chunk_size = chunk_size
+        self.dialect = db.get_bind().dialect.name
+        self.report = UpsertReport(self.table.name)
+        self._buffer: List[Dict[str, Any]] = []
+        self._statements: Dict[tuple, Any] = {}
+
+    def add(self, record: Dict[str, Any]):
+        unknown = record.keys() - self.table.columns.keys()
+        if unknown:
+            raise ValueError(f"表 {self.table.name} 没有字段: {', '.join(sorted(unknown))}")
+        self._buffer.append(record)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def extend(self, records: Iterable[Dict[str, Any]]):
+        for record in records:
+            self.add(record)
+
+    def _statement(self, columns: tuple):
+        stmt = self._statements.get(columns)
+        if stmt is None:
+            stmt = upsert_statement(self.table, self.dialect, self.key, columns)
+            self._statements[columns] = stmt
+        return stmt
+
+    def flush(self):
+        """把缓冲区写入一个事务；同一块内字段集合不同的记录分组执行，缺失的列不会被覆盖为NULL"""
+        if not self._buffer:
+            return
+        rows, self._buffer = self._buffer, []
+        groups: Dict[tuple, List[Dict[str, Any]]] = {}
+        for row in rows:
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+
+        started = time.perf_counter()
+        try:
+            for columns, group in groups.items():
+                # 列默认值（created_at/updated_at）逐行生成，冲突时 updated_at 随之更新
+                if "updated_at" in self.table.columns and "updated_at" not in columns:
+                    columns += ("updated_at",)
+                self.db.execute(self._statement(columns), group)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        self.report.seconds += time.perf_counter() - started
+        self.report.rows += len(rows)
+        self.report.batches += 1
+
+        self.crud.cache.clear()
+        self.crud._notify_write(self.db, "bulk", None)
+
+    def close(self) -> UpsertReport:
+        self.flush()
+        return self.report
+
+    def __enter__(self) -> "BulkUpserter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+
+def bulk_upsert(db: Session, crud: CRUDBase, records: Iterable[Dict[str, Any]], **options: Any) -> UpsertReport:
+    """一次性 upsert 一批记录，返回写入统计"""
+    with BulkUpserter(db, crud, **options) as writer:
+        writer.extend(records)
+    return writer.report
@@ -0,0 +1,220 @@
+"""
+内存目录：启动时一次性加载四张表，GET 请求直接从内存应答
+"""
+import threading
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.crud.base import CRUDBase
+from app.crud.pokemon import pokemon_crud
+from app.crud.move import move_crud
+from app.crud.ability import ability_crud
+from app.crud.item import item_crud
+from app.utils.pagination import encode_cursor, decode_cursor
+
+
+class CatalogTable:
+    """单表的不可变快照
+
+    行按排序键（cursor_field）升序存成元组，值已是可直接输出的JSON类型；
+    二级索引把筛选值映射到行号数组，别名索引把编号/名称映射到行号。
+    """
+
+    __slots__ = (
+        "columns", "rows", "keys", "cursor_field",
+        "indexes", "numbers", "aliases", "search_columns", "search_index", "id_positions",
+    )
+
+    def __init__(self, crud: CRUDBase, records: List[dict]):
+        records.sort(key=lambda record: record[crud.cursor_field])
+        self.columns: Tuple[str, ...] = crud.serializer.names
+        self.rows: Tuple[tuple, ...] = tuple(
+            tuple(record[column] for column in self.columns) for record in records
+        )
+        self.cursor_field = crud.cursor_field
+        self.keys = array("q", (record[crud.cursor_field] for record in records))
+
+        # 二级索引：筛选参数 -> {值: 行号数组}
+        self.indexes: Dict[str, Dict[Any, array]] = {}
+        for param, fields in crud.index_fields.items():
+            postings: Dict[Any, array] = {}
+            for position, record in enumerate(records):
+                for value in {record[field] for field in fields}:
+                    if value is not None:
+                        postings.setdefault(value, array("I")).append(position)
+            self.indexes[param] = postings
+
+        # 别名索引按原有查找顺序分层：编号 > 各名称字段
+        self.numbers: Dict[int, int] = {}
+        if crud.number_field:
+            for position, record in enumerate(records):
+                self.numbers.setdefault(record[crud.number_field], position)
+        self.aliases: Tuple[Dict[str, int], ...] = tuple(
+            self._alias_index(records, field) for field in crud.alias_fields
+        )
+        self.search_columns = tuple(self.columns.index(field) for field in crud.search_fields)
+        self.search_index = crud.search_index
+        self.id_positions: Dict[int, int] = {record["id"]: position for position, record in enumerate(records)}
+
+    @staticmethod
+    def _alias_index(records: List[dict], field: str) -> Dict[str, int]:
+        index: Dict[str, int] = {}
+        for position, record in enumerate(records):
+            if record[field]:
+                index.setdefault(record[field], position)
+        return index
+
+    def _to_dict(self, position: int) -> dict:
+        return dict(zip(self.columns, self.rows[position]))
+
+    def _projector(self, fields: Optional[Sequence[str]]):
+        """返回行号 -> 字典的函数，fields 非空时只取这些列"""
+        if not fields:
+            return self._to_dict
+        names = tuple(fields)
+        indexes = tuple(self.columns.index(name) for name in names)
+
+        def to_dict(position: int) -> dict:
+            row = self.rows[position]
+            return {name: row[index] for name, index in zip(names, indexes)}
+        return to_dict
+
+    def _positions(self, search: Optional[str] = None, ranked: bool = False, **filters: Any):
+        """返回满足筛选条件的行号（升序；ranked 为真且有搜索时按相关度）"""
+        selected = None
+        for param, value in filters.items():
+            if not value:
+                continue
+            postings = self.indexes[param].get(value)
+            if postings is None:
+                return []
+            if selected is None:
+                selected = postings
+            else:
+                allowed = set(postings)
+                selected = [position for position in selected if position in allowed]
+        if search and self.search_index is not None and self.search_index.ready:
+            matched = [
+                self.id_positions[id] for id in self.search_index.search(search)
+                if id in self.id_positions
+            ]
+            if selected is not None:
+                allowed = set(selected)
+                matched = [position for position in matched if position in allowed]
+            return matched if ranked else sorted(matched)
+
+        if selected is None:
+            selected = range(len(self.rows))
+
+        if search:
+            needle = search.casefold()
+            selected = [
+                position for position in selected
+                if any(
+                    self.rows[position][column] and needle in self.rows[position][column].casefold()
+                    for column in self.search_columns
+                )
+            ]
+        return selected
+
+    def page(
+        self, *, skip: int = 0, limit: int = 100, fields: Optional[Sequence[str]] = None, **filters: Any
+    ) -> Tuple[List[dict], int]:
+        positions = self._positions(ranked=True, **filters)
+        to_dict = self._projector(fields)
+        return [to_dict(position) for position in positions[skip:skip + limit]], len(positions)
+
+    def keyset_page(
+        self,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        fields: Optional[Sequence[str]] = None,
+        **filters: Any
+    ) -> Tuple[List[dict], Optional[str]]:
+        positions = self._positions(**filters)
+        start = 0
+        if cursor:
+            after = decode_cursor(cursor)
+            start = bisect_right(positions, after, key=self.keys.__getitem__)
+        window = positions[start:start + limit + 1]
+        to_dict = self._projector(fields)
+        data = [to_dict(position) for position in window[:limit]]
+        if len(window) <= limit:
+            return data, None
+        return data, encode_cursor(self.keys[window[limit - 1]])
+
+    def lookup(self, key: str) -> Optional[dict]:
+        if self.numbers:
+            try:
+                position = self.numbers.get(int(key))
+            except ValueError:
+                position = None
+            if position is not None:
+                return self._to_dict(position)
+        for index in self.aliases:
+            position = index.get(key)
+            if position is not None:
+                return self._to_dict(position)
+        return None
+
+
+class Catalog:
+    """管理各表快照的加载与替换
+
+    每张表的快照不可变；写操作提交后整表重建，再通过一次属性赋值换入
+    对应 CRUD 实例的 memory_table，读请求看到的要么是旧快照要么是新快照。
+    多进程部署时每个 worker 各自持有一份，只能感知本进程内的写入。
+    """
+
+    def __init__(self, cruds: Dict[str, CRUDBase]):
+        self.cruds = cruds
+        self._lock = threading.Lock()
+        self._listening = False
+
+    @property
+    def loaded(self) -> bool:
+        return all(crud.memory_table is not None for crud in self.cruds.values())
+
+    def load(self, db: Session):
+        """加载全部表并订阅 CRUD 写操作"""
+        for crud in self.cruds.values():
+            self.refresh(db, crud)
+        if not self._listening:
+            for crud in self.cruds.values():
+                crud.add_write_listener(self._on_write)
+            self._listening = True
+
+    def _on_write(self, db: Session, crud: CRUDBase, action: str, data: Optional[dict]):
+        if crud.memory_table is not None:
+            self.refresh(db, crud)
+
+    def refresh(self, db: Session, crud: CRUDBase):
+        """重建单张表的快照并原子替换"""
+        with self._lock:
+            records = crud.serializer.many(db.execute(select(*crud.columns)).all())
+            if crud.search_index is not None:
+                crud.search_index.load(records)
+            crud.memory_table = CatalogTable(crud, records)
+
+    def unload(self):
+        for crud in self.cruds.values():
+            crud.memory_table = None
+
+    def stats(self) -> dict:
+        return {
+            name: len(crud.memory_table.rows) if crud.memory_table is not None else None
+            for name, crud in self.cruds.items()
+        }
+
+
+catalog = Catalog({
+    "pokemon": pokemon_crud,
+    "moves": move_crud,
+    "abilities": ability_crud,
+    "items": item_crud,
+})
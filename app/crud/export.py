@@ -0,0 +1,106 @@
+"""
+整表导出：服务端游标逐块读取，编码成 NDJSON / CSV（可选 gzip）后流式输出
+"""
+import csv
+import io
+import zlib
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Sequence
+
+import orjson
+from sqlalchemy import Select, Table, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.pokemon import Pokemon, Move, Ability, Item, PokemonMove
+from app.utils.serializer import RowSerializer, public_columns
+
+EXPORT_TABLES: Dict[str, Table] = {
+    "pokemon": Pokemon.__table__,
+    "moves": Move.__table__,
+    "abilities": Ability.__table__,
+    "items": Item.__table__,
+    "pokemon_moves": PokemonMove.__table__,
+}
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def export_columns(table: Table, fields: Optional[Sequence[str]] = None) -> list:
+    columns = {column.name: column for column in public_columns(table)}
+    if not fields:
+        return list(columns.values())
+    unknown = [field for field in fields if field not in columns]
+    if unknown:
+        raise ValueError(f"未知字段: {', '.join(unknown)}")
+    return [columns[field] for field in dict.fromkeys(fields)]
+
+
+def export_statement(table: Table, columns: list) -> Select:
+    # 按主键顺序读取；yield_per 让驱动使用服务端游标（MySQL 为 SSCursor），每次只取一块
+    return select(*columns).order_by(*table.primary_key.columns)
+
+
+async def astream_rows(
+    db: AsyncSession, table: Table, columns: list, chunk_size: int = 1000
+) -> AsyncIterator[List[dict]]:
+    """逐块产出序列化后的行，内存占用与表大小无关"""
+    serializer = RowSerializer(columns)
+    stmt = export_statement(table, columns).execution_options(yield_per=chunk_size)
+    result = await db.stream(stmt)
+    async for rows in result.partitions():
+        yield serializer.many(rows)
+
+
+def ndjson_chunk(rows: Iterable[dict]) -> bytes:
+    return b"".join(orjson.dumps(row) + b"\n" for row in rows)
+
+
+class CSVEncoder:
+    """CSV 编码：首块前输出表头；列表/字典类型的列（如 abilities）写成 JSON 字符串，空值为空串"""
+
+    def __init__(self, names: Sequence[str]):
+        self.names = tuple(names)
+        self.header = True
+
+    @staticmethod
+    def _cell(value):
+        if value is None:
+            return ""
+        if isinstance(value, (list, dict)):
+            return orjson.dumps(value).decode()
+        return value
+
+    def __call__(self, rows: Iterable[dict]) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if self.header:
+            writer.writerow(self.names)
+            self.header = False
+        writer.writerows([self._cell(row[name]) for name in self.names] for row in rows)
+        return buffer.getvalue().encode("utf-8")
+
+
+async def aexport(
+    db: AsyncSession,
+    table: Table,
+    columns: list,
+    format: str = "ndjson",
+    compress: bool = False,
+    chunk_size: int = 1000,
+) -> AsyncIterator[bytes]:
+    """导出字节流：每块行编码后立即输出；compress 时经增量 gzip 压缩"""
+    encode = ndjson_chunk if format == "ndjson" else CSVEncoder([column.name for column in columns])
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    if format == "csv":
+        # 空表也输出表头
+        header = encode(())
+        yield compressor.compress(header) if compressor else header
+    async for rows in astream_rows(db, table, columns, chunk_size):
+        data = encode(rows)
+        if compressor is not None:
+            data = compressor.compress(data)
+        if data:
+            yield data
+    if compressor is not None:
+        yield compressor.flush()
@@ -0,0 +1,170 @@
+"""
+批量导入：解析 NDJSON / JSON 数组，逐行按 Pydantic 模型校验，合格的行分块 upsert
+"""
+import gzip
+import time
+from dataclasses import dataclass, field
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+import orjson
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import JSON, null
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.crud import pokemon_crud, move_crud, ability_crud, item_crud
+from app.crud.base import CRUDBase
+from app.crud.bulk import bulk_upsert, natural_key
+from app.schemas import PokemonImport, MoveImport, AbilityImport, ItemImport
+
+IMPORTS: Dict[str, Tuple[CRUDBase, Type[BaseModel]]] = {
+    "pokemon": (pokemon_crud, PokemonImport),
+    "moves": (move_crud, MoveImport),
+    "abilities": (ability_crud, AbilityImport),
+    "items": (item_crud, ItemImport),
+}
+
+# 解析结果：(行号, 记录, 解析错误)；JSON 数组的行号为元素序号
+ParsedRow = Tuple[int, Optional[Any], Optional[str]]
+
+
+def parse_ndjson(lines: Iterable[bytes]) -> Iterator[ParsedRow]:
+    """逐行解析 NDJSON（行号从1开始），空行跳过；可直接接文件对象，不必整体读入"""
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield number, orjson.loads(line), None
+        except orjson.JSONDecodeError as e:
+            yield number, None, f"JSON 解析失败: {e}"
+
+
+def parse_payload(data: bytes) -> Iterator[ParsedRow]:
+    """以 [ 开头的按 JSON 数组解析，否则按 NDJSON 解析；gzip 压缩的内容先解压"""
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    if data.lstrip()[:1] == b"[":
+        records = orjson.loads(data)
+        return ((index, record, None) for index, record in enumerate(records, start=1))
+    return parse_ndjson(data.splitlines())
+
+
+def parse_file(path: str) -> Iterator[ParsedRow]:
+    """解析文件：gzip 按文件头自动解压；NDJSON 逐行流式读取，JSON 数组整体解析"""
+    with open(path, "rb") as raw:
+        stream = gzip.GzipFile(fileobj=raw) if raw.read(2) == b"\x1f\x8b" else raw
+        raw.seek(0)
+        first = stream.readline()
+        if first.lstrip()[:1] == b"[":
+            yield from parse_payload(first + stream.read())
+        else:
+            yield from parse_ndjson(chain([first], stream))
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or '记录'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+
+@dataclass
+class ImportReport:
+    resource: str
+    received: int = 0
+    written: int = 0
+    failed: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    errors: List[dict] = field(default_factory=list)
+
+    max_errors = 100
+
+    def error(self, row: int, key: Any, message: str):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row, "key": key, "error": message})
+
+    def to_dict(self) -> dict:
+        return {
+            "resource": self.resource,
+            "received": self.received,
+            "written": self.written,
+            "failed": self.failed,
+            "batches": self.batches,
+            "seconds": round(self.seconds, 3),
+            "errors": self.errors,
+        }
+
+    def __str__(self) -> str:
+        return (f"{self.resource}: 收到 {self.received}, 写入 {self.written}, 失败 {self.failed}, "
+                f"{self.batches} 个事务, {self.seconds:.2f}s")
+
+
+class Importer:
+    """校验并分块写入一类资源
+
+    每行先按导入模型校验（只保留请求中出现的字段，未给出的列在更新时保持原值），
+    不合格的行记入错误后跳过；合格的行每 chunk_size 条一个事务 upsert。
+    某块写库失败（如违反约束）时回滚该块并逐行重试，只有出错的行被记为失败。
+    """
+
+    def __init__(self, db: Session, resource: str, *, chunk_size: int = settings.BULK_CHUNK_SIZE):
+        if resource not in IMPORTS:
+            raise ValueError(f"未知资源类型: {resource}，可选: {', '.join(IMPORTS)}")
+        self.db = db
+        self.crud, self.schema = IMPORTS[resource]
+        table = self.crud.model.__table__
+        self.key = natural_key(table)
+        self.json_columns = [column.name for column in table.columns if isinstance(column.type, JSON)]
+        self.chunk_size = chunk_size
+        self.report = ImportReport(resource)
+
+    def _validate(self, rows: Iterable[ParsedRow]) -> Iterator[Tuple[int, dict]]:
+        for row, record, error in rows:
+            self.report.received += 1
+            if error is not None:
+                self.report.error(row, None, error)
+                continue
+            key = record.get(self.key) if isinstance(record, dict) else None
+            try:
+                data = self.schema.model_validate(record).model_dump(exclude_unset=True)
+            except ValidationError as e:
+                self.report.error(row, key, _validation_message(e))
+                continue
+            # JSON 列的 None 默认写成 JSON 'null'，显式绑定 SQL NULL，与导出前一致
+            for name in self.json_columns:
+                if name in data and data[name] is None:
+                    data[name] = null()
+            yield row, data
+
+    def _write(self, chunk: List[Tuple[int, dict]]):
+        try:
+            report = bulk_upsert(self.db, self.crud, [record for _, record in chunk], chunk_size=len(chunk))
+            self.report.written += report.rows
+            self.report.batches += report.batches
+            return
+        except Exception as e:
+            if len(chunk) == 1:
+                row, record = chunk[0]
+                self.report.error(row, record.get(self.key), f"写入失败: {getattr(e, 'orig', e)}")
+                return
+        for entry in chunk:
+            self._write([entry])
+
+    def run(self, rows: Iterable[ParsedRow]) -> ImportReport:
+        started = time.perf_counter()
+        valid = self._validate(rows)
+        while True:
+            chunk = list(islice(valid, self.chunk_size))
+            if not chunk:
+                break
+            self._write(chunk)
+        self.report.seconds = time.perf_counter() - started
+        return self.report
+
+
+def import_records(db: Session, resource: str, rows: Iterable[ParsedRow], **options: Any) -> ImportReport:
+    """导入一批解析结果，返回统计与逐行错误"""
+    return Importer(db, resource, **options).run(rows)
@@ -3,6 +3,7 @@
 """
 from typing import List, Optional
 from sqlalchemy.orm import Session
+from sqlalchemy import select, Select
 
 from app.crud.base import CRUDBase
 from app.models.pokemon import Item
@@ -10,6 +11,9 @@ from app.schemas import ItemCreate, ItemUpdate
 
 
 class CRUDItem(CRUDBase[Item, ItemCreate, ItemUpdate]):
+    index_fields = {"category": ("category",), "generation": ("generation",)}
+    search_fields = ("name", "english_name", "japanese_name")
+
     def get_by_name(self, db: Session, *, name: str) -> Optional[Item]:
         return db.query(Item).filter(Item.name == name).first()
 
@@ -42,6 +46,21 @@ class CRUDItem(CRUDBase[Item, ItemCreate, ItemUpdate]):
     def get_count_by_generation(self, db: Session, *, generation: str) -> int:
         return db.query(Item).filter(Item.generation == generation).count()
 
+    def _filter_statement(
+        self,
+        stmt: Select,
+        *,
+        category: Optional[str] = None,
+        generation: Optional[str] = None
+    ) -> Select:
+        if category:
+            stmt = stmt.where(Item.category == category)
+
+        if generation:
+            stmt = stmt.where(Item.generation == generation)
+
+        return stmt
+
     def get_with_filters(
         self,
         db: Session,
@@ -51,15 +70,10 @@ class CRUDItem(CRUDBase[Item, ItemCreate, ItemUpdate]):
         category: Optional[str] = None,
         generation: Optional[str] = None
     ) -> List[Item]:
-        query = db.query(Item)
-
-        if category:
-            query = query.filter(Item.category == category)
-
-        if generation:
-            query = query.filter(Item.generation == generation)
-
-        return query.offset(skip).limit(limit).all()
+        stmt = self._filter_statement(
+            select(Item), category=category, generation=generation
+        )
+        return db.execute(stmt.offset(skip).limit(limit)).scalars().all()
 
     def get_count_with_filters(
         self,
@@ -68,15 +82,7 @@ class CRUDItem(CRUDBase[Item, ItemCreate, ItemUpdate]):
         category: Optional[str] = None,
         generation: Optional[str] = None
     ) -> int:
-        query = db.query(Item)
-
-        if category:
-            query = query.filter(Item.category == category)
-
-        if generation:
-            query = query.filter(Item.generation == generation)
-
-        return query.count()
+        return self.get_filtered_count(db, category=category, generation=generation)
 
 
 item_crud = CRUDItem(Item)
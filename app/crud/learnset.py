@@ -0,0 +1,147 @@
+"""
+宝可梦-招式关联（招式表）CRUD操作
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, func, insert, select, Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.crud.move import move_crud
+from app.crud.pokemon import pokemon_crud
+from app.models.pokemon import Move, Pokemon, PokemonMove
+from app.utils.serializer import RowSerializer
+
+# 爬虫解析出的招式表条目：[招式编号, 学习方式, 学习等级]
+LearnsetEntry = Sequence[Any]
+
+
+class CRUDLearnset:
+    """pokemon_moves 的读写
+
+    两个方向的分页查询都在同一条 SQL 里 JOIN 出关联的招式/宝可梦
+    （多对一，不影响 LIMIT），只选取对方 CRUD 的 projection 给出的列，
+    总数以标量子查询附在每一行上，每页固定一次查询，不构造ORM实例。
+    """
+
+    def _count_statement(self, where: Any, method: Optional[str]) -> Select:
+        stmt = select(func.count()).select_from(PokemonMove).where(where)
+        if method:
+            stmt = stmt.where(PokemonMove.learn_method == method)
+        return stmt
+
+    def _page_statement(
+        self, columns: tuple, where: Any, related: Any, order_by: tuple, method: Optional[str], skip: int, limit: int
+    ) -> Select:
+        # 关联表的列在前，序列化器按列顺序只取前面这部分
+        total_column = self._count_statement(where, method).scalar_subquery().label("total")
+        stmt = (
+            select(*columns, PokemonMove.learn_method, PokemonMove.learn_level, total_column)
+            .select_from(PokemonMove)
+            .join(related)
+            .where(where)
+        )
+        if method:
+            stmt = stmt.where(PokemonMove.learn_method == method)
+        return stmt.order_by(*order_by).offset(skip).limit(limit)
+
+    async def _apage(
+        self,
+        db: AsyncSession,
+        columns: tuple,
+        where: Any,
+        related: Any,
+        order_by: tuple,
+        method: Optional[str],
+        skip: int,
+        limit: int
+    ) -> Tuple[List[Any], int]:
+        rows = (await db.execute(self._page_statement(columns, where, related, order_by, method, skip, limit))).all()
+        if rows:
+            return rows, rows[0].total
+        # 页码超出范围时没有返回行，退回单独计数
+        if skip == 0:
+            return [], 0
+        return [], (await db.execute(self._count_statement(where, method))).scalar()
+
+    async def aget_moves(
+        self,
+        db: AsyncSession,
+        *,
+        pokemon_id: int,
+        method: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[dict], int]:
+        """宝可梦能学会的招式：按学习方式、等级排序，每条为招式字段加 learn_method/learn_level"""
+        columns, serializer = move_crud.projection(fields)
+        rows, total = await self._apage(
+            db, columns, PokemonMove.pokemon_id == pokemon_id, PokemonMove.move,
+            (PokemonMove.learn_method, PokemonMove.learn_level, PokemonMove.move_id), method, skip, limit
+        )
+        return [self._entry(row, serializer) for row in rows], total
+
+    async def aget_learners(
+        self,
+        db: AsyncSession,
+        *,
+        move_id: int,
+        method: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[dict], int]:
+        """能学会某招式的宝可梦：按宝可梦排序，每条为宝可梦字段加 learn_method/learn_level"""
+        columns, serializer = pokemon_crud.projection(fields)
+        rows, total = await self._apage(
+            db, columns, PokemonMove.move_id == move_id, PokemonMove.pokemon,
+            (PokemonMove.pokemon_id, PokemonMove.learn_method, PokemonMove.learn_level), method, skip, limit
+        )
+        return [self._entry(row, serializer) for row in rows], total
+
+    @staticmethod
+    def _entry(row: Any, serializer: RowSerializer) -> dict:
+        data = serializer(row)
+        data["learn_method"] = row.learn_method
+        data["learn_level"] = row.learn_level
+        return data
+
+    def move_ids(self, db: Session, numbers: Iterable[int]) -> Dict[int, int]:
+        """招式编号 -> moves.id（只含数据库中已有的招式）"""
+        numbers = set(numbers)
+        if not numbers:
+            return {}
+        return dict(db.execute(select(Move.move_id, Move.id).where(Move.move_id.in_(numbers))).all())
+
+    def replace(
+        self, db: Session, learnsets: Dict[int, List[LearnsetEntry]], move_ids: Optional[Dict[int, int]] = None
+    ) -> int:
+        """整体替换一批宝可梦（按图鉴编号）的招式表，一个事务内先删后批量插入
+
+        引用了数据库中还没有的招式的条目会被跳过；返回写入的行数。
+        """
+        if not learnsets:
+            return 0
+        if move_ids is None:
+            move_ids = self.move_ids(db, (entry[0] for entries in learnsets.values() for entry in entries))
+        pokemon_ids = dict(db.execute(
+            select(Pokemon.national_dex, Pokemon.id).where(Pokemon.national_dex.in_(list(learnsets)))
+        ).all())
+        rows = [
+            {"pokemon_id": pokemon_ids[dex], "move_id": move_ids[number], "learn_method": method, "learn_level": level}
+            for dex, entries in learnsets.items() if dex in pokemon_ids
+            for number, method, level in entries if number in move_ids
+        ]
+        try:
+            db.execute(delete(PokemonMove).where(PokemonMove.pokemon_id.in_(list(pokemon_ids.values()))))
+            if rows:
+                db.execute(insert(PokemonMove), rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return len(rows)
+
+
+learnset_crud = CRUDLearnset()
@@ -3,6 +3,7 @@
 """
 from typing import List, Optional
 from sqlalchemy.orm import Session
+from sqlalchemy import select, Select
 
 from app.crud.base import CRUDBase
 from app.models.pokemon import Move
@@ -10,6 +11,11 @@ from app.schemas import MoveCreate, MoveUpdate
 
 
 class CRUDMove(CRUDBase[Move, MoveCreate, MoveUpdate]):
+    cursor_field = "move_id"
+    number_field = "move_id"
+    index_fields = {"type_name": ("type",), "category": ("category",)}
+    search_fields = ("name", "english_name", "japanese_name")
+
     def get_by_move_id(self, db: Session, *, move_id: int) -> Optional[Move]:
         return db.query(Move).filter(Move.move_id == move_id).first()
 
@@ -45,6 +51,21 @@ class CRUDMove(CRUDBase[Move, MoveCreate, MoveUpdate]):
     def get_count_by_category(self, db: Session, *, category: str) -> int:
         return db.query(Move).filter(Move.category == category).count()
 
+    def _filter_statement(
+        self,
+        stmt: Select,
+        *,
+        type_name: Optional[str] = None,
+        category: Optional[str] = None
+    ) -> Select:
+        if type_name:
+            stmt = stmt.where(Move.type == type_name)
+
+        if category:
+            stmt = stmt.where(Move.category == category)
+
+        return stmt
+
     def get_with_filters(
         self,
         db: Session,
@@ -54,15 +75,10 @@ class CRUDMove(CRUDBase[Move, MoveCreate, MoveUpdate]):
         type_name: Optional[str] = None,
         category: Optional[str] = None
     ) -> List[Move]:
-        query = db.query(Move)
-
-        if type_name:
-            query = query.filter(Move.type == type_name)
-
-        if category:
-            query = query.filter(Move.category == category)
-
-        return query.offset(skip).limit(limit).all()
+        stmt = self._filter_statement(
+            select(Move), type_name=type_name, category=category
+        )
+        return db.execute(stmt.offset(skip).limit(limit)).scalars().all()
 
     def get_count_with_filters(
         self,
@@ -71,15 +87,7 @@ class CRUDMove(CRUDBase[Move, MoveCreate, MoveUpdate]):
         type_name: Optional[str] = None,
         category: Optional[str] = None
     ) -> int:
-        query = db.query(Move)
-
-        if type_name:
-            query = query.filter(Move.type == type_name)
-
-        if category:
-            query = query.filter(Move.category == category)
-
-        return query.count()
+        return self.get_filtered_count(db, type_name=type_name, category=category)
 
 
 move_crud = CRUDMove(Move)
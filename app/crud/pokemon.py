@@ -3,7 +3,7 @@
 """
 from typing import List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import select, union_all, Select
 
 from app.crud.base import CRUDBase
 from app.models.pokemon import Pokemon
@@ -11,6 +11,12 @@ from app.schemas import PokemonCreate, PokemonUpdate
 
 
 class CRUDPokemon(CRUDBase[Pokemon, PokemonCreate, PokemonUpdate]):
+    cursor_field = "national_dex"
+    number_field = "national_dex"
+    index_fields = {"type_name": ("type1", "type2")}
+    search_fields = ("name", "english_name", "japanese_name")
+    joined_filters = ("type_name",)
+
     def get_by_national_dex(self, db: Session, *, national_dex: int) -> Optional[Pokemon]:
         return db.query(Pokemon).filter(Pokemon.national_dex == national_dex).first()
 
@@ -28,14 +34,11 @@ class CRUDPokemon(CRUDBase[Pokemon, PokemonCreate, PokemonUpdate]):
         skip: int = 0,
         limit: int = 100
     ) -> List[Pokemon]:
-        return db.query(Pokemon).filter(
-            or_(Pokemon.type1 == type_name, Pokemon.type2 == type_name)
-        ).offset(skip).limit(limit).all()
+        stmt = self._filter_statement(select(Pokemon), type_name=type_name)
+        return db.execute(stmt.offset(skip).limit(limit)).scalars().all()
 
     def get_count_by_type(self, db: Session, *, type_name: str) -> int:
-        return db.query(Pokemon).filter(
-            or_(Pokemon.type1 == type_name, Pokemon.type2 == type_name)
-        ).count()
+        return self.get_filtered_count(db, type_name=type_name)
 
     def search_pokemon(
         self,
@@ -45,22 +48,41 @@ class CRUDPokemon(CRUDBase[Pokemon, PokemonCreate, PokemonUpdate]):
         skip: int = 0,
         limit: int = 100
     ) -> List[Pokemon]:
-        return db.query(Pokemon).filter(
-            or_(
-                Pokemon.name.ilike(f"%{query}%"),
-                Pokemon.english_name.ilike(f"%{query}%"),
-                Pokemon.japanese_name.ilike(f"%{query}%")
-            )
-        ).offset(skip).limit(limit).all()
+        return self.search(
+            db=db, query=query, search_fields=self.search_fields, skip=skip, limit=limit
+        )
 
     def get_search_count(self, db: Session, *, query: str) -> int:
-        return db.query(Pokemon).filter(
-            or_(
-                Pokemon.name.ilike(f"%{query}%"),
-                Pokemon.english_name.ilike(f"%{query}%"),
-                Pokemon.japanese_name.ilike(f"%{query}%")
-            )
-        ).count()
+        return self.get_filtered_count(db, search=query)
+
+    @staticmethod
+    def _type_ids(type_name: str):
+        """具有某属性的宝可梦主键：type1、type2 各走自己的索引，UNION ALL 合并
+
+        type1 = x OR type2 = x 在 MySQL 上常退化为全表扫描；写成 id IN (... UNION ...) 又会
+        被当作相关子查询逐行执行，所以作为派生表与主表按主键 JOIN。
+        同一宝可梦的两个属性不同，两路结果不会重复，不需要 UNION 去重。
+        """
+        return union_all(
+            select(Pokemon.id).where(Pokemon.type1 == type_name),
+            select(Pokemon.id).where(Pokemon.type2 == type_name),
+        ).subquery()
+
+    def _filter_statement(
+        self,
+        stmt: Select,
+        *,
+        type_name: Optional[str] = None,
+        search: Optional[str] = None
+    ) -> Select:
+        if type_name:
+            typed = self._type_ids(type_name)
+            stmt = stmt.join(typed, typed.c.id == Pokemon.id)
+
+        if search:
+            stmt = stmt.where(self._search_condition(search))
+
+        return stmt
 
     def get_with_filters(
         self,
@@ -71,23 +93,11 @@ class CRUDPokemon(CRUDBase[Pokemon, PokemonCreate, PokemonUpdate]):
         type_name: Optional[str] = None,
         search: Optional[str] = None
     ) -> List[Pokemon]:
-        query = db.query(Pokemon)
-
-        if type_name:
-            query = query.filter(
-                or_(Pokemon.type1 == type_name, Pokemon.type2 == type_name)
-            )
-
-        if search:
-            query = query.filter(
-                or_(
-                    Pokemon.name.ilike(f"%{search}%"),
-                    Pokemon.english_name.ilike(f"%{search}%"),
-                    Pokemon.japanese_name.ilike(f"%{search}%")
-                )
-            )
-
-        return query.offset(skip).limit(limit).all()
+        self._prepare_search(db, {"search": search})
+        stmt = self._filter_statement(
+            select(Pokemon), type_name=type_name, search=search
+        )
+        return db.execute(stmt.offset(skip).limit(limit)).scalars().all()
 
     def get_count_with_filters(
         self,
@@ -96,23 +106,7 @@ class CRUDPokemon(CRUDBase[Pokemon, PokemonCreate, PokemonUpdate]):
         type_name: Optional[str] = None,
         search: Optional[str] = None
     ) -> int:
-        query = db.query(Pokemon)
-
-        if type_name:
-            query = query.filter(
-                or_(Pokemon.type1 == type_name, Pokemon.type2 == type_name)
-            )
-
-        if search:
-            query = query.filter(
-                or_(
-                    Pokemon.name.ilike(f"%{search}%"),
-                    Pokemon.english_name.ilike(f"%{search}%"),
-                    Pokemon.japanese_name.ilike(f"%{search}%")
-                )
-            )
-
-        return query.count()
+        return self.get_filtered_count(db, type_name=type_name, search=search)
 
 
 pokemon_crud = CRUDPokemon(Pokemon)
@@ -0,0 +1,171 @@
+"""
+名称搜索索引：进程内的 n-gram 倒排索引
+"""
+import threading
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def normalize(text: str) -> str:
+    """NFKC 统一全角/半角后按 Unicode 规则转小写"""
+    return unicodedata.normalize("NFKC", text).casefold()
+
+
+def grams(text: str) -> Set[str]:
+    """文本的全部 1-gram 和 2-gram"""
+    result = set(text)
+    result.update(text[i:i + 2] for i in range(len(text) - 1))
+    return result
+
+
+def query_grams(needle: str) -> Set[str]:
+    """查询串用于求交集的 gram：单字用 1-gram，其余用 2-gram"""
+    if len(needle) == 1:
+        return {needle}
+    return {needle[i:i + 2] for i in range(len(needle) - 1)}
+
+
+class SearchIndex:
+    """单个 CRUD 的名称搜索索引
+
+    名称多是 2~10 个字符的中日文或英文单词，按字符 1-gram/2-gram 建立倒排表。
+    查询先用查询串的 gram 求交集得到候选，再逐个校验子串，
+    命中集合与 ILIKE '%q%' 相同，但不需要扫描整张表。
+
+    结果按相关度排序：完全匹配 > 前缀匹配 > 包含；同级按字段顺序（中文名优先）、
+    名称长度、排序键。首次搜索时从数据库加载，之后随本进程的 CRUD 写操作增量更新；
+    其他进程的写入由表数据版本（TableVersion）发现，版本变化后在下一次搜索前重建。
+    """
+
+    max_cached_results = 1024
+
+    def __init__(self, crud: Any):
+        self.crud = crud
+        self.fields: Tuple[str, ...] = crud.search_fields
+        self.ready = False
+        self._version = None
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Set[int]] = {}
+        self._entries: Dict[int, Tuple[Any, Tuple[str, ...]]] = {}
+        self._results: Dict[str, Tuple[int, ...]] = {}
+        crud.add_write_listener(self._on_write)
+
+    def load(self, records: Iterable[dict], version: Any = None):
+        """从序列化后的记录整体重建；version 为读取记录前的表数据版本"""
+        key_field = self.crud.cursor_field
+        with self._lock:
+            self._version = version
+            self._postings = {}
+            self._entries = {}
+            self._results = {}
+            for record in records:
+                self._add(record["id"], record[key_field], [record[field] for field in self.fields])
+            self.ready = True
+
+    def build(self, db: Session, version: Any = None):
+        """只读取主键、排序键和名称列来重建"""
+        model = self.crud.model
+        columns = ("id", self.crud.cursor_field, *self.fields)
+        rows = db.execute(select(*(getattr(model, column) for column in columns))).all()
+        self.load((dict(zip(columns, row)) for row in rows), version)
+
+    def ensure(self, db: Session):
+        # 预加载模式下索引随内存目录重建，不查询表数据版本
+        if self.ready and self.crud.memory_table is not None:
+            return
+        version = self.crud.version.current(db)
+        if not self.ready or not self.crud.version.is_current(self._version, version):
+            self.build(db, version)
+
+    async def aensure(self, db: AsyncSession):
+        if self.ready and self.crud.memory_table is not None:
+            return
+        version = await self.crud.version.acurrent(db)
+        if not self.ready or not self.crud.version.is_current(self._version, version):
+            await db.run_sync(self.build, version)
+
+    def _add(self, id: int, key: Any, values: Sequence[Optional[str]]):
+        names = tuple(normalize(value) if value else "" for value in values)
+        self._entries[id] = (key, names)
+        for gram in set().union(*(grams(name) for name in names)):
+            self._postings.setdefault(gram, set()).add(id)
+
+    def _remove(self, id: int):
+        entry = self._entries.pop(id, None)
+        if entry is None:
+            return
+        for gram in set().union(*(grams(name) for name in entry[1])):
+            postings = self._postings.get(gram)
+            if postings is not None:
+                postings.discard(id)
+                if not postings:
+                    del self._postings[gram]
+
+    def _on_write(self, db: Session, crud: Any, action: str, data: Optional[dict]):
+        if action == "bulk":
+            # 批量写入后下一次搜索时从数据库重建
+            with self._lock:
+                self.ready = False
+                self._results.clear()
+            return
+        if not self.ready or data is None:
+            return
+        with self._lock:
+            self._remove(data["id"])
+            if action != "remove":
+                self._add(
+                    data["id"], data[self.crud.cursor_field], [data[field] for field in self.fields]
+                )
+            self._results.clear()
+
+    def search(self, query: str) -> Tuple[int, ...]:
+        """返回按相关度排序的主键"""
+        needle = normalize(query)
+        with self._lock:
+            result = self._results.get(needle)
+            if result is not None:
+                return result
+
+            candidates: Optional[Set[int]] = None
+            # 从最短的倒排表开始求交集
+            for gram in sorted(query_grams(needle), key=lambda g: len(self._postings.get(g, ()))):
+                postings = self._postings.get(gram)
+                if not postings:
+                    candidates = set()
+                    break
+                candidates = set(postings) if candidates is None else candidates & postings
+                if not candidates:
+                    break
+
+            scored = []
+            for id in candidates or ():
+                key, names = self._entries[id]
+                best = None
+                for position, name in enumerate(names):
+                    if needle in name:
+                        level = 0 if name == needle else 1 if name.startswith(needle) else 2
+                        rank = (level, position, len(name))
+                        if best is None or rank < best:
+                            best = rank
+                if best is not None:
+                    scored.append((best, key, id))
+            scored.sort()
+            result = tuple(id for _, _, id in scored)
+
+            if len(self._results) >= self.max_cached_results:
+                self._results.clear()
+            self._results[needle] = result
+            return result
+
+    def condition(self, query: str):
+        """WHERE 条件：主键在命中集合内"""
+        return self.crud.model.id.in_(self.search(query))
+
+    def keyed(self, ids: Iterable[int]) -> List[Tuple[Any, int]]:
+        """按排序键升序返回 (排序键, 主键)，供游标分页使用"""
+        with self._lock:
+            return sorted((self._entries[id][0], id) for id in ids if id in self._entries)
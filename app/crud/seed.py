@@ -0,0 +1,181 @@
+"""
+种子数据快照：每表一个 gzip NDJSON 文件 + manifest.json，Core 批量插入，按快照版本幂等
+"""
+import gzip
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import JSON, Table, delete, insert, null, select
+
+from app.config import settings
+from app.crud.bulk import natural_key, upsert_statement
+from app.crud.export import EXPORT_TABLES, export_statement, ndjson_chunk
+from app.crud.imports import parse_file
+from app.models.pokemon import SeedSnapshot
+from app.utils.serializer import RowSerializer
+
+MANIFEST = "manifest.json"
+# 按外键依赖顺序导入：pokemon_moves 引用 pokemon.id 和 moves.id
+SEED_TABLES: Dict[str, Table] = EXPORT_TABLES
+# 时间戳由列默认值在导入时生成，不写入快照
+SKIPPED_COLUMNS = ("created_at", "updated_at")
+
+
+def snapshot_columns(table: Table) -> list:
+    return [column for column in table.columns if column.name not in SKIPPED_COLUMNS]
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build_snapshot(bind, directory: str, version: Optional[str] = None, chunk_size: int = 1000) -> dict:
+    """把当前数据库导出为快照，返回 manifest
+
+    行按主键顺序写出，gzip 头不含时间和文件名，相同数据得到相同的文件；
+    未指定 version 时取各文件哈希的摘要，数据不变则版本不变。
+    生成的 manifest 不带 placeholder 标记（仓库自带的演示快照带有该标记）。
+    """
+    os.makedirs(directory, exist_ok=True)
+    tables = {}
+    digest = hashlib.sha256()
+    with bind.connect() as conn:
+        for name, table in SEED_TABLES.items():
+            columns = snapshot_columns(table)
+            serializer = RowSerializer(columns)
+            filename = f"{name}.ndjson.gz"
+            path = os.path.join(directory, filename)
+            rows = 0
+            result = conn.execution_options(yield_per=chunk_size).execute(export_statement(table, columns))
+            with open(path, "wb") as raw, gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) as out:
+                for partition in result.partitions():
+                    out.write(ndjson_chunk(serializer.many(partition)))
+                    rows += len(partition)
+            checksum = _sha256(path)
+            digest.update(checksum.encode())
+            tables[name] = {"file": filename, "rows": rows, "sha256": checksum}
+
+    manifest = {
+        "version": version or digest.hexdigest()[:12],
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "tables": tables,
+    }
+    with open(os.path.join(directory, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    return manifest
+
+
+def load_manifest(directory: str) -> dict:
+    with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+        manifest = json.load(f)
+    unknown = [name for name in manifest["tables"] if name not in SEED_TABLES]
+    if unknown:
+        raise ValueError(f"快照包含未知的表: {', '.join(unknown)}")
+    return manifest
+
+
+def read_snapshot_rows(path: str, table: Table) -> Iterator[Dict[str, Any]]:
+    """逐行读取快照文件；JSON 列的 null 绑定为 SQL NULL（否则会写成 JSON 'null'）"""
+    json_columns = [column.name for column in table.columns if isinstance(column.type, JSON)]
+    for line, record, error in parse_file(path):
+        if error is not None:
+            raise ValueError(f"{path} 第 {line} 行: {error}")
+        for name in json_columns:
+            if name in record and record[name] is None:
+                record[name] = null()
+        yield record
+
+
+@dataclass
+class SnapshotReport:
+    version: str
+    applied: bool = False
+    rows: Dict[str, int] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def __str__(self) -> str:
+        if not self.applied:
+            return f"快照 {self.version} 已导入，跳过"
+        tables = ", ".join(f"{name} {rows}" for name, rows in self.rows.items())
+        text = f"快照 {self.version}: {tables} 行, {self.seconds:.2f}s"
+        if self.skipped:
+            text += f"（跳过 {', '.join(self.skipped)}）"
+        return text
+
+
+def apply_snapshot(
+    bind,
+    directory: str = settings.SEED_SNAPSHOT_DIR,
+    *,
+    chunk_size: int = settings.BULK_CHUNK_SIZE,
+    force: bool = False
+) -> SnapshotReport:
+    """导入快照；已记录在 seed_snapshots 中的版本直接跳过（一次主键查询），force 时重新导入
+
+    空表按快照中的主键原样批量 INSERT；已有数据的表按自然键 upsert，保留原有主键和快照外的行。
+    没有自然键的关联表（pokemon_moves）以主键引用其他表，只在它和被引用的表都为空时导入。
+    整个快照在一个事务内写入，中途失败全部回滚、版本不记录，下次启动重试。
+    """
+    manifest = load_manifest(directory)
+    report = SnapshotReport(manifest["version"])
+    started = time.perf_counter()
+    with bind.begin() as conn:
+        applied = conn.scalar(select(SeedSnapshot.version).where(SeedSnapshot.version == report.version))
+        if applied is not None and not force:
+            return report
+
+        remapped = False
+        for name, entry in manifest["tables"].items():
+            table = SEED_TABLES[name]
+            path = os.path.join(directory, entry["file"])
+            if _sha256(path) != entry["sha256"]:
+                raise ValueError(f"快照文件校验失败: {path}")
+
+            try:
+                key = natural_key(table)
+            except ValueError:
+                key = None
+            primary_key = list(table.primary_key.columns)[0]
+            empty = conn.scalar(select(primary_key).limit(1)) is None
+            rows = read_snapshot_rows(path, table)
+            if empty and (key is not None or not remapped):
+                stmt = insert(table)
+            elif key is None:
+                report.skipped.append(name)
+                continue
+            else:
+                # upsert 保留原有主键，快照中的主键不再与库中一致
+                remapped = True
+                columns = [column.name for column in snapshot_columns(table) if column is not primary_key]
+                # 与 BulkUpserter 相同：冲突时 updated_at 随之更新
+                if "updated_at" in table.columns:
+                    columns.append("updated_at")
+                stmt = upsert_statement(table, conn.dialect.name, key, columns)
+                rows = ({k: v for k, v in row.items() if k != primary_key.name} for row in rows)
+
+            count = 0
+            while True:
+                batch = list(islice(rows, chunk_size))
+                if not batch:
+                    break
+                conn.execute(stmt, batch)
+                count += len(batch)
+            report.rows[name] = count
+
+        conn.execute(delete(SeedSnapshot.__table__).where(SeedSnapshot.version == report.version))
+        conn.execute(insert(SeedSnapshot.__table__).values(version=report.version, rows=sum(report.rows.values())))
+    report.applied = True
+    report.seconds = time.perf_counter() - started
+    return report
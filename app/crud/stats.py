@@ -0,0 +1,234 @@
+"""
+宝可梦种族值统计：按属性、属性组合、世代维护的聚合（内存物化视图）
+"""
+import threading
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.crud.pokemon import pokemon_crud
+
+STAT_FIELDS = ("hp", "attack", "defense", "sp_attack", "sp_defense", "speed", "total_stats")
+DIMENSIONS = ("type", "type_pair", "generation")
+
+# 各世代最后一个全国图鉴编号；超出范围的（10000 以上的特殊形态）不计入世代统计
+GENERATION_BOUNDS = (
+    (151, "第一世代"),
+    (251, "第二世代"),
+    (386, "第三世代"),
+    (493, "第四世代"),
+    (649, "第五世代"),
+    (721, "第六世代"),
+    (809, "第七世代"),
+    (905, "第八世代"),
+    (1025, "第九世代"),
+)
+
+
+def generation_of(national_dex: int) -> Optional[str]:
+    for last, generation in GENERATION_BOUNDS:
+        if national_dex <= last:
+            return generation
+    return None
+
+
+def type_pair_key(types: Iterable[Optional[str]]) -> str:
+    """属性组合的键：与顺序无关（火/飞行 与 飞行/火 相同），单属性即属性名"""
+    return "/".join(sorted({type for type in types if type}))
+
+
+class StatGroup:
+    """单个分组的聚合
+
+    每项种族值保存一个有序数组和总和：加入、移除一只宝可梦都是一次二分插入/删除，
+    最小、最大值取数组两端，平均值由总和得出；总种族值另按区间计数。
+    汇总结果缓存到分组下一次变化为止。
+    """
+
+    __slots__ = ("count", "values", "sums", "histogram", "_summary")
+
+    def __init__(self):
+        self.count = 0
+        self.values: Tuple[List[int], ...] = tuple([] for _ in STAT_FIELDS)
+        self.sums = [0] * len(STAT_FIELDS)
+        self.histogram: Dict[int, int] = {}
+        self._summary: Optional[dict] = None
+
+    def add(self, stats: tuple, bucket: Optional[int]):
+        self.count += 1
+        for index, value in enumerate(stats):
+            if value is not None:
+                insort(self.values[index], value)
+                self.sums[index] += value
+        if bucket is not None:
+            self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+        self._summary = None
+
+    def discard(self, stats: tuple, bucket: Optional[int]):
+        self.count -= 1
+        for index, value in enumerate(stats):
+            if value is not None:
+                values = self.values[index]
+                del values[bisect_left(values, value)]
+                self.sums[index] -= value
+        if bucket is not None:
+            self.histogram[bucket] -= 1
+            if not self.histogram[bucket]:
+                del self.histogram[bucket]
+        self._summary = None
+
+    def summary(self, bucket_width: int) -> dict:
+        if self._summary is None:
+            stats = {}
+            for field, values, total in zip(STAT_FIELDS, self.values, self.sums):
+                stats[field] = {
+                    "min": values[0],
+                    "max": values[-1],
+                    "mean": round(total / len(values), 2),
+                } if values else {"min": None, "max": None, "mean": None}
+            self._summary = {
+                "count": self.count,
+                "stats": stats,
+                "total_stats_distribution": [
+                    {"from": bucket, "to": bucket + bucket_width - 1, "count": self.histogram[bucket]}
+                    for bucket in sorted(self.histogram)
+                ],
+            }
+        return self._summary
+
+
+class PokemonStats:
+    """按属性、属性组合、世代分组的种族值统计
+
+    首次查询时从 pokemon 表加载一次，之后随 CRUD 的增删改增量维护：
+    每只宝可梦记住它所在的分组和种族值，更新时先从旧分组移除再加入新分组，
+    只有受影响分组的汇总需要重新计算，查询直接返回缓存的汇总。
+    批量写入后整体失效，下一次查询重新加载；其他进程的写入由表数据版本发现，同样重新加载。
+    """
+
+    bucket_width = 50
+
+    def __init__(self, crud: CRUDBase):
+        self.crud = crud
+        self._lock = threading.Lock()
+        self._records: Optional[Dict[int, Tuple[Dict[str, Tuple[str, ...]], tuple]]] = None
+        self._version = None
+        self._overall = StatGroup()
+        self._groups: Dict[str, Dict[str, StatGroup]] = {dimension: {} for dimension in DIMENSIONS}
+        self._listings: Dict[str, dict] = {}
+        crud.add_write_listener(self._on_write)
+
+    @property
+    def loaded(self) -> bool:
+        return self._records is not None
+
+    def load(self, db: Session, version: Any = None):
+        """version 为读取前的表数据版本"""
+        columns = ("id", "national_dex", "type1", "type2", *STAT_FIELDS)
+        stmt = select(*(getattr(self.crud.model, column) for column in columns))
+        rows = [dict(zip(columns, row)) for row in db.execute(stmt)]
+        with self._lock:
+            self._version = version
+            self._records = {}
+            self._overall = StatGroup()
+            self._groups = {dimension: {} for dimension in DIMENSIONS}
+            self._listings = {}
+            for data in rows:
+                self._add(data)
+
+    def ensure(self, db: Session):
+        version = self.crud.version.current(db)
+        if not self.loaded or not self.crud.version.is_current(self._version, version):
+            self.load(db, version)
+
+    async def aensure(self, db: AsyncSession):
+        version = await self.crud.version.acurrent(db)
+        if not self.loaded or not self.crud.version.is_current(self._version, version):
+            await db.run_sync(self.load, version)
+
+    @staticmethod
+    def _memberships(data: dict) -> Dict[str, Tuple[str, ...]]:
+        generation = generation_of(data["national_dex"])
+        return {
+            "type": tuple({type for type in (data["type1"], data["type2"]) if type}),
+            "type_pair": (type_pair_key((data["type1"], data["type2"])),),
+            "generation": (generation,) if generation else (),
+        }
+
+    def _bucket(self, stats: tuple) -> Optional[int]:
+        total = stats[-1]
+        return None if total is None else total // self.bucket_width * self.bucket_width
+
+    def _add(self, data: dict):
+        memberships = self._memberships(data)
+        stats = tuple(data[field] for field in STAT_FIELDS)
+        self._apply(memberships, stats, add=True)
+        self._records[data["id"]] = (memberships, stats)
+
+    def _discard(self, id: int):
+        previous = self._records.pop(id, None)
+        if previous is not None:
+            self._apply(*previous, add=False)
+
+    def _apply(self, memberships: Dict[str, Tuple[str, ...]], stats: tuple, add: bool):
+        bucket = self._bucket(stats)
+        groups = [self._overall]
+        for dimension, keys in memberships.items():
+            for key in keys:
+                groups.append(self._groups[dimension].setdefault(key, StatGroup()))
+            self._listings.pop(dimension, None)
+        for group in groups:
+            if add:
+                group.add(stats, bucket)
+            else:
+                group.discard(stats, bucket)
+        if not add:
+            for dimension, keys in memberships.items():
+                for key in keys:
+                    if not self._groups[dimension][key].count:
+                        del self._groups[dimension][key]
+
+    def _on_write(self, db: Session, crud: CRUDBase, action: str, data: Optional[dict]):
+        if not self.loaded:
+            return
+        with self._lock:
+            if action == "bulk":
+                # 批量写入后整体失效，下一次查询重新加载
+                self._records = None
+                return
+            if data is None:
+                return
+            self._discard(data["id"])
+            if action != "remove":
+                self._add(data)
+
+    def overview(self) -> dict:
+        """全部宝可梦的汇总"""
+        with self._lock:
+            return self._overall.summary(self.bucket_width)
+
+    def dimension(self, dimension: str) -> dict:
+        """某一维度下全部分组的汇总：{分组键: 汇总}"""
+        with self._lock:
+            listing = self._listings.get(dimension)
+            if listing is None:
+                groups = self._groups[dimension]
+                listing = self._listings[dimension] = {
+                    key: groups[key].summary(self.bucket_width) for key in sorted(groups)
+                }
+            return listing
+
+    def group(self, dimension: str, key: str) -> Optional[dict]:
+        """单个分组的汇总；属性组合的键与顺序无关"""
+        if dimension == "type_pair":
+            key = type_pair_key(key.split("/"))
+        with self._lock:
+            group = self._groups[dimension].get(key)
+            return group.summary(self.bucket_width) if group is not None else None
+
+
+pokemon_stats = PokemonStats(pokemon_crud)
@@ -0,0 +1,177 @@
+"""
+输入提示：四张表名称上的前缀索引
+"""
+import heapq
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.crud.pokemon import pokemon_crud
+from app.crud.move import move_crud
+from app.crud.ability import ability_crud
+from app.crud.item import item_crud
+from app.crud.search import normalize
+
+NAME_FIELDS = ("name", "japanese_name", "english_name")
+
+# 片假名 ァ(U+30A1)~ヶ(U+30F6) 与平假名 ぁ(U+3041)~ゖ(U+3096) 一一对应
+KATAKANA_TO_HIRAGANA = {code: code - 0x60 for code in range(0x30A1, 0x30F7)}
+
+
+def fold(text: str) -> str:
+    """提示用的归一化：NFKC + 小写 + 片假名转平假名（フシギ 与 ふしぎ 等价）"""
+    return normalize(text).translate(KATAKANA_TO_HIRAGANA)
+
+
+class Suggester:
+    """名称前缀提示
+
+    每个名称（中文、日文、英文）归一化后放进一个有序数组，查询时二分定位前缀区间；
+    区间内按名称长度（越短越接近用户想要的词）、表顺序、编号取前 k 个，每个实体只出现一次。
+    各表的名称随本进程的 CRUD 写操作增量更新，有序数组在下一次查询时重新合并；
+    其他进程写入的表由表数据版本发现，只重新加载版本变化的那张表。
+    单字前缀的区间可能很大，查询结果按 (前缀, 类别, 数量) 缓存到下一次重建为止。
+    """
+
+    max_cached_results = 4096
+
+    def __init__(self, cruds: Dict[str, CRUDBase]):
+        self.cruds = cruds
+        self._lock = threading.Lock()
+        self._records: Dict[str, Dict[int, dict]] = {}
+        self._versions: Dict[str, Any] = {}
+        self._keys: List[str] = []
+        self._slots: List[Tuple[Tuple[int, int, Any], str, int, str]] = []
+        self._dirty = True
+        self._results: Dict[tuple, List[dict]] = {}
+        for crud in cruds.values():
+            crud.add_write_listener(self._on_write)
+
+    @property
+    def loaded(self) -> bool:
+        return len(self._records) == len(self.cruds)
+
+    def load(self, db: Session, versions: Optional[Dict[str, Any]] = None):
+        """加载 versions 中的表（默认全部）；versions 为读取前各表的数据版本"""
+        if versions is None:
+            versions = dict.fromkeys(self.cruds)
+        records = {}
+        for kind in versions:
+            crud = self.cruds[kind]
+            columns = ("id", crud.cursor_field, *NAME_FIELDS)
+            stmt = select(*(getattr(crud.model, column) for column in columns))
+            records[kind] = {row[0]: self._record(crud, dict(zip(columns, row))) for row in db.execute(stmt)}
+        with self._lock:
+            merged = {**self._records, **records}
+            # 保持注册时的表顺序，排名中的表顺序依赖它
+            self._records = {kind: merged[kind] for kind in self.cruds if kind in merged}
+            self._versions.update(versions)
+            self._dirty = True
+
+    def _stale(self, versions: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            kind: version for kind, version in versions.items()
+            if kind not in self._records
+            or not self.cruds[kind].version.is_current(self._versions.get(kind), version)
+        }
+
+    def ensure(self, db: Session):
+        stale = self._stale({kind: crud.version.current(db) for kind, crud in self.cruds.items()})
+        if stale:
+            self.load(db, stale)
+
+    async def aensure(self, db: AsyncSession):
+        versions = {kind: await crud.version.acurrent(db) for kind, crud in self.cruds.items()}
+        stale = self._stale(versions)
+        if stale:
+            await db.run_sync(self.load, stale)
+
+    @staticmethod
+    def _record(crud: CRUDBase, data: dict) -> dict:
+        record = {"id": data["id"], "number": data[crud.cursor_field]}
+        record.update((field, data[field]) for field in NAME_FIELDS)
+        return record
+
+    def _on_write(self, db: Session, crud: CRUDBase, action: str, data: Optional[dict]):
+        kind = next(kind for kind, registered in self.cruds.items() if registered is crud)
+        if kind not in self._records:
+            return
+        if action == "bulk":
+            # 批量写入后该表在下一次查询时重新加载
+            with self._lock:
+                self._records.pop(kind, None)
+                self._dirty = True
+            return
+        if data is None:
+            return
+        with self._lock:
+            records = self._records.get(kind)
+            if records is None:
+                return
+            if action == "remove":
+                records.pop(data["id"], None)
+            else:
+                records[data["id"]] = self._record(crud, data)
+            self._dirty = True
+
+    def _rebuild(self):
+        slots = []
+        for order, (kind, records) in enumerate(self._records.items()):
+            for record in records.values():
+                for name in {record[field] for field in NAME_FIELDS if record[field]}:
+                    key = fold(name)
+                    slots.append((key, (len(key), order, record["number"]), kind, record["id"], name))
+        slots.sort()
+        self._keys = [slot[0] for slot in slots]
+        self._slots = [slot[1:] for slot in slots]
+        self._results = {}
+        self._dirty = False
+
+    def suggest(
+        self, query: str, limit: int = 10, kinds: Optional[Sequence[str]] = None
+    ) -> List[dict]:
+        """返回名称以 query 开头的前 limit 个实体"""
+        prefix = fold(query)
+        if not prefix:
+            return []
+        with self._lock:
+            if self._dirty:
+                self._rebuild()
+            cache_key = (prefix, tuple(kinds) if kinds else None, limit)
+            result = self._results.get(cache_key)
+            if result is not None:
+                return result
+
+            start = bisect_left(self._keys, prefix)
+            # 前缀区间的右端：把最后一个字符换成下一个码位
+            end = bisect_left(self._keys, prefix[:-1] + chr(ord(prefix[-1]) + 1), lo=start)
+            best: Dict[Tuple[str, int], Tuple[tuple, str]] = {}
+            for rank, kind, id, name in self._slots[start:end]:
+                if kinds and kind not in kinds:
+                    continue
+                current = best.get((kind, id))
+                if current is None or rank < current[0]:
+                    best[(kind, id)] = (rank, name)
+
+            top = heapq.nsmallest(limit, best.items(), key=lambda item: item[1][0])
+            result = [
+                {"type": kind, **self._records[kind][id], "matched": name}
+                for (kind, id), (_, name) in top
+            ]
+            if len(self._results) >= self.max_cached_results:
+                self._results.clear()
+            self._results[cache_key] = result
+            return result
+
+
+suggester = Suggester({
+    "pokemon": pokemon_crud,
+    "moves": move_crud,
+    "abilities": ability_crud,
+    "items": item_crud,
+})
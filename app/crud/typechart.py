@@ -0,0 +1,135 @@
+"""
+属性相克：18x18 克制倍率矩阵与全部单/双属性的防御倍率表，启动时一次算好
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.pokemon import Pokemon
+from app.scraper.translations import TYPE_MAP
+
+# 第六世代起的相克表：攻击属性 -> {防御属性: 倍率}，未列出的为 1 倍
+CHART = {
+    "normal": {"rock": 0.5, "ghost": 0, "steel": 0.5},
+    "fire": {"fire": 0.5, "water": 0.5, "grass": 2, "ice": 2, "bug": 2, "rock": 0.5, "dragon": 0.5, "steel": 2},
+    "water": {"fire": 2, "water": 0.5, "grass": 0.5, "ground": 2, "rock": 2, "dragon": 0.5},
+    "electric": {"water": 2, "electric": 0.5, "grass": 0.5, "ground": 0, "flying": 2, "dragon": 0.5},
+    "grass": {
+        "fire": 0.5, "water": 2, "grass": 0.5, "poison": 0.5, "ground": 2, "flying": 0.5, "bug": 0.5,
+        "rock": 2, "dragon": 0.5, "steel": 0.5,
+    },
+    "ice": {"fire": 0.5, "water": 0.5, "grass": 2, "ice": 0.5, "ground": 2, "flying": 2, "dragon": 2, "steel": 0.5},
+    "fighting": {
+        "normal": 2, "ice": 2, "poison": 0.5, "flying": 0.5, "psychic": 0.5, "bug": 0.5, "rock": 2,
+        "ghost": 0, "dark": 2, "steel": 2, "fairy": 0.5,
+    },
+    "poison": {"grass": 2, "poison": 0.5, "ground": 0.5, "rock": 0.5, "ghost": 0.5, "steel": 0, "fairy": 2},
+    "ground": {"fire": 2, "electric": 2, "grass": 0.5, "poison": 2, "flying": 0, "bug": 0.5, "rock": 2, "steel": 2},
+    "flying": {"electric": 0.5, "grass": 2, "fighting": 2, "bug": 2, "rock": 0.5, "steel": 0.5},
+    "psychic": {"fighting": 2, "poison": 2, "psychic": 0.5, "dark": 0, "steel": 0.5},
+    "bug": {
+        "fire": 0.5, "grass": 2, "fighting": 0.5, "poison": 0.5, "flying": 0.5, "psychic": 2, "ghost": 0.5,
+        "dark": 2, "steel": 0.5, "fairy": 0.5,
+    },
+    "rock": {"fire": 2, "ice": 2, "fighting": 0.5, "ground": 0.5, "flying": 2, "bug": 2, "steel": 0.5},
+    "ghost": {"normal": 0, "psychic": 2, "ghost": 2, "dark": 0.5},
+    "dragon": {"dragon": 2, "steel": 0.5, "fairy": 0},
+    "dark": {"fighting": 0.5, "psychic": 2, "ghost": 2, "dark": 0.5, "fairy": 0.5},
+    "steel": {"fire": 0.5, "water": 0.5, "electric": 0.5, "ice": 2, "rock": 2, "steel": 0.5, "fairy": 2},
+    "fairy": {"fire": 0.5, "fighting": 2, "poison": 0.5, "dragon": 2, "dark": 2, "steel": 0.5},
+}
+
+
+class TypeChart:
+    """属性相克引擎
+
+    effectiveness[攻击, 防御] 是 18x18 倍率矩阵；defense[属性1, 属性2] 是该属性组合
+    受 18 种属性攻击的倍率（下标 18 表示没有第二属性），共 19x19x18，构造时一次广播算出。
+    查询只做数组下标访问，批量查询按下标数组一次取出整块。
+    """
+
+    def __init__(self, chart: Dict[str, Dict[str, float]] = CHART, names: Dict[str, str] = TYPE_MAP):
+        self.english: Tuple[str, ...] = tuple(names)
+        self.names: Tuple[str, ...] = tuple(names[type] for type in self.english)
+        # 中文名和英文名都可以作为属性参数
+        self.codes: Dict[str, int] = {name: code for code, name in enumerate(self.names)}
+        self.codes.update((type, code) for code, type in enumerate(self.english))
+        self.none = len(self.names)
+
+        size = len(self.names)
+        effectiveness = np.ones((size, size), dtype=np.float32)
+        for attacker, row in chart.items():
+            for defender, multiplier in row.items():
+                effectiveness[self.codes[attacker], self.codes[defender]] = multiplier
+        self.effectiveness = effectiveness
+
+        # 追加一列 1 倍代表“没有该属性”，两列相乘得到组合倍率
+        padded = np.hstack([effectiveness, np.ones((size, 1), dtype=np.float32)])
+        defense = (padded[:, :, None] * padded[:, None, :]).transpose(1, 2, 0)
+        # 同一属性不重复计算
+        diagonal = np.arange(size)
+        defense[diagonal, diagonal] = effectiveness.T
+        self.defense = defense
+
+    def code(self, type_name: Optional[str]) -> Optional[int]:
+        if not type_name:
+            return self.none
+        return self.codes.get(type_name)
+
+    def types(self) -> List[dict]:
+        return [{"name": name, "english_name": english} for name, english in zip(self.names, self.english)]
+
+    def _profile(self, multipliers: np.ndarray) -> dict:
+        """倍率向量 -> {倍率表, 按倍率分组的属性}"""
+        values = multipliers.tolist()
+        groups: Dict[str, List[str]] = {}
+        for name, value in zip(self.names, values):
+            if value != 1:
+                groups.setdefault(f"{value:g}", []).append(name)
+        return {
+            "multipliers": dict(zip(self.names, values)),
+            "by_multiplier": dict(sorted(groups.items(), key=lambda item: -float(item[0]))),
+        }
+
+    def matchups(self, type_name: str, second: Optional[str] = None) -> Optional[dict]:
+        """某属性的攻击面（对 18 种属性的倍率）和防御面（受 18 种属性攻击的倍率，可带第二属性）"""
+        code = self.codes.get(type_name)
+        other = self.code(second)
+        if code is None or other is None:
+            return None
+        result = {
+            "type": self.names[code],
+            "english_name": self.english[code],
+            "defense": self._profile(self.defense[code, other]),
+        }
+        if other != self.none and other != code:
+            result["second_type"] = self.names[other]
+        else:
+            result["offense"] = self._profile(self.effectiveness[code])
+        return result
+
+    def defenses(self, pokemon: Iterable[dict]) -> List[dict]:
+        """一批宝可梦的防御倍率：先把属性转成下标数组，再一次取出 (n, 18) 的倍率块"""
+        pokemon = list(pokemon)
+        known = [
+            entry for entry in pokemon
+            if self.code(entry["type1"]) is not None and self.code(entry["type2"]) is not None
+        ]
+        first = np.array([self.code(entry["type1"]) for entry in known], dtype=np.intp)
+        second = np.array([self.code(entry["type2"]) for entry in known], dtype=np.intp)
+        block = self.defense[first, second] if known else np.empty((0, len(self.names)))
+        profiles = {id(entry): self._profile(row) for entry, row in zip(known, block)}
+        return [{**entry, "defense": profiles.get(id(entry))} for entry in pokemon]
+
+    async def adefenses_by_dex(self, db: AsyncSession, numbers: List[int]) -> List[dict]:
+        """按全国图鉴编号批量查询防御倍率，一次 SQL 取出全部属性，结果按请求顺序排列"""
+        stmt = select(Pokemon.national_dex, Pokemon.name, Pokemon.type1, Pokemon.type2).where(
+            Pokemon.national_dex.in_(set(numbers))
+        )
+        rows = {row.national_dex: dict(row._mapping) for row in await db.execute(stmt)}
+        return self.defenses(rows[number] for number in dict.fromkeys(numbers) if number in rows)
+
+
+type_chart = TypeChart()
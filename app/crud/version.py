@@ -0,0 +1,72 @@
+"""
+表数据版本探针：内存索引据此发现其他进程（爬虫、导入脚本、其他 worker）写入的数据
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+
+# (行数, 最大 updated_at)
+Version = Tuple[int, Optional[datetime]]
+
+
+class TableVersion:
+    """表的 (行数, MAX(updated_at))，同一进程内至多每 interval 秒查询一次
+
+    写监听器只能看到本进程 CRUD 的写操作；内存中的搜索索引、输入提示、统计和分析
+    在应答前比较加载时记下的版本与当前版本，不一致就从数据库重新加载。
+    新增、删除改变行数，更新（ORM、批量 upsert 都会写 updated_at）改变最大修改时间。
+    updated_at 上有索引，MAX 只读索引一端，COUNT 扫描这个较小的二级索引而非整表。
+
+    MySQL 的 DATETIME 精度为秒，同一秒内的后续修改不会改变最大修改时间，
+    因此最近一次修改距今不足 settle 秒的版本不视为稳定：每次重新查询版本后都会重新加载，
+    同一次查询结果（间隔内缓存的同一个对象）不重复触发加载。
+    """
+
+    settle = timedelta(seconds=2)
+
+    def __init__(self, model: Any, interval: float = settings.INDEX_REFRESH_INTERVAL):
+        self.model = model
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._version: Optional[Version] = None
+        self._checked = 0.0
+
+    def statement(self):
+        return select(func.count(), func.max(self.model.updated_at)).select_from(self.model)
+
+    def _cached(self) -> Optional[Version]:
+        with self._lock:
+            if self._version is not None and time.monotonic() - self._checked < self.interval:
+                return self._version
+        return None
+
+    def _store(self, row: Any) -> Version:
+        version = (row[0], row[1])
+        with self._lock:
+            self._version = version
+            self._checked = time.monotonic()
+        return version
+
+    def current(self, db: Session) -> Version:
+        version = self._cached()
+        return version if version is not None else self._store(db.execute(self.statement()).one())
+
+    async def acurrent(self, db: AsyncSession) -> Version:
+        version = self._cached()
+        return version if version is not None else self._store((await db.execute(self.statement())).one())
+
+    def is_current(self, loaded: Optional[Version], version: Version) -> bool:
+        """loaded 为加载数据前取得的版本；与当前版本相同且已稳定时内存数据仍然有效"""
+        if loaded is version:
+            return True
+        if loaded is None or loaded != version:
+            return False
+        latest = version[1]
+        return latest is None or latest <= datetime.now() - self.settle
@@ -1,35 +1,63 @@
 """
 数据库连接管理
 """
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, JSON, ForeignKey
+from sqlalchemy import create_engine, inspect, text, Column, Integer, String, Float, DateTime, Text, JSON, ForeignKey
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session, relationship
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from datetime import datetime
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-# 从环境变量获取数据库配置
-DATABASE_URL = (
-    f"mysql+pymysql://{os.getenv('MYSQL_USER', 'root')}"
-    f":{os.getenv('MYSQL_PASSWORD', 'password')}"
-    f"@{os.getenv('MYSQL_HOST', 'localhost')}"
-    f":{os.getenv('MYSQL_PORT', '3306')}"
-    f"/{os.getenv('MYSQL_DATABASE', 'pokemon_api')}"
-    f"?charset=utf8mb4"
+
+from app.config import settings
+from app.utils.metrics import InstrumentedQueuePool, InstrumentedAsyncQueuePool
+
+DATABASE_URL = settings.DATABASE_URL
+
+# 连接池参数统一来自 Settings
+POOL_OPTIONS = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_use_lifo=settings.DB_POOL_USE_LIFO,
 )
 
 engine = create_engine(
     DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=3600,
-    echo=False
+    poolclass=InstrumentedQueuePool,
+    echo=False,
+    **POOL_OPTIONS
 )
 
 # 创建会话工厂
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 同步驱动到对应异步驱动：MySQL 用 aiomysql，SQLite（测试、基准）用 aiosqlite
+ASYNC_DRIVERS = {"+pymysql": "+aiomysql", "sqlite://": "sqlite+aiosqlite://"}
+
+
+def to_async_url(url: str) -> str:
+    """把同步数据库URL换成异步驱动的URL"""
+    for sync_driver, async_driver in ASYNC_DRIVERS.items():
+        if sync_driver in url:
+            return url.replace(sync_driver, async_driver)
+    raise ValueError(f"不支持的数据库URL: {url}")
+
+
+# 异步引擎，供 async 路由使用，避免查询阻塞事件循环
+ASYNC_DATABASE_URL = to_async_url(DATABASE_URL)
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    poolclass=InstrumentedAsyncQueuePool,
+    echo=False,
+    **POOL_OPTIONS
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 # 创建基类
 Base = declarative_base()
 
@@ -42,6 +70,60 @@ def get_db() -> Session:
     finally:
         db.close()
 
+# 获取异步数据库会话
+async def get_async_db() -> AsyncSession:
+    """获取异步数据库会话"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# 获取异步会话工厂
+def get_async_sessionmaker() -> async_sessionmaker:
+    """供流式响应在生成器内自行打开会话：依赖注入的会话在响应开始发送前就会关闭"""
+    return AsyncSessionLocal
+
+# 为已存在的表补上模型中新增的列
+def add_missing_columns(bind) -> list:
+    """create_all 不会修改已存在的表；模型新增的可空列在这里用 ALTER TABLE 补上
+
+    只处理可空、无服务端默认值的列（如 content_hash），返回新增的 "表.列" 列表。
+    """
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    added = []
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable or column.server_default is not None:
+                    continue
+                column_type = column.type.compile(dialect=conn.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                added.append(f"{table.name}.{column.name}")
+    return added
+
+# 为已存在的表补上模型中新增的索引
+def add_missing_indexes(bind) -> list:
+    """按名称比较模型与数据库中的索引，创建缺少的索引，返回新建的索引名列表"""
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    added = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=bind)
+                added.append(index.name)
+    return added
+
+# 升级已存在的表结构（create_all 只建新表）
+def upgrade_schema(bind) -> list:
+    """补上缺少的列和索引，返回变更列表"""
+    return add_missing_columns(bind) + add_missing_indexes(bind)
+
 # 初始化数据库表
 def init_db():
     """初始化数据库表"""
@@ -7,13 +7,18 @@ from fastapi.responses import JSONResponse
 from typing import Optional
 import uvicorn
 
+from app.config import settings
+from app.database import SessionLocal, engine, upgrade_schema as upgrade_database_schema
+from app.utils.serializer import FastJSONResponse
+
 # 创建FastAPI应用
 app = FastAPI(
     title="Pokemon API",
     description="宝可梦数据查询API",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=FastJSONResponse
 )
 
 # 导入管理后台（会自动注册路由）
@@ -51,6 +56,31 @@ async def general_exception_handler(request, exc):
         }
     )
 
+# 为已存在的表补上缺少的列和索引
+@app.on_event("startup")
+def upgrade_schema():
+    # 旧库没有模型新增的列（如 content_hash）时全列查询会失败，缺少新索引时筛选退化为全表扫描
+    try:
+        added = upgrade_database_schema(engine)
+    except Exception as e:
+        print(f"⚠️ 检查表结构失败: {e}")
+        return
+    if added:
+        print(f"✅ 已补充数据库列/索引: {', '.join(added)}")
+
+# 预加载内存目录
+@app.on_event("startup")
+def preload_catalog():
+    if not settings.PRELOAD_CATALOG:
+        return
+    from app.crud.catalog import catalog
+    db = SessionLocal()
+    try:
+        catalog.load(db)
+    finally:
+        db.close()
+    print(f"✅ 内存目录已加载: {catalog.stats()}")
+
 # 根路径
 @app.get("/")
 async def root():
@@ -65,7 +95,11 @@ async def root():
                 "pokemon": "/api/pokemon",
                 "moves": "/api/moves", 
                 "abilities": "/api/abilities",
-                "items": "/api/items"
+                "items": "/api/items",
+                "suggest": "/api/suggest",
+                "stats": "/api/stats",
+                "types": "/api/types",
+                "export": "/api/export"
             }
         }
     }
@@ -81,14 +115,57 @@ async def health_check():
         }
     }
 
+# 详情缓存统计
+@app.get("/cache/stats")
+async def cache_stats():
+    from app.crud import pokemon_crud, move_crud, ability_crud, item_crud
+    return {
+        "success": True,
+        "message": "获取成功",
+        "data": {
+            "pokemon": pokemon_crud.cache.stats(),
+            "moves": move_crud.cache.stats(),
+            "abilities": ability_crud.cache.stats(),
+            "items": item_crud.cache.stats()
+        }
+    }
+
+# 运行指标：连接池占用、取连接等待时间直方图与详情缓存
+@app.get("/metrics")
+async def metrics():
+    from app.database import engine, async_engine
+    from app.utils.metrics import pool_status
+    from app.crud import pokemon_crud, move_crud, ability_crud, item_crud
+    return {
+        "success": True,
+        "message": "获取成功",
+        "data": {
+            "pool": {
+                "sync": pool_status(engine),
+                "async": pool_status(async_engine.sync_engine)
+            },
+            "cache": {
+                "pokemon": pokemon_crud.cache.stats(),
+                "moves": move_crud.cache.stats(),
+                "abilities": ability_crud.cache.stats(),
+                "items": item_crud.cache.stats()
+            }
+        }
+    }
+
 # 导入路由
-from app.routers import pokemon, move, ability, item
+from app.routers import pokemon, move, ability, item, suggest, stats, analytics, types, export
 
-# 注册路由
+# 注册路由（分析路由先于宝可梦路由注册，/api/pokemon/analytics/* 不会被当作宝可梦名称）
+app.include_router(analytics.router, prefix="/api/pokemon/analytics", tags=["宝可梦分析"])
 app.include_router(pokemon.router, prefix="/api/pokemon", tags=["宝可梦"])
 app.include_router(move.router, prefix="/api/moves", tags=["招式"])
 app.include_router(ability.router, prefix="/api/abilities", tags=["特性"])
 app.include_router(item.router, prefix="/api/items", tags=["道具"])
+app.include_router(suggest.router, prefix="/api/suggest", tags=["输入提示"])
+app.include_router(stats.router, prefix="/api/stats", tags=["统计"])
+app.include_router(types.router, prefix="/api/types", tags=["属性相克"])
+app.include_router(export.router, prefix="/api/export", tags=["导出"])
 
 if __name__ == "__main__":
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
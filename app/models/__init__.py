@@ -1,6 +1,6 @@
 """
 数据库模型包初始化
 """
-from app.models.pokemon import Pokemon, Move, Ability, Item, PokemonMove
+from app.models.pokemon import Pokemon, Move, Ability, Item, PokemonMove, SeedSnapshot
 
-__all__ = ["Pokemon", "Move", "Ability", "Item", "PokemonMove"]
\ No newline at end of file
+__all__ = ["Pokemon", "Move", "Ability", "Item", "PokemonMove", "SeedSnapshot"]
\ No newline at end of file
@@ -18,7 +18,7 @@ class Pokemon(Base):
     japanese_name = Column(String(100))  # 允许为空
     english_name = Column(String(100))  # 允许为空
     type1 = Column(String(20), nullable=False, index=True)
-    type2 = Column(String(20))
+    type2 = Column(String(20), index=True)  # 属性筛选拆成 type1/type2 两路索引查找后 UNION ALL
     classification = Column(String(100))
     height = Column(Float)
     weight = Column(Float)
@@ -34,35 +34,45 @@ class Pokemon(Base):
     gender_ratio = Column(String(50))
     egg_groups = Column(JSON)
     abilities = Column(JSON)
+    content_hash = Column(String(64))  # 上游文档解析结果的哈希，增量同步据此跳过未变化的行
     created_at = Column(DateTime, default=datetime.now, nullable=False)
-    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, nullable=False)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, nullable=False, index=True)
     
     # 关联关系
-    moves = relationship("PokemonMove", back_populates="pokemon")
+    # 删除宝可梦/招式时连同其招式表条目一起删除
+    moves = relationship("PokemonMove", back_populates="pokemon", cascade="all, delete-orphan")
 
 
 class Move(Base):
     """招式表"""
     __tablename__ = "moves"
-    __table_args__ = {'extend_existing': True}
+    # 列表按 type / category / 两者组合筛选，并按 move_id 排序翻页：每种组合一个索引，
+    # 等值条件之后接排序键，筛选和排序都在索引内完成，计数只读索引
+    __table_args__ = (
+        Index('ix_moves_type_move_id', 'type', 'move_id'),
+        Index('ix_moves_category_move_id', 'category', 'move_id'),
+        Index('ix_moves_type_category_move_id', 'type', 'category', 'move_id'),
+        {'extend_existing': True}
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     move_id = Column(Integer, unique=True, index=True, nullable=False)
     name = Column(String(100), nullable=False, index=True)
     japanese_name = Column(String(100), nullable=False)
     english_name = Column(String(100), nullable=False, index=True)
-    type = Column(String(20), nullable=False, index=True)
+    type = Column(String(20), nullable=False)
     category = Column(String(20), nullable=False)  # 物理/特殊/变化
     power = Column(Integer)
     accuracy = Column(Integer)
     pp = Column(Integer)
     description = Column(Text, nullable=False)
     generation = Column(String(20), nullable=False, index=True)
+    content_hash = Column(String(64))  # 上游文档解析结果的哈希，增量同步据此跳过未变化的行
     created_at = Column(DateTime, default=datetime.now, nullable=False)
-    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, nullable=False)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, nullable=False, index=True)
     
     # 关联关系
-    pokemon_moves = relationship("PokemonMove", back_populates="move")
+    pokemon_moves = relationship("PokemonMove", back_populates="move", cascade="all, delete-orphan")
 
 
 class Ability(Base):
@@ -79,14 +89,19 @@ class Ability(Base):
     common_count = Column(Integer)
     hidden_count = Column(Integer)
     generation = Column(String(20), nullable=False, index=True)
+    content_hash = Column(String(64))  # 上游文档解析结果的哈希，增量同步据此跳过未变化的行
     created_at = Column(DateTime, default=datetime.now, nullable=False)
-    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, nullable=False)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, nullable=False, index=True)
 
 
 class Item(Base):
     """道具表"""
     __tablename__ = "items"
-    __table_args__ = {'extend_existing': True}
+    # category 与 generation 组合筛选用复合索引；单独筛选用列上的索引（隐含主键，按 id 排序无需再排）
+    __table_args__ = (
+        Index('ix_items_category_generation', 'category', 'generation'),
+        {'extend_existing': True}
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(200), nullable=False, unique=True, index=True)
@@ -95,8 +110,9 @@ class Item(Base):
     category = Column(String(50), nullable=False, index=True)
     description = Column(Text, nullable=False)
     generation = Column(String(20), nullable=False, index=True)
+    content_hash = Column(String(64))  # 上游文档解析结果的哈希，增量同步据此跳过未变化的行
     created_at = Column(DateTime, default=datetime.now, nullable=False)
-    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, nullable=False)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, nullable=False, index=True)
 
 
 class PokemonMove(Base):
@@ -117,4 +133,13 @@ class PokemonMove(Base):
     
     # 关联关系
     pokemon = relationship("Pokemon", back_populates="moves")
-    move = relationship("Move", back_populates="pokemon_moves")
\ No newline at end of file
+    move = relationship("Move", back_populates="pokemon_moves")
+
+class SeedSnapshot(Base):
+    """已导入的种子数据快照版本"""
+    __tablename__ = "seed_snapshots"
+    __table_args__ = {'extend_existing': True}
+    
+    version = Column(String(64), primary_key=True)
+    rows = Column(Integer, nullable=False)
+    applied_at = Column(DateTime, default=datetime.now, nullable=False)
@@ -1,15 +1,20 @@
 """
 特性路由
 """
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
-from app.database import get_db
+from app.config import settings
+from app.database import get_db, get_async_db
 from app.crud import ability_crud
+from app.schemas import BatchLookup
+from app.crud.imports import import_records, parse_payload
 
 router = APIRouter()
-from app.utils.serializer import model_to_dict, models_to_list, serialize_response
+from app.utils.serializer import model_to_dict, parse_fields, serialize_response
 
 # 模拟特性数据
 ABILITIES_DATA = [
@@ -86,23 +91,32 @@ async def get_abilities_list(
     page: int = Query(1, ge=1, description="页码"),
     page_size: int = Query(20, ge=1, le=100, description="每页数量"),
     generation: Optional[str] = Query(None, description="按世代筛选"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="游标分页：首次请求传空值，之后传上一页返回的next_cursor"),
+    fields: Optional[str] = Query(None, description="只返回指定字段，逗号分隔，如 name,english_name"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """获取特性列表"""
     try:
+        if cursor is not None:
+            data, next_cursor = await ability_crud.aget_keyset_page(
+                db=db,
+                fields=parse_fields(fields),
+                cursor=cursor,
+                limit=page_size,
+                generation=generation
+            )
+            return serialize_response(data=data, page_size=page_size, next_cursor=next_cursor, has_next=next_cursor is not None, message="获取成功")
+
         skip = (page - 1) * page_size
-        data = ability_crud.get_with_filters(
+        data, total = await ability_crud.aget_page(
             db=db,
+            fields=parse_fields(fields),
             skip=skip,
             limit=page_size,
             generation=generation
         )
-        total = ability_crud.get_count_with_filters(
-            db=db,
-            generation=generation
-        )
         
-        return serialize_response(data=models_to_list(data), total=total, page=page, page_size=page_size, message="获取成功")
+        return serialize_response(data=data, total=total, page=page, page_size=page_size, message="获取成功")
     except Exception as e:
         return {
             "success": False,
@@ -117,30 +131,18 @@ async def get_abilities_list(
 @router.get("/{ability_id_or_name}", response_model=dict)
 async def get_ability(
     ability_id_or_name: str,
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(None, description="只返回指定字段，逗号分隔，如 name,english_name"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """获取单个特性详情"""
     try:
-        ability = None
-        # 尝试按特性ID查找
-        try:
-            ability_id = int(ability_id_or_name)
-            ability = ability_crud.get_by_ability_id(db=db, ability_id=ability_id)
-        except ValueError:
-            pass
-        
-        # 如果未找到，按中文名查找
-        if not ability:
-            ability = ability_crud.get_by_name(db=db, name=ability_id_or_name)
-        
-        # 如果未找到，按英文名查找
-        if not ability:
-            ability = ability_crud.get_by_english_name(db=db, english_name=ability_id_or_name)
+        # 依次按特性ID、中文名、英文名查找（带缓存）
+        ability = await ability_crud.alookup(db=db, key=ability_id_or_name, fields=parse_fields(fields))
         
         if not ability:
             raise HTTPException(status_code=404, detail="特性不存在")
         
-        return serialize_response(data=model_to_dict(ability))
+        return serialize_response(data=ability)
     except HTTPException:
         raise
     except Exception as e:
@@ -151,8 +153,45 @@ async def get_ability(
         }
 
 
+@router.post("/bulk", response_model=dict)
+async def bulk_import_ability(
+    request: Request,
+    chunk_size: int = Query(settings.BULK_CHUNK_SIZE, ge=1, le=5000, description="每个事务写入的行数"),
+    db: Session = Depends(get_db)
+):
+    """批量导入特性：请求体为 NDJSON 或 JSON 数组（可 gzip 压缩），按特性编号 upsert
+
+    不合格或写入失败的行列在 errors 中，不影响其他行。
+    """
+    try:
+        rows = parse_payload(await request.body())
+        report = await run_in_threadpool(import_records, db, "abilities", rows, chunk_size=chunk_size)
+        return serialize_response(
+            data=report.to_dict(),
+            message=f"导入完成: 写入 {report.written} 行, 失败 {report.failed} 行"
+        )
+    except Exception as e:
+        return serialize_response(data=None, success=False, message=f"导入失败: {str(e)}")
+
+
+@router.post("/batch", response_model=dict)
+async def batch_get_ability(
+    batch: BatchLookup,
+    fields: Optional[str] = Query(None, description="只返回指定字段，逗号分隔，如 name,english_name"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """按编号、中文名或英文名批量获取特性详情，结果按请求顺序排列，未找到的为 null"""
+    try:
+        keys = [str(key) for key in batch.keys]
+        data = await ability_crud.alookup_many(db=db, keys=keys, fields=parse_fields(fields))
+        missing = [key for key, entry in zip(keys, data) if entry is None]
+        return serialize_response(data=data, message="获取成功", total=len(data) - len(missing), missing=missing)
+    except Exception as e:
+        return serialize_response(data=[], success=False, message=f"获取失败: {str(e)}", total=0)
+
+
 @router.post("/", response_model=dict)
-async def create_ability(
+def create_ability(
     ability_in: dict,
     db: Session = Depends(get_db)
 ):
@@ -169,7 +208,7 @@ async def create_ability(
 
 
 @router.put("/{ability_id}", response_model=dict)
-async def update_ability(
+def update_ability(
     ability_id: int,
     ability_in: dict,
     db: Session = Depends(get_db)
@@ -193,7 +232,7 @@ async def update_ability(
 
 
 @router.delete("/{ability_id}", response_model=dict)
-async def delete_ability(
+def delete_ability(
     ability_id: int,
     db: Session = Depends(get_db)
 ):
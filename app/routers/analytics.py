@@ -0,0 +1,120 @@
+"""
+宝可梦种族值分析路由
+"""
+from fastapi import APIRouter, HTTPException, Query, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from app.database import get_async_db
+from app.crud import pokemon_crud
+from app.crud.analytics import pokemon_analytics, NUMERIC_FIELDS
+from app.utils.serializer import serialize_response
+
+router = APIRouter()
+
+STAT_DESCRIPTION = f"数值列：{', '.join(NUMERIC_FIELDS)}"
+
+
+def check_stat(stat: str):
+    if stat not in NUMERIC_FIELDS:
+        raise ValueError(f"未知数值列: {stat}，可选: {', '.join(NUMERIC_FIELDS)}")
+
+
+def parse_quantiles(q: str) -> List[float]:
+    quantiles = [float(value) for value in q.split(",") if value.strip()]
+    if not quantiles or any(not 0 <= value <= 100 for value in quantiles):
+        raise ValueError("百分位须为 0-100 之间、逗号分隔的数")
+    return quantiles
+
+
+async def resolve_id(db: AsyncSession, pokemon_id_or_name: str) -> int:
+    pokemon = await pokemon_crud.alookup(db=db, key=pokemon_id_or_name, fields=["id"])
+    if not pokemon:
+        raise HTTPException(status_code=404, detail="宝可梦不存在")
+    return pokemon["id"]
+
+
+@router.get("/percentiles", response_model=dict)
+async def get_percentiles(
+    stat: str = Query("total_stats", description=STAT_DESCRIPTION),
+    q: str = Query("10,25,50,75,90", description="百分位，逗号分隔"),
+    type: Optional[str] = Query(None, description="只统计该属性的宝可梦"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """某项数值的百分位数"""
+    try:
+        check_stat(stat)
+        matrix = await pokemon_analytics.aensure(db)
+        return serialize_response(data=matrix.percentiles(stat, parse_quantiles(q), type), message="获取成功")
+    except Exception as e:
+        return serialize_response(data=None, success=False, message=f"获取失败: {str(e)}")
+
+
+@router.get("/top", response_model=dict)
+async def get_top(
+    stat: str = Query("total_stats", description=STAT_DESCRIPTION),
+    k: int = Query(20, ge=1, le=200, description="返回数量"),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="desc 取最大，asc 取最小"),
+    type: Optional[str] = Query(None, description="只统计该属性的宝可梦"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """某项数值最大（或最小）的 k 只宝可梦，如水属性速度前20"""
+    try:
+        check_stat(stat)
+        matrix = await pokemon_analytics.aensure(db)
+        data = matrix.top(stat, k, type, ascending=order == "asc")
+        return serialize_response(data=data, message="获取成功", total=len(data))
+    except Exception as e:
+        return serialize_response(data=[], success=False, message=f"获取失败: {str(e)}", total=0)
+
+
+@router.get("/histogram", response_model=dict)
+async def get_histogram(
+    stat: str = Query("total_stats", description=STAT_DESCRIPTION),
+    bins: int = Query(20, ge=1, le=200, description="区间数"),
+    type: Optional[str] = Query(None, description="只统计该属性的宝可梦"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """某项数值的等宽直方图"""
+    try:
+        check_stat(stat)
+        matrix = await pokemon_analytics.aensure(db)
+        return serialize_response(data=matrix.histogram(stat, bins, type), message="获取成功")
+    except Exception as e:
+        return serialize_response(data=None, success=False, message=f"获取失败: {str(e)}")
+
+
+@router.get("/rank/{pokemon_id_or_name}", response_model=dict)
+async def get_rank(
+    pokemon_id_or_name: str,
+    stat: str = Query("total_stats", description=STAT_DESCRIPTION),
+    type: Optional[str] = Query(None, description="只在该属性的宝可梦中排名"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """宝可梦某项数值的名次和百分位"""
+    try:
+        check_stat(stat)
+        id = await resolve_id(db, pokemon_id_or_name)
+        matrix = await pokemon_analytics.aensure(db)
+        return serialize_response(data=matrix.rank(id, stat, type), message="获取成功")
+    except HTTPException:
+        raise
+    except Exception as e:
+        return serialize_response(data=None, success=False, message=f"获取失败: {str(e)}")
+
+
+@router.get("/zscore/{pokemon_id_or_name}", response_model=dict)
+async def get_zscore(
+    pokemon_id_or_name: str,
+    type: Optional[str] = Query(None, description="相对该属性的宝可梦计算"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """宝可梦每项数值相对全体（或同属性）的 z-score"""
+    try:
+        id = await resolve_id(db, pokemon_id_or_name)
+        matrix = await pokemon_analytics.aensure(db)
+        return serialize_response(data=matrix.zscores(id, type), message="获取成功")
+    except HTTPException:
+        raise
+    except Exception as e:
+        return serialize_response(data=None, success=False, message=f"获取失败: {str(e)}")
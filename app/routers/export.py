@@ -0,0 +1,45 @@
+"""
+整表导出路由
+"""
+from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from typing import Optional
+
+from app.database import get_async_sessionmaker
+from app.crud.export import EXPORT_TABLES, FORMATS, aexport, export_columns
+from app.utils.serializer import parse_fields
+
+router = APIRouter()
+
+
+@router.get("/{resource}")
+async def export_resource(
+    resource: str,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson 或 csv"),
+    gzip: bool = Query(False, description="是否 gzip 压缩"),
+    fields: Optional[str] = Query(None, description="只导出指定字段，逗号分隔"),
+    chunk_size: int = Query(1000, ge=100, le=10000, description="每次从数据库读取的行数"),
+    session_factory: async_sessionmaker = Depends(get_async_sessionmaker)
+):
+    """流式导出整张表（pokemon / moves / abilities / items / pokemon_moves），按主键排序"""
+    table = EXPORT_TABLES.get(resource)
+    if table is None:
+        raise HTTPException(status_code=404, detail=f"未知资源: {resource}，可选: {', '.join(EXPORT_TABLES)}")
+    try:
+        columns = export_columns(table, parse_fields(fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def stream():
+        # 会话随响应体一起打开和关闭
+        async with session_factory() as db:
+            async for chunk in aexport(db, table, columns, format=format, compress=gzip, chunk_size=chunk_size):
+                yield chunk
+
+    filename = f"{resource}.{format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        stream(),
+        media_type="application/gzip" if gzip else FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,15 +1,20 @@
 """
 道具路由
 """
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
-from app.database import get_db
+from app.config import settings
+from app.database import get_db, get_async_db
 from app.crud import item_crud
+from app.schemas import BatchLookup
+from app.crud.imports import import_records, parse_payload
 
 router = APIRouter()
-from app.utils.serializer import model_to_dict, models_to_list, serialize_response
+from app.utils.serializer import model_to_dict, parse_fields, serialize_response
 
 # 模拟道具数据
 ITEMS_DATA = [
@@ -77,25 +82,34 @@ async def get_items_list(
     page_size: int = Query(20, ge=1, le=100, description="每页数量"),
     category: Optional[str] = Query(None, description="按分类筛选"),
     generation: Optional[str] = Query(None, description="按世代筛选"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="游标分页：首次请求传空值，之后传上一页返回的next_cursor"),
+    fields: Optional[str] = Query(None, description="只返回指定字段，逗号分隔，如 name,english_name"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """获取道具列表"""
     try:
+        if cursor is not None:
+            data, next_cursor = await item_crud.aget_keyset_page(
+                db=db,
+                fields=parse_fields(fields),
+                cursor=cursor,
+                limit=page_size,
+                category=category,
+                generation=generation
+            )
+            return serialize_response(data=data, page_size=page_size, next_cursor=next_cursor, has_next=next_cursor is not None, message="获取成功")
+
         skip = (page - 1) * page_size
-        data = item_crud.get_with_filters(
+        data, total = await item_crud.aget_page(
             db=db,
+            fields=parse_fields(fields),
             skip=skip,
             limit=page_size,
             category=category,
             generation=generation
         )
-        total = item_crud.get_count_with_filters(
-            db=db,
-            category=category,
-            generation=generation
-        )
         
-        return serialize_response(data=models_to_list(data), total=total, page=page, page_size=page_size, message="获取成功")
+        return serialize_response(data=data, total=total, page=page, page_size=page_size, message="获取成功")
     except Exception as e:
         return {
             "success": False,
@@ -110,22 +124,18 @@ async def get_items_list(
 @router.get("/{item_name}", response_model=dict)
 async def get_item(
     item_name: str,
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(None, description="只返回指定字段，逗号分隔，如 name,english_name"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """获取单个道具详情"""
     try:
-        item = None
-        # 按中文名查找
-        item = item_crud.get_by_name(db=db, name=item_name)
-        
-        # 如果未找到，按英文名查找
-        if not item:
-            item = item_crud.get_by_english_name(db=db, english_name=item_name)
+        # 依次按中文名、英文名查找（带缓存）
+        item = await item_crud.alookup(db=db, key=item_name, fields=parse_fields(fields))
         
         if not item:
             raise HTTPException(status_code=404, detail="道具不存在")
         
-        return serialize_response(data=model_to_dict(item))
+        return serialize_response(data=item)
     except HTTPException:
         raise
     except Exception as e:
@@ -141,20 +151,21 @@ async def get_items_by_category(
     category: str,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(None, description="只返回指定字段，逗号分隔，如 name,english_name"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """按分类获取道具"""
     try:
         skip = (page - 1) * page_size
-        data = item_crud.get_by_category(
+        data, total = await item_crud.aget_page(
             db=db,
-            category=category,
+            fields=parse_fields(fields),
             skip=skip,
-            limit=page_size
+            limit=page_size,
+            category=category
         )
-        total = item_crud.get_count_by_category(db=db, category=category)
         
-        return serialize_response(data=models_to_list(data), total=total, page=page, page_size=page_size, message="获取成功")
+        return serialize_response(data=data, total=total, page=page, page_size=page_size, message="获取成功")
     except Exception as e:
         return {
             "success": False,
@@ -166,8 +177,45 @@ async def get_items_by_category(
         }
 
 
+@router.post("/bulk", response_model=dict)
+async def bulk_import_item(
+    request: Request,
+    chunk_size: int = Query(settings.BULK_CHUNK_SIZE, ge=1, le=5000, description="每个事务写入的行数"),
+    db: Session = Depends(get_db)
+):
+    """批量导入道具：请求体为 NDJSON 或 JSON 数组（可 gzip 压缩），按道具名 upsert
+
+    不合格或写入失败的行列在 errors 中，不影响其他行。
+    """
+    try:
+        rows = parse_payload(await request.body())
+        report = await run_in_threadpool(import_records, db, "items", rows, chunk_size=chunk_size)
+        return serialize_response(
+            data=report.to_dict(),
+            message=f"导入完成: 写入 {report.written} 行, 失败 {report.failed} 行"
+        )
+    except Exception as e:
+        return serialize_response(data=None, success=False, message=f"导入失败: {str(e)}")
+
+
+@router.post("/batch", response_model=dict)
+async def batch_get_item(
+    batch: BatchLookup,
+    fields: Optional[str] = Query(None, description="只返回指定字段，逗号分隔，如 name,english_name"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """按中文名或英文名批量获取道具详情，结果按请求顺序排列，未找到的为 null"""
+    try:
+        keys = [str(key) for key in batch.keys]
+        data = await item_crud.alookup_many(db=db, keys=keys, fields=parse_fields(fields))
+        missing = [key for key, entry in zip(keys, data) if entry is None]
+        return serialize_response(data=data, message="获取成功", total=len(data) - len(missing), missing=missing)
+    except Exception as e:
+        return serialize_response(data=[], success=False, message=f"获取失败: {str(e)}", total=0)
+
+
 @router.post("/", response_model=dict)
-async def create_item(
+def create_item(
     item_in: dict,
     db: Session = Depends(get_db)
 ):
@@ -184,7 +232,7 @@ async def create_item(
 
 
 @router.put("/{item_name}", response_model=dict)
-async def update_item(
+def update_item(
     item_name: str,
     item_in: dict,
     db: Session = Depends(get_db)
@@ -208,7 +256,7 @@ async def update_item(
 
 
 @router.delete("/{item_name}", response_model=dict)
-async def delete_item(
+def delete_item(
     item_name: str,
     db: Session = Depends(get_db)
 ):
@@ -218,8 +266,7 @@ async def delete_item(
         if not item:
             raise HTTPException(status_code=404, detail="道具不存在")
         
-        db.delete(item)
-        db.commit()
+        item_crud.remove(db=db, id=item.id)
         return serialize_response(data=model_to_dict(None))
     except HTTPException:
         raise
@@ -1,13 +1,18 @@
 """
 招式路由
 """
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
 
-from app.database import get_db
-from app.crud import move_crud
-from app.utils.serializer import model_to_dict, models_to_list, serialize_response
+from app.config import settings
+from app.database import get_db, get_async_db
+from app.crud import move_crud, learnset_crud
+from app.schemas import BatchLookup
+from app.crud.imports import import_records, parse_payload
+from app.utils.serializer import model_to_dict, parse_fields, serialize_response
 
 router = APIRouter()
 
@@ -102,25 +107,34 @@ async def get_moves_list(
     page_size: int = Query(20, ge=1, le=100, description="每页数量"),
     type: Optional[str] = Query(None, description="按属性筛选"),
     category: Optional[str] = Query(None, description="按分类筛选（物理/特殊/变化）"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="游标分页：首次请求传空值，之后传上一页返回的next_cursor"),
+    fields: Optional[str] = Query(None, description="只返回指定字段，逗号分隔，如 name,english_name"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """获取招式列表"""
     try:
+        if cursor is not None:
+            data, next_cursor = await move_crud.aget_keyset_page(
+                db=db,
+                fields=parse_fields(fields),
+                cursor=cursor,
+                limit=page_size,
+                type_name=type,
+                category=category
+            )
+            return serialize_response(data=data, page_size=page_size, next_cursor=next_cursor, has_next=next_cursor is not None, message="获取成功")
+
         skip = (page - 1) * page_size
-        data = move_crud.get_with_filters(
+        data, total = await move_crud.aget_page(
             db=db,
+            fields=parse_fields(fields),
             skip=skip,
             limit=page_size,
             type_name=type,
             category=category
         )
-        total = move_crud.get_count_with_filters(
-            db=db,
-            type_name=type,
-            category=category
-        )
         
-        return serialize_response(data=models_to_list(data), total=total, page=page, page_size=page_size, message="获取成功")
+        return serialize_response(data=data, total=total, page=page, page_size=page_size, message="获取成功")
     except Exception as e:
         return {
             "success": False,
@@ -135,30 +149,18 @@ async def get_moves_list(
 @router.get("/{move_id_or_name}", response_model=dict)
 async def get_move(
     move_id_or_name: str,
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(None, description="只返回指定字段，逗号分隔，如 name,english_name"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """获取单个招式详情"""
     try:
-        move = None
-        # 尝试按招式ID查找
-        try:
-            move_id = int(move_id_or_name)
-            move = move_crud.get_by_move_id(db=db, move_id=move_id)
-        except ValueError:
-            pass
-        
-        # 如果未找到，按中文名查找
-        if not move:
-            move = move_crud.get_by_name(db=db, name=move_id_or_name)
-        
-        # 如果未找到，按英文名查找
-        if not move:
-            move = move_crud.get_by_english_name(db=db, english_name=move_id_or_name)
+        # 依次按招式ID、中文名、英文名查找（带缓存）
+        move = await move_crud.alookup(db=db, key=move_id_or_name, fields=parse_fields(fields))
         
         if not move:
             raise HTTPException(status_code=404, detail="招式不存在")
         
-        return serialize_response(data=model_to_dict(move))
+        return serialize_response(data=move)
     except HTTPException:
         raise
     except Exception as e:
@@ -174,20 +176,21 @@ async def get_moves_by_type(
     type_name: str,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(None, description="只返回指定字段，逗号分隔，如 name,english_name"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """按属性获取招式"""
     try:
         skip = (page - 1) * page_size
-        data = move_crud.get_by_type(
+        data, total = await move_crud.aget_page(
             db=db,
-            type_name=type_name,
+            fields=parse_fields(fields),
             skip=skip,
-            limit=page_size
+            limit=page_size,
+            type_name=type_name
         )
-        total = move_crud.get_count_by_type(db=db, type_name=type_name)
         
-        return serialize_response(data=models_to_list(data), total=total, page=page, page_size=page_size, message="获取成功")
+        return serialize_response(data=data, total=total, page=page, page_size=page_size, message="获取成功")
     except Exception as e:
         return {
             "success": False,
@@ -199,8 +202,86 @@ async def get_moves_by_type(
         }
 
 
+@router.get("/{move_id_or_name}/learners", response_model=dict)
+async def get_move_learners(
+    move_id_or_name: str,
+    method: Optional[str] = Query(None, description="按学习方式筛选，如 升级、招式学习器、遗传"),
+    page: int = Query(1, ge=1, description="页码"),
+    page_size: int = Query(50, ge=1, le=200, description="每页数量"),
+    fields: Optional[str] = Query(None, description="只返回指定字段，逗号分隔，如 name,english_name"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """获取能学会该招式的宝可梦"""
+    try:
+        move = await move_crud.alookup(db=db, key=move_id_or_name, fields=["id"])
+        if not move:
+            raise HTTPException(status_code=404, detail="招式不存在")
+
+        skip = (page - 1) * page_size
+        data, total = await learnset_crud.aget_learners(
+            db, move_id=move["id"], method=method, skip=skip, limit=page_size,
+            fields=parse_fields(fields)
+        )
+        return serialize_response(
+            data=data,
+            total=total,
+            page=page,
+            page_size=page_size,
+            has_next=skip + page_size < total
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        return serialize_response(
+            data=[],
+            success=False,
+            message=f"获取失败: {str(e)}",
+            total=0,
+            page=page,
+            page_size=page_size,
+            has_next=False
+        )
+
+
+@router.post("/bulk", response_model=dict)
+async def bulk_import_move(
+    request: Request,
+    chunk_size: int = Query(settings.BULK_CHUNK_SIZE, ge=1, le=5000, description="每个事务写入的行数"),
+    db: Session = Depends(get_db)
+):
+    """批量导入招式：请求体为 NDJSON 或 JSON 数组（可 gzip 压缩），按招式编号 upsert
+
+    不合格或写入失败的行列在 errors 中，不影响其他行。
+    """
+    try:
+        rows = parse_payload(await request.body())
+        report = await run_in_threadpool(import_records, db, "moves", rows, chunk_size=chunk_size)
+        return serialize_response(
+            data=report.to_dict(),
+            message=f"导入完成: 写入 {report.written} 行, 失败 {report.failed} 行"
+        )
+    except Exception as e:
+        return serialize_response(data=None, success=False, message=f"导入失败: {str(e)}")
+
+
+@router.post("/batch", response_model=dict)
+async def batch_get_move(
+    batch: BatchLookup,
+    fields: Optional[str] = Query(None, description="只返回指定字段，逗号分隔，如 name,english_name"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """按编号、中文名或英文名批量获取招式详情，结果按请求顺序排列，未找到的为 null"""
+    try:
+        keys = [str(key) for key in batch.keys]
+        data = await move_crud.alookup_many(db=db, keys=keys, fields=parse_fields(fields))
+        missing = [key for key, entry in zip(keys, data) if entry is None]
+        return serialize_response(data=data, message="获取成功", total=len(data) - len(missing), missing=missing)
+    except Exception as e:
+        return serialize_response(data=[], success=False, message=f"获取失败: {str(e)}", total=0)
+
+
 @router.post("/", response_model=dict)
-async def create_move(
+def create_move(
     move_in: dict,
     db: Session = Depends(get_db)
 ):
@@ -217,7 +298,7 @@ async def create_move(
 
 
 @router.put("/{move_id}", response_model=dict)
-async def update_move(
+def update_move(
     move_id: int,
     move_in: dict,
     db: Session = Depends(get_db)
@@ -241,7 +322,7 @@ async def update_move(
 
 
 @router.delete("/{move_id}", response_model=dict)
-async def delete_move(
+def delete_move(
     move_id: int,
     db: Session = Depends(get_db)
 ):
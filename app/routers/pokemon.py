@@ -1,14 +1,19 @@
 """
 宝可梦路由
 """
-from fastapi import APIRouter, HTTPException, Query, Depends, Form
+from fastapi import APIRouter, HTTPException, Query, Depends, Form, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
 import json
 
-from app.database import get_db
-from app.crud import pokemon_crud
-from app.utils.serializer import model_to_dict, models_to_list, serialize_response
+from app.config import settings
+from app.database import get_db, get_async_db
+from app.crud import pokemon_crud, learnset_crud
+from app.schemas import BatchLookup
+from app.crud.imports import import_records, parse_payload
+from app.utils.serializer import model_to_dict, parse_fields, serialize_response
 
 router = APIRouter()
 
@@ -101,26 +106,40 @@ async def get_pokemon_list(
     page_size: int = Query(20, ge=1, le=100, description="每页数量"),
     type: Optional[str] = Query(None, description="按属性筛选"),
     search: Optional[str] = Query(None, description="搜索宝可梦名称"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="游标分页：首次请求传空值，之后传上一页返回的next_cursor"),
+    fields: Optional[str] = Query(None, description="只返回指定字段，逗号分隔，如 name,english_name"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """获取宝可梦列表"""
     try:
+        if cursor is not None:
+            data, next_cursor = await pokemon_crud.aget_keyset_page(
+                db=db,
+                fields=parse_fields(fields),
+                cursor=cursor,
+                limit=page_size,
+                type_name=type,
+                search=search
+            )
+            return serialize_response(
+                data=data,
+                page_size=page_size,
+                next_cursor=next_cursor,
+                has_next=next_cursor is not None
+            )
+
         skip = (page - 1) * page_size
-        data = pokemon_crud.get_with_filters(
+        data, total = await pokemon_crud.aget_page(
             db=db,
+            fields=parse_fields(fields),
             skip=skip,
             limit=page_size,
             type_name=type,
             search=search
         )
-        total = pokemon_crud.get_count_with_filters(
-            db=db,
-            type_name=type,
-            search=search
-        )
         
         return serialize_response(
-            data=models_to_list(data),
+            data=data,
             total=total,
             page=page,
             page_size=page_size,
@@ -141,31 +160,19 @@ async def get_pokemon_list(
 @router.get("/{pokemon_id_or_name}", response_model=dict)
 async def get_pokemon(
     pokemon_id_or_name: str,
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(None, description="只返回指定字段，逗号分隔，如 name,english_name"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """获取单个宝可梦详情"""
     try:
-        pokemon = None
-        # 尝试按全国图鉴编号查找
-        try:
-            pokemon_id = int(pokemon_id_or_name)
-            pokemon = pokemon_crud.get_by_national_dex(db=db, national_dex=pokemon_id)
-        except ValueError:
-            pass
-        
-        # 如果未找到，按中文名查找
-        if not pokemon:
-            pokemon = pokemon_crud.get_by_name(db=db, name=pokemon_id_or_name)
-        
-        # 如果未找到，按英文名查找
-        if not pokemon:
-            pokemon = pokemon_crud.get_by_english_name(db=db, english_name=pokemon_id_or_name)
+        # 依次按全国图鉴编号、中文名、英文名查找（带缓存）
+        pokemon = await pokemon_crud.alookup(db=db, key=pokemon_id_or_name, fields=parse_fields(fields))
         
         if not pokemon:
             raise HTTPException(status_code=404, detail="宝可梦不存在")
         
         return serialize_response(
-            data=model_to_dict(pokemon)
+            data=pokemon
         )
     except HTTPException:
         raise
@@ -182,21 +189,22 @@ async def get_pokemon_by_type(
     type_name: str,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(None, description="只返回指定字段，逗号分隔，如 name,english_name"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """按属性获取宝可梦"""
     try:
         skip = (page - 1) * page_size
-        data = pokemon_crud.get_by_type(
+        data, total = await pokemon_crud.aget_page(
             db=db,
-            type_name=type_name,
+            fields=parse_fields(fields),
             skip=skip,
-            limit=page_size
+            limit=page_size,
+            type_name=type_name
         )
-        total = pokemon_crud.get_count_by_type(db=db, type_name=type_name)
         
         return serialize_response(
-            data=models_to_list(data),
+            data=data,
             total=total,
             page=page,
             page_size=page_size
@@ -217,21 +225,22 @@ async def search_pokemon(
     query: str,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(None, description="只返回指定字段，逗号分隔，如 name,english_name"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """搜索宝可梦"""
     try:
         skip = (page - 1) * page_size
-        data = pokemon_crud.search_pokemon(
+        data, total = await pokemon_crud.aget_page(
             db=db,
-            query=query,
+            fields=parse_fields(fields),
             skip=skip,
-            limit=page_size
+            limit=page_size,
+            search=query
         )
-        total = pokemon_crud.get_search_count(db=db, query=query)
         
         return serialize_response(
-            data=models_to_list(data),
+            data=data,
             total=total,
             page=page,
             page_size=page_size
@@ -247,8 +256,86 @@ async def search_pokemon(
         )
 
 
+@router.get("/{pokemon_id_or_name}/moves", response_model=dict)
+async def get_pokemon_moves(
+    pokemon_id_or_name: str,
+    method: Optional[str] = Query(None, description="按学习方式筛选，如 升级、招式学习器、遗传"),
+    page: int = Query(1, ge=1, description="页码"),
+    page_size: int = Query(50, ge=1, le=200, description="每页数量"),
+    fields: Optional[str] = Query(None, description="只返回指定字段，逗号分隔，如 name,english_name"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """获取宝可梦能学会的招式（招式表）"""
+    try:
+        pokemon = await pokemon_crud.alookup(db=db, key=pokemon_id_or_name, fields=["id"])
+        if not pokemon:
+            raise HTTPException(status_code=404, detail="宝可梦不存在")
+
+        skip = (page - 1) * page_size
+        data, total = await learnset_crud.aget_moves(
+            db, pokemon_id=pokemon["id"], method=method, skip=skip, limit=page_size,
+            fields=parse_fields(fields)
+        )
+        return serialize_response(
+            data=data,
+            total=total,
+            page=page,
+            page_size=page_size,
+            has_next=skip + page_size < total
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        return serialize_response(
+            data=[],
+            success=False,
+            message=f"获取失败: {str(e)}",
+            total=0,
+            page=page,
+            page_size=page_size,
+            has_next=False
+        )
+
+
+@router.post("/bulk", response_model=dict)
+async def bulk_import_pokemon(
+    request: Request,
+    chunk_size: int = Query(settings.BULK_CHUNK_SIZE, ge=1, le=5000, description="每个事务写入的行数"),
+    db: Session = Depends(get_db)
+):
+    """批量导入宝可梦：请求体为 NDJSON 或 JSON 数组（可 gzip 压缩），按全国图鉴编号 upsert
+
+    不合格或写入失败的行列在 errors 中，不影响其他行。
+    """
+    try:
+        rows = parse_payload(await request.body())
+        report = await run_in_threadpool(import_records, db, "pokemon", rows, chunk_size=chunk_size)
+        return serialize_response(
+            data=report.to_dict(),
+            message=f"导入完成: 写入 {report.written} 行, 失败 {report.failed} 行"
+        )
+    except Exception as e:
+        return serialize_response(data=None, success=False, message=f"导入失败: {str(e)}")
+
+
+@router.post("/batch", response_model=dict)
+async def batch_get_pokemon(
+    batch: BatchLookup,
+    fields: Optional[str] = Query(None, description="只返回指定字段，逗号分隔，如 name,english_name"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """按编号、中文名或英文名批量获取宝可梦详情，结果按请求顺序排列，未找到的为 null"""
+    try:
+        keys = [str(key) for key in batch.keys]
+        data = await pokemon_crud.alookup_many(db=db, keys=keys, fields=parse_fields(fields))
+        missing = [key for key, entry in zip(keys, data) if entry is None]
+        return serialize_response(data=data, message="获取成功", total=len(data) - len(missing), missing=missing)
+    except Exception as e:
+        return serialize_response(data=[], success=False, message=f"获取失败: {str(e)}", total=0)
+
+
 @router.post("/", response_model=dict)
-async def create_pokemon(
+def create_pokemon(
     pokemon_in: dict,
     db: Session = Depends(get_db)
 ):
@@ -268,7 +355,7 @@ async def create_pokemon(
 
 
 @router.put("/{pokemon_id}", response_model=dict)
-async def update_pokemon(
+def update_pokemon(
     pokemon_id: int,
     pokemon_in: dict,
     db: Session = Depends(get_db)
@@ -295,7 +382,7 @@ async def update_pokemon(
 
 
 @router.delete("/{pokemon_id}", response_model=dict)
-async def delete_pokemon(
+def delete_pokemon(
     pokemon_id: int,
     db: Session = Depends(get_db)
 ):
@@ -0,0 +1,52 @@
+"""
+种族值统计路由
+"""
+from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.crud.stats import pokemon_stats, DIMENSIONS
+from app.utils.serializer import serialize_response
+
+router = APIRouter()
+
+
+def check_dimension(dimension: str):
+    if dimension not in DIMENSIONS:
+        raise HTTPException(status_code=404, detail=f"未知统计维度: {dimension}，可选: {', '.join(DIMENSIONS)}")
+
+
+@router.get("/", response_model=dict)
+async def get_stats_overview(db: AsyncSession = Depends(get_async_db)):
+    """全部宝可梦的种族值统计"""
+    try:
+        await pokemon_stats.aensure(db)
+        return serialize_response(data=pokemon_stats.overview(), message="获取成功")
+    except Exception as e:
+        return serialize_response(data=None, success=False, message=f"获取失败: {str(e)}")
+
+
+@router.get("/{dimension}", response_model=dict)
+async def get_stats_by_dimension(dimension: str, db: AsyncSession = Depends(get_async_db)):
+    """按维度（type / type_pair / generation）列出各分组的种族值统计"""
+    check_dimension(dimension)
+    try:
+        await pokemon_stats.aensure(db)
+        data = pokemon_stats.dimension(dimension)
+        return serialize_response(data=data, message="获取成功", total=len(data))
+    except Exception as e:
+        return serialize_response(data={}, success=False, message=f"获取失败: {str(e)}", total=0)
+
+
+@router.get("/{dimension}/{key:path}", response_model=dict)
+async def get_stats_group(dimension: str, key: str, db: AsyncSession = Depends(get_async_db)):
+    """单个分组的种族值统计，如 /type/火、/type_pair/火/飞行、/generation/第一世代"""
+    check_dimension(dimension)
+    try:
+        await pokemon_stats.aensure(db)
+        data = pokemon_stats.group(dimension, key)
+    except Exception as e:
+        return serialize_response(data=None, success=False, message=f"获取失败: {str(e)}")
+    if data is None:
+        raise HTTPException(status_code=404, detail="没有该分组的宝可梦")
+    return serialize_response(data=data, message="获取成功")
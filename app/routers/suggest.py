@@ -0,0 +1,38 @@
+"""
+输入提示路由
+"""
+from fastapi import APIRouter, Query, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.database import get_async_db
+from app.crud.suggest import suggester
+from app.utils.serializer import serialize_response
+
+router = APIRouter()
+
+
+@router.get("/", response_model=dict)
+async def suggest(
+    q: str = Query(..., min_length=1, description="已输入的名称前缀（中文、日文假名、英文均可）"),
+    limit: int = Query(10, ge=1, le=50, description="返回数量"),
+    types: Optional[str] = Query(None, description="限定类别，逗号分隔：pokemon,moves,abilities,items"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """按名称前缀返回输入提示"""
+    try:
+        kinds = [kind.strip() for kind in types.split(",") if kind.strip()] if types else None
+        unknown = [kind for kind in kinds or () if kind not in suggester.cruds]
+        if unknown:
+            raise ValueError(f"未知类别: {', '.join(unknown)}")
+
+        await suggester.aensure(db)
+        data = suggester.suggest(q, limit=limit, kinds=kinds)
+        return serialize_response(data=data, message="获取成功", total=len(data))
+    except Exception as e:
+        return serialize_response(
+            data=[],
+            success=False,
+            message=f"获取失败: {str(e)}",
+            total=0
+        )
@@ -0,0 +1,51 @@
+"""
+属性相克路由
+"""
+from fastapi import APIRouter, HTTPException, Query, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.database import get_async_db
+from app.crud.typechart import type_chart
+from app.utils.serializer import serialize_response
+
+router = APIRouter()
+
+MAX_BATCH = 200
+
+
+@router.get("/", response_model=dict)
+async def get_types():
+    """全部属性"""
+    data = type_chart.types()
+    return serialize_response(data=data, message="获取成功", total=len(data))
+
+
+@router.get("/defense", response_model=dict)
+async def get_defenses(
+    national_dex: str = Query(..., description="全国图鉴编号，逗号分隔，如 1,4,7"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """批量获取宝可梦受各属性攻击的倍率"""
+    try:
+        numbers = [int(value) for value in national_dex.split(",") if value.strip()]
+        if len(numbers) > MAX_BATCH:
+            raise ValueError(f"一次最多查询 {MAX_BATCH} 个编号")
+        data = await type_chart.adefenses_by_dex(db, numbers)
+        found = {entry["national_dex"] for entry in data}
+        missing = [number for number in dict.fromkeys(numbers) if number not in found]
+        return serialize_response(data=data, message="获取成功", total=len(data), missing=missing)
+    except Exception as e:
+        return serialize_response(data=[], success=False, message=f"获取失败: {str(e)}", total=0)
+
+
+@router.get("/{type_name}/matchups", response_model=dict)
+async def get_matchups(
+    type_name: str,
+    second: Optional[str] = Query(None, description="第二属性：给出时返回该属性组合的防御倍率"),
+):
+    """属性的攻击、防御倍率（中文或英文属性名）"""
+    data = type_chart.matchups(type_name, second)
+    if data is None:
+        raise HTTPException(status_code=404, detail="属性不存在")
+    return serialize_response(data=data, message="获取成功")
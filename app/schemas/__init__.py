@@ -2,7 +2,7 @@
 Pydantic输入输出模型
 """
 from pydantic import BaseModel, Field, EmailStr
-from typing import Optional, List
+from typing import Optional, List, Union
 from datetime import datetime
 
 
@@ -225,6 +225,54 @@ class ItemListResponse(BaseModel):
     page_size: int
 
 
+# 批量导入模型：在创建模型之上加入自然键和其余可写列，与数据库表的可空性一致
+class PokemonImport(PokemonCreate):
+    """批量导入宝可梦模型"""
+    national_dex: int
+    japanese_name: Optional[str] = None
+    english_name: Optional[str] = None
+    classification: Optional[str] = None
+    hp: Optional[int] = None
+    attack: Optional[int] = None
+    defense: Optional[int] = None
+    sp_attack: Optional[int] = None
+    sp_defense: Optional[int] = None
+    speed: Optional[int] = None
+    total_stats: Optional[int] = None
+    catch_rate: Optional[int] = None
+    experience_type: Optional[str] = None
+    gender_ratio: Optional[str] = None
+    egg_groups: Optional[List[str]] = None
+    abilities: Optional[List[str]] = None
+    content_hash: Optional[str] = None
+
+
+class MoveImport(MoveCreate):
+    """批量导入招式模型"""
+    move_id: int
+    power: Optional[int] = None
+    accuracy: Optional[int] = None
+    pp: Optional[int] = None
+    description: str
+    generation: str
+    content_hash: Optional[str] = None
+
+
+class AbilityImport(AbilityCreate):
+    """批量导入特性模型"""
+    ability_id: int
+    common_count: Optional[int] = None
+    hidden_count: Optional[int] = None
+    generation: str
+    content_hash: Optional[str] = None
+
+
+class ItemImport(ItemCreate):
+    """批量导入道具模型"""
+    generation: str
+    content_hash: Optional[str] = None
+
+
 # 搜索和筛选模型
 class SearchQuery(BaseModel):
     """搜索查询模型"""
@@ -239,4 +287,10 @@ class SearchQuery(BaseModel):
 class PaginationParams(BaseModel):
     """分页参数模型"""
     page: int = Field(1, ge=1, description="页码")
-    page_size: int = Field(20, ge=1, le=100, description="每页数量")
\ No newline at end of file
+    page_size: int = Field(20, ge=1, le=100, description="每页数量")
+
+
+# 批量查询模型
+class BatchLookup(BaseModel):
+    """批量按编号或名称查询：keys 可混合编号、中文名、英文名"""
+    keys: List[Union[int, str]] = Field(..., min_length=1, max_length=100, description="编号或名称列表")
@@ -46,7 +46,7 @@ class PokemonScraper:
         if not html:
             return []
         
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
         pokemon_list = []
         
         # 解析宝可梦数据（需要根据实际网页结构调整）
@@ -84,7 +84,7 @@ class PokemonScraper:
         if not html:
             return {}
         
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
         pokemon_data = {}
         
         # 解析宝可梦详情页面
@@ -153,7 +153,7 @@ class MoveScraper:
         if not html:
             return []
         
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
         moves_list = []
         
         # 解析招式表格
@@ -237,7 +237,7 @@ class AbilityScraper:
         if not html:
             return []
         
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
         abilities_list = []
         
         # 解析特性表格
@@ -317,7 +317,7 @@ class ItemScraper:
         if not html:
             return []
         
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
         items_list = []
         
         # 解析道具表格（需要根据实际网页结构调整）
@@ -0,0 +1,299 @@
+"""
+异步爬取引擎：共享连接池 + 并发窗口 + 令牌桶限速
+"""
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import httpx
+import orjson
+
+from app.config import settings
+from app.scraper.cache import HTTPCache
+from app.scraper.parsers import parse_payload
+
+# 需要重试的状态码：限流和服务端错误
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# 多类资源一起爬取时的顺序：宝可梦放在最后，写入招式表时招式已经入库
+RESOURCES = ("move", "ability", "item", "pokemon")
+
+
+class FetchError(Exception):
+    """重试耗尽仍未取得文档（区别于 404 的"不存在"）"""
+
+
+def _discard(task: Optional[asyncio.Future]):
+    """取消不再需要的预取任务，并取走其异常，避免 "exception was never retrieved" 警告"""
+    if task is None:
+        return
+    task.cancel()
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+class TokenBucket:
+    """异步令牌桶：平均每秒放行 rate 个请求，允许累积 capacity 个突发
+
+    替代固定的 time.sleep(delay)：空闲时积攒的令牌可以立即使用，
+    持续满载时请求速率被平滑地限制在 rate。
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncFetcher:
+    """共享 httpx.AsyncClient 的 JSON 获取器
+
+    连接池大小与并发窗口一致，连接在请求之间保持复用；
+    每个请求先取令牌再占用并发槽位，429/5xx 和网络错误按指数退避重试。
+    """
+
+    def __init__(
+        self,
+        *,
+        concurrency: int = settings.SCRAPER_CONCURRENCY,
+        rate: float = settings.SCRAPER_RATE_LIMIT,
+        timeout: float = settings.SCRAPER_TIMEOUT,
+        max_retries: int = settings.SCRAPER_MAX_RETRIES,
+        backoff: float = 0.5,
+        headers: Optional[Dict[str, str]] = None,
+        cache: Optional[HTTPCache] = None
+    ):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.headers = headers or {"User-Agent": "pokemon-api-scraper"}
+        self.bucket = TokenBucket(rate)
+        self.cache = cache if cache is not None else HTTPCache.from_settings()
+        self.client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+
+    async def __aenter__(self) -> "AsyncFetcher":
+        limits = httpx.Limits(
+            max_connections=self.concurrency, max_keepalive_connections=self.concurrency
+        )
+        self.client = httpx.AsyncClient(timeout=self.timeout, headers=self.headers, limits=limits)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+        self.client = None
+
+    async def get_json(self, url: str) -> Optional[Dict[str, Any]]:
+        """获取JSON文档；404返回None，重试耗尽后抛出 FetchError"""
+        body = await self.get_bytes(url)
+        return orjson.loads(body) if body is not None else None
+
+    async def get_bytes(self, url: str) -> Optional[bytes]:
+        """获取原始响应体；404返回None，重试耗尽后抛出 FetchError
+
+        缓存命中不占令牌和并发槽位；过期条目带上验证器，304 时直接用缓存内容。
+        """
+        entry = self.cache.lookup(url)
+        if self.cache.usable(entry):
+            self.cache.record_hit()
+            return self.cache.load_bytes(entry)
+        if self.cache.offline:
+            return None
+        validators = self.cache.conditional_headers(entry)
+
+        error: Any = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.retries += 1
+                await asyncio.sleep(self._retry_delay(error, attempt))
+            await self.bucket.acquire()
+            async with self._semaphore:
+                self.requests += 1
+                try:
+                    response = await self.client.get(url, headers=validators)
+                except httpx.TransportError as e:
+                    error = e
+                    continue
+            if response.status_code == 304 and entry is not None:
+                self.cache.touch(entry, response.headers)
+                return self.cache.load_bytes(entry)
+            self.cache.store(url, response.status_code, response.content, response.headers)
+            if response.status_code == 404:
+                return None
+            if response.status_code in RETRY_STATUS:
+                error = response
+                continue
+            if response.status_code != 200:
+                error = response
+                break
+            return response.content
+
+        self.failures += 1
+        reason = f"HTTP {error.status_code}" if isinstance(error, httpx.Response) else error
+        raise FetchError(f"获取失败: {url} - {reason}")
+
+    def _retry_delay(self, error: Any, attempt: int) -> float:
+        # 429 带 Retry-After 时按服务端要求等待
+        if isinstance(error, httpx.Response):
+            retry_after = error.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return float(retry_after)
+        return self.backoff * (2 ** (attempt - 1))
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "cache": self.cache.stats(),
+        }
+
+
+class AsyncPokeAPIScraper:
+    """PokeAPI 异步爬取器：获取阶段在事件循环内并发，解析阶段可交给进程池
+
+    传入 parse_pool 时，响应体以 bytes 交给子进程，由 parsers.parse_payload 完成
+    JSON 解码和字段转换；事件循环只负责网络，获取下一批文档与解析上一批同时进行。
+    """
+
+    def __init__(
+        self,
+        fetcher: AsyncFetcher,
+        base_url: Optional[str] = None,
+        parse_pool: Optional[Executor] = None
+    ):
+        self.fetcher = fetcher
+        self.base_url = (base_url or settings.POKEAPI_BASE_URL).rstrip("/")
+        self.parse_pool = parse_pool
+
+    async def _parse(self, resource: str, *bodies: Optional[bytes]) -> Dict[str, Any]:
+        if self.parse_pool is None:
+            return parse_payload(resource, *bodies)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.parse_pool, parse_payload, resource, *bodies)
+
+    async def pokemon(self, pokemon_id: int) -> Optional[Dict[str, Any]]:
+        """宝可梦与 species 文档流水线获取
+
+        默认形态（编号 <10000）的 species 编号与图鉴编号相同，两个请求同时发出；
+        特殊形态的 species 编号不同，取回宝可梦文档后再按其中的链接获取。
+        """
+        if pokemon_id >= 10000:
+            body = await self.fetcher.get_bytes(f"{self.base_url}/pokemon/{pokemon_id}")
+            if body is None:
+                return None
+            linked_url = (orjson.loads(body).get("species") or {}).get("url")
+            species_body = await self.fetcher.get_bytes(linked_url) if linked_url else None
+            return await self._parse("pokemon", body, species_body)
+
+        species_task = asyncio.ensure_future(
+            self.fetcher.get_bytes(f"{self.base_url}/pokemon-species/{pokemon_id}")
+        )
+        try:
+            body = await self.fetcher.get_bytes(f"{self.base_url}/pokemon/{pokemon_id}")
+        except BaseException:
+            _discard(species_task)
+            raise
+        if body is None:
+            _discard(species_task)
+            return None
+        return await self._parse("pokemon", body, await species_task)
+
+    async def _single(self, resource: str, resource_id: int) -> Optional[Dict[str, Any]]:
+        body = await self.fetcher.get_bytes(f"{self.base_url}/{resource}/{resource_id}")
+        return await self._parse(resource, body) if body is not None else None
+
+    async def move(self, move_id: int) -> Optional[Dict[str, Any]]:
+        return await self._single("move", move_id)
+
+    async def ability(self, ability_id: int) -> Optional[Dict[str, Any]]:
+        return await self._single("ability", ability_id)
+
+    async def item(self, item_id: int) -> Optional[Dict[str, Any]]:
+        return await self._single("item", item_id)
+
+    async def outcomes(
+        self, resource: str, ids: Iterable[int]
+    ) -> List[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+        """并发爬取一批编号，按编号顺序返回 (编号, 记录, 失败原因)
+
+        记录和失败原因都为 None 表示该编号不存在（404）。
+        """
+        fetch_one: Callable[[int], Awaitable[Optional[Dict[str, Any]]]] = getattr(self, resource)
+
+        async def guarded(resource_id: int):
+            try:
+                return resource_id, await fetch_one(resource_id), None
+            except Exception as e:
+                return resource_id, None, str(e) or type(e).__name__
+
+        # 并发度由 fetcher 的信号量控制，这里一次性提交全部任务
+        return await asyncio.gather(*(guarded(resource_id) for resource_id in ids))
+
+    async def scrape(self, resource: str, ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """并发爬取一批编号，按编号顺序返回成功解析的记录"""
+        records = []
+        for resource_id, record, error in await self.outcomes(resource, ids):
+            if error is not None:
+                print(f"  爬取 {resource} #{resource_id} 失败: {error}")
+            elif record is not None:
+                records.append(record)
+        return records
+
+
+@contextmanager
+def parse_pool(workers: int) -> Iterator[Optional[Executor]]:
+    """workers > 0 时创建解析进程池，否则返回 None（在事件循环线程内解析）"""
+    if workers <= 0:
+        yield None
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield pool
+
+
+async def scrape_range_async(
+    resource: str,
+    start_id: int,
+    end_id: int,
+    *,
+    base_url: Optional[str] = None,
+    parse_workers: int = settings.SCRAPER_PARSE_WORKERS,
+    **fetcher_options: Any
+) -> List[Dict[str, Any]]:
+    with parse_pool(parse_workers) as pool:
+        async with AsyncFetcher(**fetcher_options) as fetcher:
+            scraper = AsyncPokeAPIScraper(fetcher, base_url=base_url, parse_pool=pool)
+            started = time.perf_counter()
+            records = await scraper.scrape(resource, range(start_id, end_id + 1))
+            elapsed = time.perf_counter() - started
+            print(f"  爬取 {resource} #{start_id}-#{end_id}: {len(records)} 条, "
+                  f"{elapsed:.2f}s, {fetcher.stats()}")
+            return records
+
+
+def scrape_range(resource: str, start_id: int, end_id: int, **options: Any) -> List[Dict[str, Any]]:
+    """同步入口：爬取 [start_id, end_id] 范围内的某类资源"""
+    if resource not in RESOURCES:
+        raise ValueError(f"未知资源类型: {resource}")
+    return asyncio.run(scrape_range_async(resource, start_id, end_id, **options))
@@ -0,0 +1,182 @@
+"""
+爬虫 HTTP 响应的磁盘缓存：按 URL 记录元数据，响应体按内容哈希压缩存放
+"""
+import gzip
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Mapping, Optional
+
+import orjson
+
+from app.config import settings
+
+# default: 有效期内直接使用，过期后用 If-None-Match / If-Modified-Since 重新验证
+# offline: 只读缓存，不访问网络，未命中视为不存在
+# off: 不使用缓存
+CACHE_MODES = ("default", "offline", "off")
+
+# 只缓存确定性的结果；404 也缓存，离线重放时才能区分"不存在"和"没爬过"
+CACHEABLE_STATUS = (200, 404)
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    status: int
+    digest: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+
+class HTTPCache:
+    """磁盘响应缓存
+
+    目录结构：
+        meta/ab/<sha256(url)>.json    状态码、ETag、Last-Modified、写入时间、响应体哈希
+        blobs/cd/<sha256(body)>.gz    gzip 压缩的响应体，相同内容只存一份
+
+    重新验证得到 304 时只更新元数据里的写入时间，不重写响应体。
+    所有写入先写临时文件再 os.replace，中断的爬取不会留下半个文件。
+    """
+
+    def __init__(self, directory: str, mode: str = "default", max_age: float = 86400.0):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"未知缓存模式: {mode}，可选 {', '.join(CACHE_MODES)}")
+        self.directory = directory
+        self.mode = mode
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.stored = 0
+
+    @classmethod
+    def from_settings(cls) -> "HTTPCache":
+        return cls(settings.SCRAPER_CACHE_DIR, settings.SCRAPER_CACHE_MODE, settings.SCRAPER_CACHE_MAX_AGE)
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    @property
+    def offline(self) -> bool:
+        return self.mode == "offline"
+
+    @staticmethod
+    def _key(url: str) -> str:
+        # 文档里的链接带结尾斜杠，拼出来的链接不带，两者视为同一资源
+        return hashlib.sha256(url.rstrip("/").encode()).hexdigest()
+
+    def _path(self, kind: str, digest: str, suffix: str) -> str:
+        return os.path.join(self.directory, kind, digest[:2], digest + suffix)
+
+    def _write(self, path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        if not self.enabled:
+            return None
+        path = self._path("meta", self._key(url), ".json")
+        try:
+            with open(path, "rb") as f:
+                entry = CacheEntry(**orjson.loads(f.read()))
+        except (OSError, ValueError, TypeError):
+            entry = None
+        if entry is not None and entry.digest and not os.path.exists(self._path("blobs", entry.digest, ".gz")):
+            entry = None
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+        return entry
+
+    def usable(self, entry: Optional[CacheEntry]) -> bool:
+        """不访问网络即可使用：离线模式下有记录即可，否则要求在有效期内"""
+        if entry is None:
+            return False
+        return self.offline or time.time() - entry.stored_at < self.max_age
+
+    def conditional_headers(self, entry: Optional[CacheEntry]) -> Dict[str, str]:
+        headers = {}
+        if entry is not None and entry.status == 200:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def load_bytes(self, entry: CacheEntry) -> Optional[bytes]:
+        """读取缓存的响应体；缓存的是404时返回None"""
+        if entry.digest is None:
+            return None
+        with gzip.open(self._path("blobs", entry.digest, ".gz"), "rb") as f:
+            return f.read()
+
+    def load(self, entry: CacheEntry) -> Optional[Dict[str, Any]]:
+        """读取缓存的JSON文档；缓存的是404时返回None"""
+        body = self.load_bytes(entry)
+        return orjson.loads(body) if body is not None else None
+
+    def store(self, url: str, status: int, body: bytes, headers: Mapping[str, str]) -> Optional[CacheEntry]:
+        if not self.enabled or status not in CACHEABLE_STATUS:
+            return None
+        digest = None
+        if status == 200:
+            digest = hashlib.sha256(body).hexdigest()
+            blob = self._path("blobs", digest, ".gz")
+            if not os.path.exists(blob):
+                # mtime 固定为0，相同内容压缩结果逐字节一致
+                self._write(blob, gzip.compress(body, compresslevel=6, mtime=0))
+        entry = CacheEntry(
+            url=url,
+            status=status,
+            digest=digest,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            stored_at=time.time(),
+        )
+        self._save(entry)
+        with self._lock:
+            self.stored += 1
+        return entry
+
+    def touch(self, entry: CacheEntry, headers: Mapping[str, str]):
+        """304：内容未变，刷新写入时间和验证器"""
+        entry.stored_at = time.time()
+        entry.etag = headers.get("ETag") or entry.etag
+        entry.last_modified = headers.get("Last-Modified") or entry.last_modified
+        self._save(entry)
+        with self._lock:
+            self.revalidated += 1
+
+    def _save(self, entry: CacheEntry):
+        self._write(
+            self._path("meta", self._key(entry.url), ".json"),
+            orjson.dumps(asdict(entry)),
+        )
+
+    def record_hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "stored": self.stored,
+            "misses": self.misses,
+        }
@@ -0,0 +1,248 @@
+"""
+可续跑的爬取任务：每类资源的已完成/不存在/失败编号持久化到本地状态文件
+"""
+import asyncio
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.crud import pokemon_crud, move_crud, ability_crud, item_crud, learnset_crud
+from app.crud.bulk import UpsertReport, bulk_upsert
+from app.scraper.async_engine import AsyncFetcher, AsyncPokeAPIScraper, RESOURCES, parse_pool
+from app.scraper.parsers import with_content_hash
+
+RESOURCE_CRUDS = {
+    "pokemon": pokemon_crud,
+    "move": move_crud,
+    "ability": ability_crud,
+    "item": item_crud,
+}
+
+
+def save_records(db: Session, resource: str, records: List[Dict[str, Any]]) -> UpsertReport:
+    """分块 upsert 一批爬取记录；宝可梦记录附带的 learnset 拆出来整体替换 pokemon_moves
+
+    招式表引用了尚未入库的招式时，那些条目被跳过，并把该宝可梦的 content_hash 置空，
+    招式入库后下一次增量同步会重新写入完整的招式表。
+    """
+    crud = RESOURCE_CRUDS[resource]
+    if resource != "pokemon":
+        return bulk_upsert(db, crud, records)
+
+    learnsets = {record["national_dex"]: record.pop("learnset") for record in records if "learnset" in record}
+    move_ids = learnset_crud.move_ids(db, (entry[0] for entries in learnsets.values() for entry in entries))
+    for record in records:
+        entries = learnsets.get(record["national_dex"], ())
+        if "content_hash" in record and any(entry[0] not in move_ids for entry in entries):
+            record["content_hash"] = None
+    report = bulk_upsert(db, crud, records)
+    learnset_crud.replace(db, learnsets, move_ids)
+    return report
+
+
+def _to_ranges(ids: Iterable[int]) -> List[List[int]]:
+    """有序编号压缩成 [起, 止] 区间，状态文件不随爬取规模线性膨胀"""
+    ranges: List[List[int]] = []
+    for id in sorted(ids):
+        if ranges and ranges[-1][1] == id - 1:
+            ranges[-1][1] = id
+        else:
+            ranges.append([id, id])
+    return ranges
+
+
+def _from_ranges(ranges: Iterable[List[int]]) -> set:
+    return {id for start, end in ranges for id in range(start, end + 1)}
+
+
+class Frontier:
+    """单类资源的爬取进度
+
+    done: 已写入数据库；missing: 404 不存在；failed: 编号 -> (已尝试次数, 最后一次错误)。
+    待爬 = 区间内既不在 done/missing、失败次数也未达上限的编号。
+    """
+
+    __slots__ = ("start", "end", "done", "missing", "failed")
+
+    def __init__(self, start: int, end: int):
+        self.start = start
+        self.end = end
+        self.done: set = set()
+        self.missing: set = set()
+        self.failed: Dict[int, Tuple[int, str]] = {}
+
+    @property
+    def total(self) -> int:
+        return self.end - self.start + 1
+
+    def pending(self, max_attempts: int) -> List[int]:
+        return [
+            id for id in range(self.start, self.end + 1)
+            if id not in self.done and id not in self.missing
+            and self.failed.get(id, (0, ""))[0] < max_attempts
+        ]
+
+    def record(self, outcomes: Iterable[Tuple[int, Optional[dict], Optional[str]]]):
+        for id, record, error in outcomes:
+            if error is not None:
+                attempts = self.failed.get(id, (0, ""))[0]
+                self.failed[id] = (attempts + 1, error)
+                continue
+            self.failed.pop(id, None)
+            (self.done if record is not None else self.missing).add(id)
+
+    def to_dict(self) -> dict:
+        return {
+            "start": self.start,
+            "end": self.end,
+            "done": _to_ranges(self.done),
+            "missing": _to_ranges(self.missing),
+            "failed": {str(id): list(value) for id, value in sorted(self.failed.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Frontier":
+        frontier = cls(data["start"], data["end"])
+        frontier.done = _from_ranges(data.get("done", []))
+        frontier.missing = _from_ranges(data.get("missing", []))
+        frontier.failed = {int(id): tuple(value) for id, value in data.get("failed", {}).items()}
+        return frontier
+
+    def summary(self, max_attempts: int) -> dict:
+        return {
+            "range": f"{self.start}-{self.end}",
+            "done": len(self.done),
+            "missing": len(self.missing),
+            "failed": sum(1 for attempts, _ in self.failed.values() if attempts >= max_attempts),
+            "pending": len(self.pending(max_attempts)),
+        }
+
+
+class CrawlState:
+    """任务状态文件：{"created_at", "updated_at", "resources": {资源: Frontier}}"""
+
+    def __init__(self, path: str, resources: Dict[str, Frontier], created_at: Optional[str] = None):
+        self.path = path
+        self.resources = resources
+        self.created_at = created_at or datetime.now().isoformat(timespec="seconds")
+
+    @classmethod
+    def create(cls, path: str, ranges: Dict[str, Tuple[int, int]]) -> "CrawlState":
+        unknown = set(ranges) - set(RESOURCES)
+        if unknown:
+            raise ValueError(f"未知资源类型: {', '.join(sorted(unknown))}")
+        # 按 RESOURCES 的顺序爬取：招式先于宝可梦入库，宝可梦的招式表才能关联上
+        state = cls(path, {
+            resource: Frontier(*ranges[resource]) for resource in RESOURCES if resource in ranges
+        })
+        state.save()
+        return state
+
+    @classmethod
+    def load(cls, path: str) -> "CrawlState":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        resources = {resource: Frontier.from_dict(value) for resource, value in data["resources"].items()}
+        return cls(path, resources, data.get("created_at"))
+
+    def save(self):
+        """先写临时文件再替换，进程在任意时刻被杀都不会留下损坏的状态文件"""
+        data = {
+            "created_at": self.created_at,
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+            "resources": {resource: frontier.to_dict() for resource, frontier in self.resources.items()},
+        }
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def reset_failed(self):
+        for frontier in self.resources.values():
+            frontier.failed.clear()
+
+    def summary(self, max_attempts: int) -> Dict[str, dict]:
+        return {resource: frontier.summary(max_attempts) for resource, frontier in self.resources.items()}
+
+
+class CrawlJob:
+    """按批执行爬取任务
+
+    每批 batch_size 个编号并发获取（并发数 workers，解析交给 parse_workers 个进程），成功的记录分块 upsert 后
+    再把这批的结果写入状态文件。进程中断最多重做一批，已写入的数据不会重复请求；
+    重复写入也只是按自然键覆盖同样的内容。
+    """
+
+    def __init__(
+        self,
+        state: CrawlState,
+        session_factory: Callable[[], Session],
+        *,
+        workers: int = settings.SCRAPER_CONCURRENCY,
+        batch_size: int = 100,
+        max_attempts: int = 3,
+        parse_workers: int = settings.SCRAPER_PARSE_WORKERS,
+        base_url: Optional[str] = None,
+        **fetcher_options: Any
+    ):
+        self.state = state
+        self.session_factory = session_factory
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.parse_workers = parse_workers
+        self.base_url = base_url
+        self.fetcher_options = fetcher_options
+
+    async def arun(self):
+        with parse_pool(self.parse_workers) as pool:
+            async with AsyncFetcher(concurrency=self.workers, **self.fetcher_options) as fetcher:
+                scraper = AsyncPokeAPIScraper(fetcher, base_url=self.base_url, parse_pool=pool)
+                for resource, frontier in self.state.resources.items():
+                    await self._run_resource(scraper, resource, frontier)
+                print(f"  请求统计: {fetcher.stats()}")
+
+    async def _run_resource(self, scraper: AsyncPokeAPIScraper, resource: str, frontier: Frontier):
+        pending = frontier.pending(self.max_attempts)
+        if not pending:
+            print(f"{resource}: 无待爬编号")
+            return
+        # 失败的编号在后续轮次重试；每轮失败次数 +1，至多 max_attempts 轮
+        while pending:
+            print(f"{resource}: 待爬 {len(pending)} / {frontier.total}")
+            started = time.perf_counter()
+            finished = 0
+            for offset in range(0, len(pending), self.batch_size):
+                batch = pending[offset:offset + self.batch_size]
+                outcomes = await scraper.outcomes(resource, batch)
+                records = with_content_hash(record for _, record, _ in outcomes if record is not None)
+                if records:
+                    db = self.session_factory()
+                    try:
+                        save_records(db, resource, records)
+                    finally:
+                        db.close()
+                frontier.record(outcomes)
+                self.state.save()
+
+                finished += len(batch)
+                elapsed = time.perf_counter() - started
+                failed = sum(1 for _, _, error in outcomes if error is not None)
+                print(f"  {resource}: {finished}/{len(pending)}, 本批写入 {len(records)}, "
+                      f"失败 {failed}, {finished / elapsed:.1f} 个/秒")
+            pending = frontier.pending(self.max_attempts)
+
+    def run(self):
+        asyncio.run(self.arun())
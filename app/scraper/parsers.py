@@ -0,0 +1,230 @@
+"""
+PokeAPI 文档解析：纯函数，可在子进程中执行
+"""
+import hashlib
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import orjson
+
+from app.scraper.translations import (
+    GENUS_MAP,
+    get_chinese_type,
+    get_chinese_category,
+    get_chinese_growth_rate,
+    get_chinese_generation,
+    get_chinese_item_category,
+    get_chinese_learn_method,
+)
+
+# 中文名称的语言优先级：简体 > 繁体 > 通用中文 > 英文
+CHINESE = ("zh-Hans", "zh-Hant", "zh", "en")
+JAPANESE = ("ja-Hrkt", "ja")
+
+# 文档中链接的结尾编号，如 .../move/33/
+RESOURCE_ID = re.compile(r"/(\d+)/?$")
+
+GENDER_RATES = {
+    -1: "无性别",
+    0: "雄性100%",
+    1: "雄性87.5% 雌性12.5%",
+    2: "雄性75% 雌性25%",
+    4: "雄性50% 雌性50%",
+    6: "雄性25% 雌性75%",
+    7: "雌性100%",
+    8: "雌性87.5% 雄性12.5%",
+}
+
+
+def by_language(entries: Optional[Iterable[Dict[str, Any]]], key: str = "name") -> Dict[str, str]:
+    """一次遍历把多语言条目整理成 {语言: 值}，同一语言取第一条"""
+    result: Dict[str, str] = {}
+    for entry in entries or ():
+        language = entry["language"]["name"]
+        if language not in result:
+            result[language] = entry[key]
+    return result
+
+
+def pick(values: Dict[str, str], languages: Iterable[str], default: str = "") -> str:
+    for language in languages:
+        value = values.get(language)
+        if value:
+            return value
+    return default
+
+
+def resource_id(url: str) -> Optional[int]:
+    match = RESOURCE_ID.search(url)
+    return int(match.group(1)) if match else None
+
+
+def _generation(data: Dict[str, Any]) -> str:
+    generation = data.get("generation")
+    if generation is None:
+        # /item 文档没有 generation 字段，取最早出现的游戏世代
+        indices = data.get("game_indices") or ()
+        generation = indices[0]["generation"] if indices else None
+    return get_chinese_generation(generation["name"]) if generation else "未知"
+
+
+def _description(data: Dict[str, Any], key: str) -> str:
+    texts = by_language(data.get("flavor_text_entries"), key)
+    return pick(texts, ("zh-Hans", "zh-Hant", "en"), next(iter(texts.values()), ""))
+
+
+def _classification(species: Dict[str, Any]) -> str:
+    genera = by_language(species.get("genera"), "genus")
+    chinese = pick(genera, ("zh-Hans", "zh-Hant", "zh"))
+    if chinese:
+        return chinese
+    english = genera.get("en", "")
+    return GENUS_MAP.get(english, english)
+
+
+def parse_pokemon(data: Dict[str, Any], species: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """/pokemon 与 /pokemon-species 文档 -> Pokemon 表的字段"""
+    names = by_language(species.get("names")) if species else {}
+    stats = [stat["base_stat"] for stat in data["stats"]]
+    types = data["types"]
+    record = {
+        "national_dex": data["id"],
+        "name": pick(names, CHINESE) if species else data["name"],
+        "japanese_name": pick(names, JAPANESE[:1]) if species else data["name"],
+        "english_name": data["name"],
+        "type1": get_chinese_type(types[0]["type"]["name"]),
+        "type2": get_chinese_type(types[1]["type"]["name"]) if len(types) > 1 else None,
+        "classification": _classification(species) if species else "",
+        "height": data["height"] / 10,
+        "weight": data["weight"] / 10,
+        "hp": stats[0],
+        "attack": stats[1],
+        "defense": stats[2],
+        "sp_attack": stats[3],
+        "sp_defense": stats[4],
+        "speed": stats[5],
+        "total_stats": sum(stats),
+        "catch_rate": species.get("capture_rate", 0) if species else 0,
+        "experience_type": "未知",
+        "gender_ratio": "未知",
+        "abilities": [ability["ability"]["name"] for ability in data.get("abilities", [])],
+        # 不是 Pokemon 表的列，写库时拆出来替换 pokemon_moves（见 app.scraper.jobs.save_records）
+        "learnset": parse_learnset(data),
+    }
+    if species:
+        growth_rate = (species.get("growth_rate") or {}).get("name", "未知")
+        record["experience_type"] = get_chinese_growth_rate(growth_rate)
+        gender_rate = species.get("gender_rate")
+        record["gender_ratio"] = "无性别" if gender_rate is None else GENDER_RATES.get(gender_rate, "未知")
+    return record
+
+
+def parse_learnset(data: Dict[str, Any]) -> List[List[Any]]:
+    """/pokemon 文档的 moves 数组 -> [[招式编号, 学习方式, 学习等级], ...]
+
+    每个招式只取其最新版本组的习得方式（同一版本组可能既能升级学会又能用学习器学会），
+    非升级方式的等级为 None。
+    """
+    learnset = []
+    for entry in data.get("moves") or ():
+        move_id = resource_id(entry["move"]["url"])
+        details = entry.get("version_group_details") or ()
+        if move_id is None or not details:
+            continue
+        groups = [resource_id(detail["version_group"]["url"]) or 0 for detail in details]
+        latest = max(groups)
+        seen = set()
+        for group, detail in zip(groups, details):
+            if group != latest:
+                continue
+            method = get_chinese_learn_method(detail["move_learn_method"]["name"])
+            level = detail.get("level_learned_at") or None
+            if (method, level) not in seen:
+                seen.add((method, level))
+                learnset.append([move_id, method, level])
+    return learnset
+
+
+def _names(data: Dict[str, Any]) -> Dict[str, str]:
+    """招式/特性/道具共用的三种名称"""
+    names = by_language(data.get("names"))
+    english = names.get("en") or data["name"]
+    return {
+        "name": pick(names, CHINESE, english),
+        "japanese_name": pick(names, JAPANESE, english),
+        "english_name": english,
+    }
+
+
+def parse_move(data: Dict[str, Any]) -> Dict[str, Any]:
+    """/move 文档 -> 招式表的字段"""
+    damage_class = data.get("damage_class")
+    return {
+        "move_id": data["id"],
+        **_names(data),
+        "type": get_chinese_type(data["type"]["name"]),
+        "category": get_chinese_category(damage_class["name"]) if damage_class else "未知",
+        "power": data["power"],
+        "accuracy": data["accuracy"],
+        "pp": data["pp"],
+        "description": _description(data, "flavor_text"),
+        "generation": _generation(data),
+    }
+
+
+def parse_ability(data: Dict[str, Any]) -> Dict[str, Any]:
+    """/ability 文档 -> 特性表的字段"""
+    holders = data.get("pokemon") or ()
+    hidden = sum(1 for holder in holders if holder.get("is_hidden"))
+    return {
+        "ability_id": data["id"],
+        **_names(data),
+        "description": _description(data, "flavor_text"),
+        "common_count": len(holders) - hidden,
+        "hidden_count": hidden,
+        "generation": _generation(data),
+    }
+
+
+def parse_item(data: Dict[str, Any]) -> Dict[str, Any]:
+    """/item 文档 -> 道具表的字段"""
+    return {
+        **_names(data),
+        "category": get_chinese_item_category(data["category"]["name"]),
+        "description": _description(data, "text"),
+        "generation": _generation(data),
+    }
+
+
+PARSERS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "pokemon": parse_pokemon,
+    "move": parse_move,
+    "ability": parse_ability,
+    "item": parse_item,
+}
+
+
+def parse_payload(resource: str, *bodies: Optional[bytes]) -> Dict[str, Any]:
+    """解析阶段的入口：原始响应体 -> 数据库记录
+
+    JSON 解码也在这里完成，进程池只需要在进程间传递 bytes，
+    而不是先在主进程解码、再把整棵字典序列化过去。
+    """
+    documents: List[Optional[Dict[str, Any]]] = [
+        orjson.loads(body) if body is not None else None for body in bodies
+    ]
+    return PARSERS[resource](*documents)
+
+
+def content_hash(record: Dict[str, Any]) -> str:
+    """记录的内容哈希（不含 content_hash 本身）：键排序后序列化，与字段顺序无关"""
+    fields = {key: value for key, value in record.items() if key != "content_hash"}
+    return hashlib.sha256(orjson.dumps(fields, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def with_content_hash(records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """写库前为记录附上 content_hash，增量同步据此判断是否需要更新"""
+    records = list(records)
+    for record in records:
+        record["content_hash"] = content_hash(record)
+    return records
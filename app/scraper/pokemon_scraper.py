@@ -40,7 +40,7 @@ class PokemonScraper:
         url = f"{self.BASE_URL}/wiki/%E5%AE%9D%E5%8F%AF%E6%A2%A6%E5%88%97%E8%A1%A8%EF%BC%88%E6%8C%89%E5%85%A8%E5%9B%BD%E5%9B%BE%E9%89%B4%E7%BC%96%E5%8F%B7%E3%E7%BC%96%E5%8F%B7%EF%BC%88%E6%8C%89%E5%85%A8%E5%9B%BD%E5%9B%BE%E9%89%B4%E7%BC%96%E5%8F%B7%E3%E7%BC%96%E8%BF%9E0%E7%B5%AE%E9%98%A7%E8%AF%B1%E9%A1%98"
         
         html = self._fetch_page(url)
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
         pokemon_list = []
         
         # 简化版本：从简单版页面解析
@@ -0,0 +1,169 @@
+"""
+增量同步：按 PokeAPI 索引列出全部编号，只写入内容哈希与数据库不一致的记录
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.crud.bulk import natural_key
+from app.database import upgrade_schema
+from app.scraper.async_engine import AsyncFetcher, AsyncPokeAPIScraper, RESOURCES, parse_pool
+from app.scraper.cache import HTTPCache
+from app.scraper.jobs import RESOURCE_CRUDS, save_records
+from app.scraper.parsers import content_hash, resource_id
+
+
+async def index_ids(fetcher: AsyncFetcher, base_url: str, resource: str, page_size: int = 500) -> List[int]:
+    """读取 /{resource}?limit=&offset= 分页索引，返回上游全部编号
+
+    第一页拿到 count 后，其余页并发请求，不沿 next 链接逐页串行。
+    """
+    def page_url(offset: int) -> str:
+        return f"{base_url}/{resource}?limit={page_size}&offset={offset}"
+
+    first = await fetcher.get_json(page_url(0))
+    if first is None:
+        return []
+    pages = [first] + await asyncio.gather(
+        *(fetcher.get_json(page_url(offset)) for offset in range(page_size, first["count"], page_size))
+    )
+    ids = {resource_id(entry["url"]) for page in pages for entry in (page or {}).get("results", ())}
+    ids.discard(None)
+    return sorted(ids)
+
+
+@dataclass
+class SyncReport:
+    resource: str
+    upstream: int = 0
+    new: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    missing: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+
+    def __str__(self) -> str:
+        return (f"{self.resource}: 上游 {self.upstream}, 新增 {self.new}, 更新 {self.changed}, "
+                f"未变 {self.unchanged}, 不存在 {self.missing}, 失败 {self.failed}, {self.seconds:.2f}s")
+
+
+class DeltaSync:
+    """增量同步
+
+    每类资源先读分页索引得到上游编号，再按批获取文档、解析并计算内容哈希，
+    与数据库中该行的 content_hash 比较，只 upsert 新增和变化的记录。
+    默认缓存模式下文档缓存的有效期视为0：每个文档都带 ETag 重新验证，
+    未变化的文档只需一次 304，不重新下载。
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        *,
+        resources: Iterable[str] = RESOURCES,
+        workers: int = settings.SCRAPER_CONCURRENCY,
+        batch_size: int = 100,
+        page_size: int = 500,
+        max_id: Optional[int] = None,
+        parse_workers: int = settings.SCRAPER_PARSE_WORKERS,
+        base_url: Optional[str] = None,
+        **fetcher_options: Any
+    ):
+        resources = set(resources)
+        unknown = resources - set(RESOURCES)
+        if unknown:
+            raise ValueError(f"未知资源类型: {', '.join(sorted(unknown))}")
+        self.resources = tuple(resource for resource in RESOURCES if resource in resources)
+        self.session_factory = session_factory
+        self.workers = workers
+        self.batch_size = batch_size
+        self.page_size = page_size
+        self.max_id = max_id
+        self.parse_workers = parse_workers
+        self.base_url = base_url
+        if "cache" not in fetcher_options:
+            fetcher_options["cache"] = HTTPCache(
+                settings.SCRAPER_CACHE_DIR, settings.SCRAPER_CACHE_MODE, max_age=0
+            )
+        self.fetcher_options = fetcher_options
+
+    def _upgrade_schema(self):
+        """同步前补上旧库缺少的 content_hash 列和索引，每次同步只执行一次"""
+        db = self.session_factory()
+        try:
+            upgrade_schema(db.get_bind())
+        finally:
+            db.close()
+
+    def _stored_hashes(self, crud) -> Dict[Any, Optional[str]]:
+        """数据库中 {自然键: content_hash}；早于本功能写入的行哈希为 None，首次同步时会被更新"""
+        model = crud.model
+        column = getattr(model, natural_key(model.__table__))
+        db = self.session_factory()
+        try:
+            return dict(db.execute(select(column, model.content_hash)).all())
+        finally:
+            db.close()
+
+    async def arun(self) -> List[SyncReport]:
+        self._upgrade_schema()
+        reports = []
+        with parse_pool(self.parse_workers) as pool:
+            async with AsyncFetcher(concurrency=self.workers, **self.fetcher_options) as fetcher:
+                scraper = AsyncPokeAPIScraper(fetcher, base_url=self.base_url, parse_pool=pool)
+                for resource in self.resources:
+                    report = await self._sync_resource(scraper, resource)
+                    print(f"  {report}")
+                    reports.append(report)
+                print(f"  请求统计: {fetcher.stats()}")
+        return reports
+
+    async def _sync_resource(self, scraper: AsyncPokeAPIScraper, resource: str) -> SyncReport:
+        started = time.perf_counter()
+        report = SyncReport(resource)
+        crud = RESOURCE_CRUDS[resource]
+        key = natural_key(crud.model.__table__)
+        stored = self._stored_hashes(crud)
+
+        ids = await index_ids(scraper.fetcher, scraper.base_url, resource, self.page_size)
+        if self.max_id is not None:
+            ids = [id for id in ids if id <= self.max_id]
+        report.upstream = len(ids)
+
+        for offset in range(0, len(ids), self.batch_size):
+            dirty = []
+            for _, record, error in await scraper.outcomes(resource, ids[offset:offset + self.batch_size]):
+                if error is not None:
+                    report.failed += 1
+                    continue
+                if record is None:
+                    report.missing += 1
+                    continue
+                digest = content_hash(record)
+                if record[key] not in stored:
+                    report.new += 1
+                elif stored[record[key]] != digest:
+                    report.changed += 1
+                else:
+                    report.unchanged += 1
+                    continue
+                record["content_hash"] = stored[record[key]] = digest
+                dirty.append(record)
+            if dirty:
+                db = self.session_factory()
+                try:
+                    save_records(db, resource, dirty)
+                finally:
+                    db.close()
+
+        report.seconds = time.perf_counter() - started
+        return report
+
+    def run(self) -> List[SyncReport]:
+        return asyncio.run(self.arun())
@@ -98,6 +98,21 @@ ITEM_CATEGORY_MAP = {
     "data-cards": "数据卡"
 }
 
+# 招式学习方式
+LEARN_METHOD_MAP = {
+    "level-up": "升级",
+    "machine": "招式学习器",
+    "egg": "遗传",
+    "tutor": "教授招式",
+    "stadium-surfing-pikachu": "特殊",
+    "light-ball-egg": "遗传",
+    "colosseum-purification": "净化",
+    "xd-shadow": "暗影",
+    "xd-purification": "净化",
+    "form-change": "形态变化",
+    "zygarde-cube": "基格尔德方块"
+}
+
 # 世代
 GENERATION_MAP = {
     "generation-i": "第一世代",
@@ -135,3 +150,8 @@ def get_chinese_generation(english_gen: str) -> str:
 def get_chinese_item_category(english_category: str) -> str:
     """获取中文道具分类"""
     return ITEM_CATEGORY_MAP.get(english_category.lower(), english_category)
+
+
+def get_chinese_learn_method(english_method: str) -> str:
+    """获取中文招式学习方式"""
+    return LEARN_METHOD_MAP.get(english_method.lower(), english_method)
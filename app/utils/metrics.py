@@ -0,0 +1,113 @@
+"""
+运行指标：连接池等待时间直方图
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Sequence
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+# 等待时间分桶上界（秒），最后一个桶收集超出上界的样本
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """线程安全的累计分桶直方图（Prometheus 风格）"""
+
+    def __init__(self, buckets: Sequence[float] = WAIT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        cumulative = {}
+        running = 0
+        for bound, count in zip(self.buckets, counts):
+            running += count
+            cumulative[f"le_{bound:g}"] = running
+        running += counts[-1]
+        cumulative["le_inf"] = running
+        return {"buckets": cumulative, "count": running, "sum": round(total, 6)}
+
+
+class PoolMetrics:
+    """单个连接池的取连接统计"""
+
+    def __init__(self):
+        self.wait = Histogram()
+        self._timeouts = 0
+        # 取连接发生在多个线程池线程中，计数需要加锁
+        self._lock = threading.Lock()
+
+    @property
+    def timeouts(self) -> int:
+        with self._lock:
+            return self._timeouts
+
+    def observe(self, seconds: float, timed_out: bool = False):
+        self.wait.observe(seconds)
+        if timed_out:
+            with self._lock:
+                self._timeouts += 1
+
+
+class _TimedCheckout:
+    """在 _do_get 外记录取连接的等待时间（含新建连接的耗时）"""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.observe(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.observe(time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    """同步引擎的连接池
+
+    统计挂在类上而不是实例上，engine.dispose() 重建连接池后仍然连续。
+    """
+
+    metrics = PoolMetrics()
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    """异步引擎的连接池"""
+
+    metrics = PoolMetrics()
+
+
+def pool_status(engine) -> dict:
+    """连接池当前占用情况与累计等待统计"""
+    pool = engine.pool
+    status = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        # QueuePool 内部的溢出计数从 -pool_size 开始，连接数未超过 pool_size 时为负
+        "overflow": max(0, pool.overflow()),
+        "max_overflow": pool._max_overflow,
+        "timeout": pool.timeout(),
+    }
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        status["timeouts"] = metrics.timeouts
+        status["wait_seconds"] = metrics.wait.snapshot()
+    return status
@@ -0,0 +1,22 @@
+"""
+分页工具
+"""
+import base64
+import json
+from typing import Any
+
+
+def encode_cursor(value: Any) -> str:
+    """将排序键的值编码为不透明的游标字符串"""
+    raw = json.dumps({"k": value}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Any:
+    """解码游标字符串，格式错误时抛出 ValueError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return payload["k"]
+    except Exception:
+        raise ValueError("无效的游标")
@@ -1,32 +1,82 @@
 """
 序列化工具
 """
-from typing import List, Any, Type, TypeVar
+import datetime
+from functools import lru_cache
+from operator import attrgetter
+from typing import List, Any, Optional, Sequence, Type, TypeVar
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
+from sqlalchemy import Table
 from sqlalchemy.orm import Session
 
 ModelType = TypeVar("ModelType")
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 
+TEMPORAL_TYPES = (datetime.datetime, datetime.date, datetime.time)
+# 仅供内部使用的列（增量同步的内容哈希），不出现在API响应和导出中，也不能作为 fields 选取
+INTERNAL_COLUMNS = frozenset({"content_hash"})
+
+
+class RowSerializer:
+    """按表的列顺序预先编译的行序列化器
+
+    列名和需要转 ISO 字符串的时间列只在构造时计算一次，
+    调用时接受与列顺序一致的任意序列（Core 查询返回的 Row 或元组）。
+    """
+
+    __slots__ = ("names", "temporal")
+
+    def __init__(self, columns: Sequence[Any]):
+        self.names = tuple(column.name for column in columns)
+        self.temporal = tuple(
+            column.name for column in columns if _python_type(column) in TEMPORAL_TYPES
+        )
+
+    def __call__(self, row: Sequence[Any]) -> dict:
+        # zip 在列名用尽时停止，行尾附带的额外列（如总数）会被忽略
+        data = dict(zip(self.names, row))
+        for name in self.temporal:
+            value = data[name]
+            if value is not None:
+                data[name] = value.isoformat()
+        return data
+
+    def many(self, rows: Sequence[Sequence[Any]]) -> List[dict]:
+        return [self(row) for row in rows]
+
+
+def _python_type(column: Any) -> Any:
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return None
+
+
+def public_columns(table: Table) -> list:
+    """表中对外公开的列（按表定义顺序）"""
+    return [column for column in table.columns if column.name not in INTERNAL_COLUMNS]
+
+
+@lru_cache(maxsize=None)
+def table_serializer(table: Table) -> RowSerializer:
+    """获取表公开列的行序列化器（每张表只编译一次）"""
+    return RowSerializer(public_columns(table))
+
+
+@lru_cache(maxsize=None)
+def _attribute_getter(model_class: type) -> attrgetter:
+    return attrgetter(*table_serializer(model_class.__table__).names)
+
 
 def model_to_dict(model: Any) -> dict:
     """将SQLAlchemy模型转换为字典"""
     if model is None:
         return None
-    
-    result = {}
-    for column in model.__table__.columns:
-        value = getattr(model, column.name)
-        
-        # 处理特殊类型
-        if hasattr(value, 'isoformat'):
-            value = value.isoformat()
-        elif value is None:
-            value = None
-        
-        result[column.name] = value
-    
-    return result
+    return table_serializer(model.__table__)(_attribute_getter(type(model))(model))
 
 
 def models_to_list(models: List[Any]) -> List[dict]:
@@ -34,20 +84,41 @@ def models_to_list(models: List[Any]) -> List[dict]:
     return [model_to_dict(model) for model in models]
 
 
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """解析逗号分隔的稀疏字段集参数，空值表示返回全部字段"""
+    if not fields:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    return names or None
+
+
+class FastJSONResponse(JSONResponse):
+    """使用 orjson 编码的响应
+
+    orjson 无法处理的对象（如 Pydantic 模型）退回 jsonable_encoder。
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=jsonable_encoder, option=orjson.OPT_NON_STR_KEYS)
+
+
 def serialize_response(
     data: Any,
     success: bool = True,
     message: str = "操作成功",
     **kwargs
-) -> dict:
-    """序列化API响应"""
+) -> FastJSONResponse:
+    """序列化API响应
+
+    直接返回响应对象，FastAPI 不再对内容做 jsonable_encoder 遍历和 response_model 校验。
+    """
     response = {
         "success": success,
         "message": message,
         "data": data
     }
-    
+
     # 添加额外字段
     response.update(kwargs)
-    
-    return response
+
+    return FastJSONResponse(content=response)
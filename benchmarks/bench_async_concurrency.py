@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+并发基准测试：async 路由中直接调用同步 Session（阻塞事件循环） vs AsyncSession
+
+用法:
+    python benchmarks/bench_async_concurrency.py [--url DATABASE_URL] [--rows 10000]
+
+--url 传同步驱动的URL（如 mysql+pymysql://...），异步URL自动换成对应的异步驱动。
+默认使用临时SQLite（pysqlite / aiosqlite）。SQLite 没有网络往返，
+因此对SQLite运行时每个请求会先执行一次 SELECT rtt()，该函数在驱动的执行线程里
+休眠 --rtt-ms 毫秒来模拟到MySQL的往返；对 MySQL 运行时不做模拟。
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from app.crud import pokemon_crud
+from app.database import to_async_url
+from benchmarks.bench_list_pagination import seed
+
+
+async def run(handler, requests: int, concurrency: int) -> float:
+    """以给定的并发数发起请求，返回吞吐量（请求/秒）"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            await handler(i)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return requests / (time.perf_counter() - start)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="异步数据库层并发基准测试")
+    parser.add_argument("--url", help="同步数据库URL（默认临时SQLite）")
+    parser.add_argument("--rows", type=int, default=10000, help="测试数据行数")
+    parser.add_argument("--requests", type=int, default=400, help="每个并发级别的请求总数")
+    parser.add_argument("--concurrency", default="1,4,16,64", help="并发级别，逗号分隔")
+    parser.add_argument("--rtt-ms", type=float, default=5.0, help="SQLite下模拟的往返延迟（毫秒）")
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    # 连接池容量与最大并发数一致，避免测到的是排队等待连接的时间
+    pool_options = {} if url.startswith("sqlite") else {"pool_size": max(levels), "max_overflow": 0}
+    engine = create_engine(url, **pool_options)
+    session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    async_engine = create_async_engine(to_async_url(url), **pool_options)
+    async_session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    simulate_rtt = url.startswith("sqlite") and args.rtt_ms > 0
+    if simulate_rtt:
+        def register_rtt(dbapi_connection, connection_record):
+            dbapi_connection.create_function("rtt", 0, lambda: time.sleep(args.rtt_ms / 1000) or 0)
+
+        event.listen(engine, "connect", register_rtt)
+        event.listen(async_engine.sync_engine, "connect", register_rtt)
+
+    print("=" * 60)
+    print(f"  并发基准测试 ({args.rows} 行, {engine.dialect.name})")
+    print("=" * 60)
+    seed(engine, args.rows)
+
+    async def blocking_handler(i):
+        # 旧写法：async def 中调用同步 Session，查询期间事件循环被阻塞
+        db = session_factory()
+        try:
+            if simulate_rtt:
+                db.execute(text("SELECT rtt()"))
+            pokemon_crud.get_page(db=db, skip=(i % 50) * 20, limit=20, type_name="水")
+        finally:
+            db.close()
+
+    async def async_handler(i):
+        async with async_session_factory() as db:
+            if simulate_rtt:
+                await db.execute(text("SELECT rtt()"))
+            await pokemon_crud.aget_page(db=db, skip=(i % 50) * 20, limit=20, type_name="水")
+
+    print(f"\n{'并发数':<8}{'同步Session(req/s)':>22}{'AsyncSession(req/s)':>22}")
+    for concurrency in levels:
+        await run(blocking_handler, 20, concurrency)
+        await run(async_handler, 20, concurrency)
+        blocking = await run(blocking_handler, args.requests, concurrency)
+        non_blocking = await run(async_handler, args.requests, concurrency)
+        print(f"{concurrency:<10}{blocking:>20.1f}{non_blocking:>22.1f}")
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+写入基准测试：逐行"查询是否存在 + add + commit" vs 分块 upsert
+
+用法:
+    python benchmarks/bench_bulk_upsert.py [--url DATABASE_URL] [--rows 2000] [--chunk-size 500]
+
+每种方式各运行两轮：第一轮全部是新行，第二轮全部是已存在的行。
+逐行方式与改造前的 scraper.py 一致（已存在则跳过），分块方式会更新已存在的行。
+传入 --url 可对真实MySQL库运行（会清空 pokemon 表，请勿对生产库使用）。
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.pokemon import Pokemon
+from app.crud import pokemon_crud
+from app.crud.bulk import bulk_upsert
+from benchmarks.bench_list_pagination import make_records
+
+
+def row_by_row(db, records, chunk_size):
+    for record in records:
+        existing = db.query(Pokemon).filter(Pokemon.national_dex == record["national_dex"]).first()
+        if not existing:
+            db.add(Pokemon(**record))
+            db.commit()
+
+
+def chunked(db, records, chunk_size):
+    bulk_upsert(db, pokemon_crud, records, chunk_size=chunk_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="写入基准测试")
+    parser.add_argument("--url", help="数据库URL（默认临时SQLite）")
+    parser.add_argument("--rows", type=int, default=2000, help="写入行数")
+    parser.add_argument("--chunk-size", type=int, default=500, help="每个事务的行数")
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    engine = create_engine(url)
+    session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    records = make_records(args.rows)
+
+    print("=" * 60)
+    print(f"  写入基准测试 ({args.rows} 行, {engine.dialect.name}, 每块 {args.chunk_size} 行)")
+    print("=" * 60)
+
+    for name, func_ in (("逐行", row_by_row), ("分块upsert", chunked)):
+        Base.metadata.drop_all(bind=engine, tables=[Pokemon.__table__])
+        Base.metadata.create_all(bind=engine, tables=[Pokemon.__table__])
+        for label in ("新行", "已存在"):
+            db = session_factory()
+            try:
+                start = time.perf_counter()
+                func_(db, records, args.chunk_size)
+                elapsed = time.perf_counter() - start
+                count = db.execute(select(func.count()).select_from(Pokemon)).scalar()
+            finally:
+                db.close()
+            print(f"  {name:<10} {label:<4} {elapsed:7.3f}s  {args.rows / elapsed:9.0f} 行/秒  (表内 {count} 行)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+整表导出基准测试：不同表大小下流式导出的吞吐与峰值内存（tracemalloc）
+
+用法:
+    python benchmarks/bench_export.py [--rows 20000 200000]
+
+使用临时SQLite数据库。峰值内存应与行数无关：行数增加10倍，峰值不应随之增长。
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, delete, insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from app.database import Base
+from app.models.pokemon import Pokemon
+from app.crud.export import aexport, export_columns
+
+from benchmarks.bench_list_pagination import make_records
+
+CASES = (("ndjson", False), ("csv", False), ("ndjson", True))
+
+
+async def measure(url: str, format: str, compress: bool) -> tuple:
+    """返回 (输出字节数, 峰值内存字节数, 秒)"""
+    engine = create_async_engine(url)
+    session_factory = async_sessionmaker(engine)
+    table = Pokemon.__table__
+    try:
+        async with session_factory() as db:
+            tracemalloc.start()
+            started = time.perf_counter()
+            size = 0
+            async for chunk in aexport(db, table, export_columns(table), format=format, compress=compress):
+                size += len(chunk)
+            elapsed = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    finally:
+        await engine.dispose()
+    return size, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="整表导出基准测试")
+    parser.add_argument("--rows", type=int, nargs="+", default=[20000, 200000], help="测试的表大小")
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "export.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+
+    print("=" * 60)
+    print("  整表导出基准测试")
+    print("=" * 60)
+    for rows in args.rows:
+        with engine.begin() as conn:
+            conn.execute(delete(Pokemon.__table__))
+            conn.execute(insert(Pokemon.__table__), make_records(rows))
+        for format, compress in CASES:
+            size, peak, elapsed = asyncio.run(measure(f"sqlite+aiosqlite:///{path}", format, compress))
+            label = f"{format}{'+gzip' if compress else ''}"
+            print(f"  {rows:>7} 行 {label:<12} 输出 {size / 1e6:7.1f} MB  峰值内存 {peak / 1e6:5.2f} MB  "
+                  f"{rows / elapsed:9.0f} 行/秒")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
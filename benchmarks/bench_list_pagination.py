@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+列表分页基准测试：两次查询（数据 + 计数） vs 单次查询（标量子查询计数）
+
+用法:
+    python benchmarks/bench_list_pagination.py [--url DATABASE_URL] [--rows 10000]
+
+默认使用临时SQLite数据库；传入 --url 可对真实MySQL 8.0 库运行（会写入测试数据，请勿对生产库使用）。
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.pokemon import Pokemon
+from app.crud import pokemon_crud
+
+TYPES = ["一般", "火", "水", "草", "电", "冰", "格斗", "毒", "地面",
+         "飞行", "超能力", "虫", "岩石", "幽灵", "龙", "恶", "钢", "妖精"]
+
+
+def make_records(rows: int) -> list:
+    """生成测试数据记录"""
+    return [
+        {
+            "national_dex": i,
+            "name": f"宝可梦{i}",
+            "japanese_name": f"ポケモン{i}",
+            "english_name": f"Pokemon{i}",
+            "type1": TYPES[i % len(TYPES)],
+            "type2": TYPES[(i * 7) % len(TYPES)] if i % 3 else None,
+            "classification": "测试宝可梦",
+            "hp": i % 255,
+            "total_stats": 300 + i % 400,
+        }
+        for i in range(1, rows + 1)
+    ]
+
+
+def seed(engine, rows: int):
+    """写入测试数据"""
+    Base.metadata.drop_all(bind=engine, tables=[Pokemon.__table__])
+    Base.metadata.create_all(bind=engine, tables=[Pokemon.__table__])
+    with engine.begin() as conn:
+        conn.execute(insert(Pokemon.__table__), make_records(rows))
+
+
+def old_path(db, skip, limit, filters):
+    """数据和总数分两次查询；数据查询与单次查询同样按排序键排列，两者只差计数方式"""
+    pokemon_crud._prepare_search(db, filters)
+    columns = pokemon_crud.columns
+    rows = db.execute(pokemon_crud._page_statement(skip, limit, filters, columns, with_total=False)).all()
+    total = db.execute(pokemon_crud._count_statement(filters)).scalar()
+    return pokemon_crud.serializer.many(rows), total
+
+
+def new_path(db, skip, limit, filters):
+    return pokemon_crud.get_page(db=db, skip=skip, limit=limit, **filters)
+
+
+def measure(session_factory, func, iterations, page_size, filters):
+    """返回每次请求的耗时列表（毫秒），每次请求使用独立会话模拟真实路由"""
+    timings = []
+    for i in range(iterations):
+        skip = (i % 50) * page_size
+        db = session_factory()
+        try:
+            start = time.perf_counter()
+            func(db, skip, page_size, filters)
+            timings.append((time.perf_counter() - start) * 1000)
+        finally:
+            db.close()
+    return timings
+
+
+def report(name, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"  {name:<12} mean={statistics.mean(timings):7.3f}ms  "
+          f"p50={statistics.median(timings):7.3f}ms  p95={p95:7.3f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="列表分页基准测试")
+    parser.add_argument("--url", help="数据库URL（默认临时SQLite）")
+    parser.add_argument("--rows", type=int, default=10000, help="测试数据行数")
+    parser.add_argument("--iterations", type=int, default=500, help="每种场景的请求次数")
+    parser.add_argument("--page-size", type=int, default=20, help="每页数量")
+    args = parser.parse_args()
+
+    url = args.url
+    if not url:
+        url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+
+    engine = create_engine(url)
+    session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+    print("=" * 60)
+    print(f"  列表分页基准测试 ({args.rows} 行, {engine.dialect.name})")
+    print("=" * 60)
+    seed(engine, args.rows)
+
+    scenarios = {
+        "无筛选": {},
+        "按属性": {"type_name": "水"},
+        "属性+搜索": {"type_name": "火", "search": "1"},
+    }
+    for label, filters in scenarios.items():
+        print(f"\n{label}: {filters}")
+        for name, func in (("查询+计数", old_path), ("单次查询", new_path)):
+            # 预热
+            measure(session_factory, func, 10, args.page_size, filters)
+            report(name, measure(session_factory, func, args.iterations, args.page_size, filters))
+
+
+if __name__ == "__main__":
+    main()
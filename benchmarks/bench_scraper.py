@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+爬虫基准测试：逐个同步请求 vs 异步并发引擎（事件循环内解析 / 进程池解析）
+
+用法:
+    python benchmarks/bench_scraper.py [--count 100] [--latency-ms 50] [--concurrency 16] [--parse-workers 4]
+
+桩服务在独立进程中运行，不与被测爬虫争用GIL；磁盘缓存关闭，每次都走网络。
+同步爬虫的固定休眠设为0，只比较网络和解析部分；原实现每条记录另有 delay 秒（默认1秒）休眠。
+"""
+import argparse
+import contextlib
+import io
+import os
+import socket
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.scraper.base import PokemonScraper
+from app.scraper.async_engine import scrape_range
+from app.scraper.cache import HTTPCache
+
+
+@contextlib.contextmanager
+def stub_process(latency_ms: float, error_rate: float):
+    """在子进程中启动桩服务，返回 base_url"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stub_pokeapi.py")
+    process = subprocess.Popen(
+        [sys.executable, script, "--port", str(port), "--latency-ms", str(latency_ms),
+         "--error-rate", str(error_rate)],
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        for _ in range(100):
+            with contextlib.suppress(OSError), socket.create_connection(("127.0.0.1", port), timeout=0.1):
+                break
+            time.sleep(0.05)
+        yield f"http://127.0.0.1:{port}/api/v2"
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="爬虫基准测试")
+    parser.add_argument("--count", type=int, default=100, help="爬取的宝可梦数量")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="桩服务每个请求的延迟（毫秒）")
+    parser.add_argument("--concurrency", type=int, default=16, help="异步引擎的并发数")
+    parser.add_argument("--rate", type=float, default=0, help="异步引擎每秒请求上限（0为不限）")
+    parser.add_argument("--parse-workers", type=int, default=os.cpu_count(), help="解析进程数")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="桩服务随机返回503的比例")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"  爬虫基准测试 ({args.count} 个宝可梦, 延迟 {args.latency_ms}ms)")
+    print("=" * 60)
+
+    off = HTTPCache("", mode="off")
+    results = []
+    with stub_process(args.latency_ms, args.error_rate) as base_url:
+        # 预热：桩服务首次生成文档的耗时不计入
+        scrape_range("pokemon", 1, args.count, base_url=base_url, cache=off, rate=0, parse_workers=0)
+
+        scraper = PokemonScraper(delay=0, base_url=base_url, cache=off)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            records = scraper.scrape_pokemon_list(1, args.count)
+        results.append(("同步逐个请求", records, time.perf_counter() - start))
+
+        for label, workers in (("异步+事件循环内解析", 0), (f"异步+{args.parse_workers}进程解析", args.parse_workers)):
+            start = time.perf_counter()
+            records = scrape_range(
+                "pokemon", 1, args.count, base_url=base_url, cache=off,
+                concurrency=args.concurrency, rate=args.rate, backoff=0.05, parse_workers=workers
+            )
+            results.append((label, records, time.perf_counter() - start))
+
+    print()
+    for label, records, elapsed in results:
+        print(f"  {label:<16} {len(records):>5} 条  {elapsed:7.2f}s  {len(records) / elapsed:7.1f} 条/秒")
+    if args.error_rate == 0:
+        assert all(records == results[0][1] for _, records, _ in results), "各方式解析结果不一致"
+
+
+if __name__ == "__main__":
+    main()
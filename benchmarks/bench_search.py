@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+名称搜索基准测试：ILIKE '%q%' 全表扫描 vs n-gram 搜索索引
+
+用法:
+    python benchmarks/bench_search.py [--url DATABASE_URL] [--rows 10000]
+
+模拟搜索框逐字输入：对每个查询前缀各执行一次"当前页 + 总数"。
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, or_, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models.pokemon import Pokemon
+from app.crud import pokemon_crud
+from benchmarks.bench_list_pagination import seed, measure, report
+
+QUERIES = ["宝", "宝可", "宝可梦", "宝可梦12", "p", "po", "pok", "pokemon99", "ポケ", "不存在"]
+
+
+def ilike_path(db, skip, limit, filters):
+    condition = or_(*(getattr(Pokemon, field).ilike(f"%{filters['search']}%")
+                      for field in pokemon_crud.search_fields))
+    db.execute(select(*pokemon_crud.columns).where(condition).offset(skip).limit(limit)).all()
+    db.execute(select(func.count()).select_from(Pokemon).where(condition)).scalar()
+
+
+def index_path(db, skip, limit, filters):
+    pokemon_crud.get_page(db=db, skip=skip, limit=limit, **filters)
+
+
+def first_page(func):
+    """只测第一页，与搜索框的使用方式一致"""
+    return lambda db, skip, limit, filters: func(db, 0, limit, filters)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="名称搜索基准测试")
+    parser.add_argument("--url", help="数据库URL（默认临时SQLite）")
+    parser.add_argument("--rows", type=int, default=10000, help="测试数据行数")
+    parser.add_argument("--iterations", type=int, default=50, help="每个查询的执行次数")
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    engine = create_engine(url)
+    session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+    print("=" * 60)
+    print(f"  名称搜索基准测试 ({args.rows} 行, {engine.dialect.name})")
+    print("=" * 60)
+    seed(engine, args.rows)
+
+    db = session_factory()
+    pokemon_crud.search_index.build(db)
+    db.close()
+
+    for name, func in (("ILIKE", ilike_path), ("搜索索引", index_path)):
+        timings = []
+        for query in QUERIES:
+            timings += measure(session_factory, first_page(func), args.iterations, 20, {"search": query})
+        report(name, timings)
+
+
+if __name__ == "__main__":
+    main()
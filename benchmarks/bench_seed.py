@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+种子数据基准测试：ORM 对象 + bulk_save_objects（原 init_db.py 的做法） vs 快照 Core 批量插入
+
+用法:
+    python benchmarks/bench_seed.py [--pokemon 1025] [--learnset 80]
+
+使用临时SQLite数据库。先用合成数据生成快照（每只宝可梦 --learnset 条招式表条目），
+再分别计时两种方式导入空库，以及快照版本已导入时的再次启动。
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models.pokemon import Pokemon, Move, Ability, Item, PokemonMove
+from app.crud.seed import apply_snapshot, build_snapshot
+
+from benchmarks.bench_list_pagination import make_records
+
+MOVES = 900
+
+
+def make_moves(rows: int) -> list:
+    return [
+        {
+            "move_id": i,
+            "name": f"招式{i}",
+            "japanese_name": f"わざ{i}",
+            "english_name": f"Move{i}",
+            "type": "一般",
+            "category": "物理",
+            "power": i % 150,
+            "description": "测试招式",
+            "generation": "第一世代",
+        }
+        for i in range(1, rows + 1)
+    ]
+
+
+def make_learnset(pokemon: int, per_pokemon: int) -> list:
+    return [
+        {"pokemon_id": p, "move_id": (p * 7 + n) % MOVES + 1, "learn_method": "升级", "learn_level": n}
+        for p in range(1, pokemon + 1)
+        for n in range(per_pokemon)
+    ]
+
+
+def fresh_engine(directory: str, name: str):
+    engine = create_engine(f"sqlite:///{os.path.join(directory, name)}")
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def orm_seed(engine, data: dict) -> float:
+    """原做法：逐表计数，构造 ORM 对象后 bulk_save_objects，每表一次提交"""
+    started = time.perf_counter()
+    with Session(engine) as db:
+        for model in (Pokemon, Move, Ability, Item, PokemonMove):
+            db.query(model).count()
+        for model in (Pokemon, Move, PokemonMove):
+            db.bulk_save_objects([model(**record) for record in data[model]])
+            db.commit()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="种子数据基准测试")
+    parser.add_argument("--pokemon", type=int, default=1025, help="宝可梦数量")
+    parser.add_argument("--learnset", type=int, default=80, help="每只宝可梦的招式表条目数")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    data = {
+        Pokemon: make_records(args.pokemon),
+        Move: make_moves(MOVES),
+        PokemonMove: make_learnset(args.pokemon, args.learnset),
+    }
+    source = fresh_engine(directory, "source.db")
+    with source.begin() as conn:
+        for model, records in data.items():
+            conn.execute(insert(model.__table__), records)
+    snapshot = os.path.join(directory, "seed")
+    manifest = build_snapshot(source, snapshot)
+    size = sum(os.path.getsize(os.path.join(snapshot, entry["file"])) for entry in manifest["tables"].values())
+
+    print("=" * 60)
+    print("  种子数据基准测试")
+    print("=" * 60)
+    print(f"  {args.pokemon} 宝可梦, {MOVES} 招式, {len(data[PokemonMove])} 招式表条目, 快照 {size / 1e6:.2f} MB")
+
+    elapsed = orm_seed(fresh_engine(directory, "orm.db"), data)
+    print(f"  ORM bulk_save_objects        {elapsed:7.2f}s")
+
+    engine = fresh_engine(directory, "snapshot.db")
+    report = apply_snapshot(engine, snapshot, chunk_size=1000)
+    print(f"  快照 Core 批量插入            {report.seconds:7.2f}s")
+    started = time.perf_counter()
+    apply_snapshot(engine, snapshot)
+    print(f"  再次启动（版本已导入）        {time.perf_counter() - started:7.3f}s")
+
+    with engine.connect() as conn:
+        assert conn.scalar(select(func.count()).select_from(PokemonMove)) == len(data[PokemonMove])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+序列化基准测试：ORM实例 + 反射式 model_to_dict + 标准JSON编码 vs Core行 + 预编译序列化器 + orjson
+
+用法:
+    python benchmarks/bench_serializer.py [--rows 100] [--iterations 2000]
+
+分别测量"行 -> 字典"和"查询 + 序列化 + 编码"整条路径，数据写入临时SQLite。
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models.pokemon import Pokemon
+from app.crud import pokemon_crud
+from app.utils.serializer import FastJSONResponse, models_to_list
+from benchmarks.bench_list_pagination import seed
+
+
+def legacy_model_to_dict(model):
+    """改造前的 model_to_dict：逐列 getattr 并探测 isoformat"""
+    result = {}
+    for column in model.__table__.columns:
+        value = getattr(model, column.name)
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        result[column.name] = value
+    return result
+
+
+def legacy_encode(content):
+    """改造前 FastAPI 的编码路径：jsonable_encoder 遍历后再 json.dumps"""
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def timed(func, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(name, timings):
+    print(f"  {name:<26} mean={statistics.mean(timings):7.3f}ms  "
+          f"p50={statistics.median(timings):7.3f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="序列化基准测试")
+    parser.add_argument("--rows", type=int, default=100, help="每页行数")
+    parser.add_argument("--iterations", type=int, default=2000, help="每种场景的执行次数")
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+    session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    seed(engine, args.rows)
+
+    print("=" * 60)
+    print(f"  序列化基准测试 ({args.rows} 行/页)")
+    print("=" * 60)
+
+    db = session_factory()
+    objects = db.execute(select(Pokemon).limit(args.rows)).scalars().all()
+    rows = db.execute(select(*pokemon_crud.columns).limit(args.rows)).all()
+    assert [legacy_model_to_dict(obj) for obj in objects] == pokemon_crud.serializer.many(rows)
+
+    print("\n行 -> 字典:")
+    report("反射 model_to_dict", timed(
+        lambda: [legacy_model_to_dict(obj) for obj in objects], args.iterations))
+    report("预编译序列化器(ORM实例)", timed(
+        lambda: models_to_list(objects), args.iterations))
+    report("预编译序列化器(Core行)", timed(
+        lambda: pokemon_crud.serializer.many(rows), args.iterations))
+    db.close()
+
+    def old_path():
+        session = session_factory()
+        try:
+            objs = session.execute(select(Pokemon).limit(args.rows)).scalars().all()
+            legacy_encode({"success": True, "data": [legacy_model_to_dict(obj) for obj in objs]})
+        finally:
+            session.close()
+
+    def new_path():
+        session = session_factory()
+        try:
+            data, total = pokemon_crud.get_page(db=session, skip=0, limit=args.rows)
+            FastJSONResponse(content={"success": True, "data": data, "total": total})
+        finally:
+            session.close()
+
+    print("\n查询 + 序列化 + JSON编码:")
+    iterations = max(args.iterations // 4, 1)
+    report("ORM + 反射 + json", timed(old_path, iterations))
+    report("Core + 预编译 + orjson", timed(new_path, iterations))
+
+
+if __name__ == "__main__":
+    main()
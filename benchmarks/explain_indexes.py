@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+索引回归检查：对列表、计数、游标分页的筛选查询执行 EXPLAIN，断言被筛选的表都走索引
+
+用法:
+    python benchmarks/explain_indexes.py [--url DATABASE_URL] [--rows 5000]
+
+默认使用临时SQLite数据库（EXPLAIN QUERY PLAN，出现不带索引的 "SCAN 表名" 即失败）；
+传入 --url 可对已有数据的 MySQL 库检查（EXPLAIN，type=ALL 即失败，只读不写）。
+有查询退化为全表扫描时以非0状态退出。SQLite 上的检查已作为 tests/test_indexes.py 随 pytest 运行。
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, text
+
+from app.database import Base
+from app.models.pokemon import Pokemon, Move, Item
+from app.crud import pokemon_crud, move_crud, item_crud
+
+from benchmarks.bench_list_pagination import TYPES, make_records
+
+TABLES = {"pokemon", "moves", "abilities", "items"}
+CATEGORIES = ["物理", "特殊", "变化"]
+ITEM_CATEGORIES = ["回复", "树果", "进化", "携带物品", "捕捉"]
+GENERATIONS = ["第一世代", "第二世代", "第三世代", "第四世代", "第五世代"]
+
+# (名称, CRUD, 筛选参数)
+CASES = [
+    ("宝可梦 type", pokemon_crud, {"type_name": "火"}),
+    ("招式 type", move_crud, {"type_name": "火"}),
+    ("招式 category", move_crud, {"category": "特殊"}),
+    ("招式 type+category", move_crud, {"type_name": "火", "category": "特殊"}),
+    ("道具 category", item_crud, {"category": "树果"}),
+    ("道具 category+generation", item_crud, {"category": "树果", "generation": "第三世代"}),
+]
+
+
+def seed(engine, rows: int):
+    """写入测试数据并收集统计信息"""
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Pokemon.__table__), make_records(rows))
+        conn.execute(insert(Move.__table__), [
+            {
+                "move_id": i, "name": f"招式{i}", "japanese_name": f"わざ{i}", "english_name": f"Move{i}",
+                "type": TYPES[i % len(TYPES)], "category": CATEGORIES[i % 3],
+                "description": "测试招式", "generation": GENERATIONS[i % len(GENERATIONS)],
+            }
+            for i in range(1, rows + 1)
+        ])
+        conn.execute(insert(Item.__table__), [
+            {
+                "name": f"道具{i}", "japanese_name": f"どうぐ{i}", "english_name": f"Item{i}",
+                "category": ITEM_CATEGORIES[i % len(ITEM_CATEGORIES)], "description": "测试道具",
+                "generation": GENERATIONS[(i // 7) % len(GENERATIONS)],
+            }
+            for i in range(1, rows + 1)
+        ])
+        if engine.dialect.name == "sqlite":
+            conn.exec_driver_sql("ANALYZE")
+
+
+def statements(crud, filters: dict):
+    """与 CRUDBase 列表接口实际执行的语句一致"""
+    return [
+        ("页面+总数", crud._page_statement(0, 20, filters, crud.columns)),
+        ("计数", crud._count_statement(filters)),
+        ("游标分页", crud._keyset_statement(None, 20, filters, crud.columns)),
+    ]
+
+
+def explain(conn, stmt) -> tuple:
+    """返回 (执行计划文本行, 全表扫描的表)"""
+    sql = str(stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    if conn.dialect.name == "sqlite":
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        lines = [row[-1] for row in rows]
+        scans = {
+            match.group(1) for line in lines
+            for match in [re.match(r"SCAN (\w+)(?! USING)", line)] if match and match.group(1) in TABLES
+        }
+        return lines, scans
+    rows = conn.execute(text(f"EXPLAIN {sql}")).mappings().all()
+    lines = [f"{row['table']}: type={row['type']} key={row['key']} rows={row['rows']} {row['Extra'] or ''}"
+             for row in rows]
+    scans = {row["table"] for row in rows if row["type"] == "ALL" and row["table"] in TABLES}
+    return lines, scans
+
+
+def main():
+    parser = argparse.ArgumentParser(description="索引回归检查")
+    parser.add_argument("--url", help="数据库URL（默认临时SQLite）")
+    parser.add_argument("--rows", type=int, default=5000, help="SQLite 测试数据行数")
+    args = parser.parse_args()
+
+    tmpdir = None
+    if args.url:
+        engine = create_engine(args.url)
+    else:
+        tmpdir = tempfile.TemporaryDirectory()
+        engine = create_engine(f"sqlite:///{os.path.join(tmpdir.name, 'explain.db')}")
+        seed(engine, args.rows)
+
+    failures = []
+    with engine.connect() as conn:
+        for label, crud, filters in CASES:
+            for kind, stmt in statements(crud, filters):
+                lines, scans = explain(conn, stmt)
+                status = "全表扫描: " + ", ".join(sorted(scans)) if scans else "OK"
+                print(f"{label} / {kind}: {status}")
+                for line in lines:
+                    print(f"    {line}")
+                if scans:
+                    failures.append(f"{label} / {kind}")
+
+    engine.dispose()
+    if tmpdir is not None:
+        tmpdir.cleanup()
+    if failures:
+        print(f"\n{len(failures)} 个查询未使用索引: {'; '.join(failures)}")
+        sys.exit(1)
+    print("\n所有筛选查询都使用了索引")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+本地 PokeAPI 桩服务：按编号生成与 PokeAPI 结构一致的文档，可设置延迟和错误率，支持 ETag 条件请求和分页索引
+
+用法:
+    python benchmarks/stub_pokeapi.py [--port 8765] [--latency-ms 20] [--count 1025]
+
+也可在脚本中使用：
+    with StubPokeAPI(latency=0.02) as base_url:
+        scrape_range("pokemon", 1, 100, base_url=base_url)
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+PATH_PATTERN = re.compile(r"^/api/v2/(pokemon|pokemon-species|move|ability|item)/(\d+)/?$")
+INDEX_PATTERN = re.compile(r"^/api/v2/(pokemon|move|ability|item)/?(?:\?(.*))?$")
+TYPES = ["normal", "fire", "water", "grass", "electric", "ice", "fighting", "poison", "ground",
+         "flying", "psychic", "bug", "rock", "ghost", "dragon", "dark", "steel", "fairy"]
+
+VERSION_GROUPS = ["red-blue", "yellow", "gold-silver", "crystal", "ruby-sapphire", "emerald",
+                  "firered-leafgreen", "diamond-pearl", "platinum", "heartgold-soulsilver",
+                  "black-white", "black-2-white-2", "x-y", "omega-ruby-alpha-sapphire",
+                  "sun-moon", "ultra-sun-ultra-moon", "sword-shield", "scarlet-violet"]
+
+
+def names(prefix_zh: str, prefix_ja: str, english: str, number: int) -> list:
+    return [
+        {"language": {"name": "ja-Hrkt"}, "name": f"{prefix_ja}{number}"},
+        {"language": {"name": "zh-Hant"}, "name": f"{prefix_zh}{number}"},
+        {"language": {"name": "zh-Hans"}, "name": f"{prefix_zh}{number}"},
+        {"language": {"name": "en"}, "name": f"{english}{number}"},
+    ]
+
+
+def learnset(base_url: str, number: int) -> list:
+    """与真实文档体量相当的招式表：约80个招式，每个招式在多个版本组中的习得方式"""
+    moves = sorted({(number * 31 + k * 17) % 900 + 1 for k in range(80)})
+    return [
+        {
+            "move": {"name": f"move{move}", "url": f"{base_url}/move/{move}/"},
+            "version_group_details": [
+                {
+                    "level_learned_at": (move * 3 + g) % 100 if position < 20 else 0,
+                    "move_learn_method": {
+                        "name": "level-up" if position < 20 else "machine" if position < 70 else "egg",
+                        "url": f"{base_url}/move-learn-method/1/",
+                    },
+                    "version_group": {"name": group, "url": f"{base_url}/version-group/{g + 1}/"},
+                    "order": None,
+                }
+                for g, group in enumerate(VERSION_GROUPS)
+            ],
+        }
+        for position, move in enumerate(moves)
+    ]
+
+
+def index_page(base_url: str, resource: str, count: int, limit: int, offset: int) -> dict:
+    """/{resource}?limit=&offset= 分页索引"""
+    numbers = range(offset + 1, min(offset + limit, count) + 1)
+
+    def link(at: int) -> str:
+        return f"{base_url}/{resource}?offset={at}&limit={limit}"
+
+    return {
+        "count": count,
+        "next": link(offset + limit) if offset + limit < count else None,
+        "previous": link(max(offset - limit, 0)) if offset > 0 else None,
+        "results": [{"name": f"{resource}{n}", "url": f"{base_url}/{resource}/{n}/"} for n in numbers],
+    }
+
+
+def document(base_url: str, resource: str, number: int, revision: int = 0) -> dict:
+    """revision 非0时，编号个位与 revision 相同的宝可梦/招式数值不同，模拟上游修正数据"""
+    seed = number + revision if revision and number % 10 == revision % 10 else number
+    generation = {"name": "generation-i"}
+    if resource == "pokemon":
+        types = [{"slot": 1, "type": {"name": TYPES[number % 18]}}]
+        if number % 3:
+            types.append({"slot": 2, "type": {"name": TYPES[(number * 7) % 18]}})
+        return {
+            "id": number,
+            "name": f"pokemon{number}",
+            "height": 7,
+            "weight": 69,
+            "types": types,
+            "stats": [{"base_stat": 40 + (seed + i) % 60} for i in range(6)],
+            "abilities": [{"ability": {"name": "overgrow"}, "is_hidden": False}],
+            "species": {"url": f"{base_url}/pokemon-species/{number}/"},
+            "moves": learnset(base_url, number),
+        }
+    if resource == "pokemon-species":
+        return {
+            "id": number,
+            "names": names("宝可梦", "ポケモン", "Pokemon", number),
+            "genera": [{"language": {"name": "en"}, "genus": "Seed Pokémon"}],
+            "gender_rate": 1,
+            "capture_rate": 45 + seed - number,
+            "growth_rate": {"name": "medium-slow"},
+            "generation": generation,
+        }
+    flavor = [
+        {"language": {"name": "en"}, "flavor_text": "An English description.", "text": "An English description."},
+        {"language": {"name": "zh-Hans"}, "flavor_text": "中文说明。", "text": "中文说明。"},
+    ]
+    if resource == "move":
+        return {
+            "id": number,
+            "name": f"move{number}",
+            "names": names("招式", "わざ", "Move", number),
+            "type": {"name": TYPES[number % 18]},
+            "damage_class": {"name": ["physical", "special", "status"][number % 3]},
+            "power": 40 + seed % 80,
+            "accuracy": 100,
+            "pp": 35,
+            "flavor_text_entries": flavor,
+            "generation": generation,
+        }
+    if resource == "ability":
+        return {
+            "id": number,
+            "name": f"ability{number}",
+            "names": names("特性", "とくせい", "Ability", number),
+            "flavor_text_entries": flavor,
+            "generation": generation,
+        }
+    return {
+        "id": number,
+        "name": f"item{number}",
+        "names": names("道具", "どうぐ", "Item", number),
+        "category": {"name": "healing"},
+        "flavor_text_entries": flavor,
+        "game_indices": [{"generation": generation}],
+    }
+
+
+class _Server(ThreadingHTTPServer):
+    # 默认 backlog 只有5，并发建连时会丢 SYN，客户端要等1秒重传
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class StubPokeAPI:
+    """在后台线程运行的桩服务，作为上下文管理器时返回 base_url"""
+
+    def __init__(
+        self, port: int = 0, latency: float = 0.0, count: int = 1025, error_rate: float = 0.0, revision: int = 0
+    ):
+        self.latency = latency
+        self.count = count
+        self.error_rate = error_rate
+        self.revision = revision
+        self.requests = 0
+        self.not_modified = 0
+        self._payloads = {}
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # 头和正文分两次写出，关闭 Nagle 避免与延迟确认叠加出 40ms 停顿
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                stub.requests += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+                match = PATH_PATTERN.match(self.path)
+                if stub.error_rate and random.random() < stub.error_rate:
+                    return self._send(503, {"detail": "temporarily unavailable"})
+                index = INDEX_PATTERN.match(self.path)
+                if index:
+                    query = parse_qs(index.group(2) or "")
+                    limit = int(query.get("limit", ["20"])[0])
+                    offset = int(query.get("offset", ["0"])[0])
+                    return self._send(200, index_page(stub.base_url, index.group(1), stub.count, limit, offset))
+                if not match or not 1 <= int(match.group(2)) <= stub.count:
+                    return self._send(404, {"detail": "Not found."})
+                self._send(200, stub.payload(match.group(1), int(match.group(2))))
+
+            def _send(self, status, body):
+                payload = body if isinstance(body, bytes) else json.dumps(body, ensure_ascii=False).encode("utf-8")
+                etag = '"%s"' % hashlib.sha1(payload).hexdigest()
+                if status == 200 and self.headers.get("If-None-Match") == etag:
+                    stub.not_modified += 1
+                    status, payload = 304, b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                if status in (200, 304):
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = _Server(("127.0.0.1", port), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/api/v2"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def payload(self, resource: str, number: int) -> bytes:
+        """文档按 (资源, 编号) 只生成一次，避免桩服务自身的编码开销干扰测量"""
+        key = (resource, number, self.revision)
+        payload = self._payloads.get(key)
+        if payload is None:
+            payload = json.dumps(
+                document(self.base_url, resource, number, self.revision), ensure_ascii=False
+            ).encode("utf-8")
+            self._payloads[key] = payload
+        return payload
+
+    def __enter__(self) -> str:
+        self._thread.start()
+        return self.base_url
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地 PokeAPI 桩服务")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="每个请求的模拟延迟（毫秒）")
+    parser.add_argument("--count", type=int, default=1025, help="每类资源的数量")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="随机返回503的比例")
+    parser.add_argument("--revision", type=int, default=0, help="数据版本，非0时约1/10的文档内容不同")
+    args = parser.parse_args()
+
+    with StubPokeAPI(args.port, args.latency_ms / 1000, args.count, args.error_rate, args.revision) as base_url:
+        print(f"桩服务已启动: {base_url}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+批量导入脚本：把 NDJSON / JSON 数组文件（可 gzip 压缩）校验后分块 upsert 到数据库
+
+用法:
+    python import_data.py pokemon pokemon.ndjson.gz
+    python import_data.py moves moves.json --chunk-size 1000
+
+文件格式与 /api/export/{resource} 的 NDJSON 输出一致，可直接导入另一个环境；
+不合格或写入失败的行会被列出，不影响其他行。有失败行时以非0状态退出。
+"""
+import argparse
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.config import settings
+from app.database import engine, Base, SessionLocal, upgrade_schema
+from app.crud.imports import IMPORTS, import_records, parse_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批量导入数据")
+    parser.add_argument("resource", choices=list(IMPORTS), help="资源类型")
+    parser.add_argument("files", nargs="+", help="NDJSON 或 JSON 数组文件，.gz 自动解压")
+    parser.add_argument("--chunk-size", type=int, default=settings.BULK_CHUNK_SIZE, help="每个事务写入的行数")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+
+    failed = 0
+    db = SessionLocal()
+    try:
+        for path in args.files:
+            print(f"导入 {path} ...")
+            report = import_records(db, args.resource, parse_file(path), chunk_size=args.chunk_size)
+            print(f"  {report}")
+            for error in report.errors:
+                print(f"  第 {error['row']} 行 ({error['key']}): {error['error']}")
+            if report.failed > len(report.errors):
+                print(f"  ……另有 {report.failed - len(report.errors)} 行失败未列出")
+            failed += report.failed
+    finally:
+        db.close()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,55 +1,47 @@
 #!/usr/bin/env python3
 """
 使用爬虫获取数据并保存到数据库
+
+用法:
+    python scraper.py                                   # 交互菜单
+    python scraper.py crawl --pokemon 1-1025 --workers 16
+    python scraper.py resume [--retry-failed]           # 中断后从状态文件继续
+    python scraper.py status
+    python scraper.py sync [pokemon move ...]           # 增量同步：只写入新增和变化的记录
 """
+import argparse
+import json
 import sys
 import os
+from typing import List, Optional, Tuple
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from app.database import SessionLocal
-from app.models.pokemon import Pokemon, Move, Ability, Item
-from app.scraper.base import PokemonScraper, MoveScraper, AbilityScraper, ItemScraper
-from datetime import datetime
+from app.config import settings
+from app.scraper.async_engine import scrape_range
+from app.scraper.jobs import CrawlJob, CrawlState, save_records
+from app.scraper.parsers import with_content_hash
+from app.scraper.sync import DeltaSync
 
+# 与交互菜单"全部"选项一致的默认区间
+DEFAULT_RANGES = {"move": (1, 100), "ability": (1, 50), "item": (1, 50), "pokemon": (1, 151)}
 
-def scrape_and_save_pokemon(start_id: int = 1, end_id: int = 151):
-    """爬取宝可梦数据并保存到数据库"""
-    print(f"爬取宝可梦数据 (#{start_id} - #{end_id})...")
+
+def _scrape_and_save(resource: str, label: str, start_id: int, end_id: int):
+    """并发爬取 [start_id, end_id] 区间，再分块 upsert（已存在的按自然键更新）"""
+    print(f"爬取{label}数据 (#{start_id} - #{end_id})...")
     
     db = SessionLocal()
-    scraper = PokemonScraper(delay=1.0)
     
     try:
-        success_count = 0
-        skip_count = 0
-        error_count = 0
-        
-        for pokemon_id in range(start_id, end_id + 1):
-            pokemon_data = scraper.scrape_pokemon_by_id(pokemon_id)
-            if pokemon_data:
-                # 检查是否已存在
-                existing = db.query(Pokemon).filter(
-                    Pokemon.national_dex == pokemon_data["national_dex"]
-                ).first()
-                
-                if existing:
-                    print(f"  ⏭️  宝可梦 #{pokemon_id} 已存在，跳过")
-                    skip_count += 1
-                else:
-                    pokemon = Pokemon(**pokemon_data)
-                    db.add(pokemon)
-                    db.commit()
-                    print(f"  ✅ 保存宝可梦 #{pokemon_id} 成功")
-                    success_count += 1
-            else:
-                print(f"  ❌ 宝可梦 #{pokemon_id} 爬取失败")
-                error_count += 1
+        records = with_content_hash(scrape_range(resource, start_id, end_id))
+        report = save_records(db, resource, records)
         
         print(f"\n总结:")
-        print(f"  ✅ 成功保存: {success_count} 个")
-        print(f"  ⏭️  跳过已存在: {skip_count} 个")
-        print(f"  ❌ 爬取失败: {error_count} 个")
+        print(f"  ✅ 写入(新增或更新): {report.rows} 个")
+        print(f"  ❌ 爬取失败: {end_id - start_id + 1 - len(records)} 个")
         print(f"  总计处理: {end_id - start_id + 1} 个")
+        print(f"  写入耗时: {report}")
         
     except Exception as e:
         print(f"\n爬取失败: {e}")
@@ -58,145 +50,28 @@ def scrape_and_save_pokemon(start_id: int = 1, end_id: int = 151):
         db.close()
 
 
+def scrape_and_save_pokemon(start_id: int = 1, end_id: int = 151):
+    """爬取宝可梦数据并保存到数据库"""
+    _scrape_and_save("pokemon", "宝可梦", start_id, end_id)
+
+
 def scrape_and_save_moves(start_id: int = 1, end_id: int = 100):
     """爬取招式数据并保存到数据库"""
-    print(f"爬取招式数据 (#{start_id} - #{end_id})...")
-    
-    db = SessionLocal()
-    scraper = MoveScraper(delay=1.0)
-    
-    try:
-        success_count = 0
-        skip_count = 0
-        error_count = 0
-        
-        for move_id in range(start_id, end_id + 1):
-            move_data = scraper.scrape_move_by_id(move_id)
-            if move_data:
-                # 检查是否已存在
-                existing = db.query(Move).filter(
-                    Move.move_id == move_data["move_id"]
-                ).first()
-                
-                if existing:
-                    print(f"  ⏭️  招式 #{move_id} 已存在，跳过")
-                    skip_count += 1
-                else:
-                    move = Move(**move_data)
-                    db.add(move)
-                    db.commit()
-                    print(f"  ✅ 保存招式 #{move_id} 成功")
-                    success_count += 1
-            else:
-                print(f"  ❌ 招式 #{move_id} 爬取失败")
-                error_count += 1
-        
-        print(f"\n总结:")
-        print(f"  ✅ 成功保存: {success_count} 个")
-        print(f"  ⏭️  跳过已存在: {skip_count} 个")
-        print(f"  ❌ 爬取失败: {error_count} 个")
-        print(f"  总计处理: {end_id - start_id + 1} 个")
-        
-    except Exception as e:
-        print(f"\n爬取失败: {e}")
-        db.rollback()
-    finally:
-        db.close()
+    _scrape_and_save("move", "招式", start_id, end_id)
 
 
 def scrape_and_save_abilities(start_id: int = 1, end_id: int = 50):
     """爬取特性数据并保存到数据库"""
-    print(f"爬取特性数据 (#{start_id} - #{end_id})...")
-    
-    db = SessionLocal()
-    scraper = AbilityScraper(delay=1.0)
-    
-    try:
-        success_count = 0
-        skip_count = 0
-        error_count = 0
-        
-        for ability_id in range(start_id, end_id + 1):
-            ability_data = scraper.scrape_ability_by_id(ability_id)
-            if ability_data:
-                # 检查是否已存在
-                existing = db.query(Ability).filter(
-                    Ability.ability_id == ability_data["ability_id"]
-                ).first()
-                
-                if existing:
-                    print(f"  ⏭️  特性 #{ability_id} 已存在，跳过")
-                    skip_count += 1
-                else:
-                    ability = Ability(**ability_data)
-                    db.add(ability)
-                    db.commit()
-                    print(f"  ✅ 保存特性 #{ability_id} 成功")
-                    success_count += 1
-            else:
-                print(f"  ❌ 特性 #{ability_id} 爬取失败")
-                error_count += 1
-        
-        print(f"\n总结:")
-        print(f"  ✅ 成功保存: {success_count} 个")
-        print(f"  ⏭️  跳过已存在: {skip_count} 个")
-        print(f"  ❌ 爬取失败: {error_count} 个")
-        print(f"  总计处理: {end_id - start_id + 1} 个")
-        
-    except Exception as e:
-        print(f"\n爬取失败: {e}")
-        db.rollback()
-    finally:
-        db.close()
+    _scrape_and_save("ability", "特性", start_id, end_id)
 
 
 def scrape_and_save_items(start_id: int = 1, end_id: int = 50):
     """爬取道具数据并保存到数据库"""
-    print(f"爬取道具数据 (#{start_id} - #{end_id})...")
-    
-    db = SessionLocal()
-    scraper = ItemScraper(delay=1.0)
-    
-    try:
-        success_count = 0
-        skip_count = 0
-        error_count = 0
-        
-        for item_id in range(start_id, end_id + 1):
-            item_data = scraper.scrape_item_by_id(item_id)
-            if item_data:
-                # 检查是否已存在（item表按name检查）
-                existing = db.query(Item).filter(
-                    Item.name == item_data["name"]
-                ).first()
-                
-                if existing:
-                    print(f"  ⏭️  道具 #{item_id} 已存在，跳过")
-                    skip_count += 1
-                else:
-                    item = Item(**item_data)
-                    db.add(item)
-                    db.commit()
-                    print(f"  ✅ 保存道具 #{item_id} 成功")
-                    success_count += 1
-            else:
-                print(f"  ❌ 道具 #{item_id} 爬取失败")
-                error_count += 1
-        
-        print(f"\n总结:")
-        print(f"  ✅ 成功保存: {success_count} 个")
-        print(f"  ⏭️  跳过已存在: {skip_count} 个")
-        print(f"  ❌ 爬取失败: {error_count} 个")
-        print(f"  总计处理: {end_id - start_id + 1} 个")
-        
-    except Exception as e:
-        print(f"\n爬取失败: {e}")
-        db.rollback()
-    finally:
-        db.close()
+    _scrape_and_save("item", "道具", start_id, end_id)
 
 
-if __name__ == "__main__":
+def interactive():
+    """交互菜单"""
     print("=" * 50)
     print("  宝可梦数据爬取脚本")
     print("=" * 50)
@@ -229,10 +104,11 @@ if __name__ == "__main__":
         scrape_and_save_items(start_id, end_id)
     elif choice == "5":
         print("\n开始爬取所有数据...")
-        scrape_and_save_pokemon(1, 151)
+        # 招式先入库，宝可梦的招式表才能关联上
         scrape_and_save_moves(1, 100)
         scrape_and_save_abilities(1, 50)
         scrape_and_save_items(1, 50)
+        scrape_and_save_pokemon(1, 151)
     else:
         print("无效的选项")
         sys.exit(1)
@@ -241,3 +117,103 @@ if __name__ == "__main__":
     print("=" * 50)
     print("  爬取完成！")
     print("=" * 50)
+
+
+def parse_range(text: str) -> Tuple[int, int]:
+    """解析 "1-1025" 或 "25" 形式的编号区间"""
+    start, _, end = text.partition("-")
+    try:
+        start_id, end_id = int(start), int(end or start)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"无效的区间: {text}，应为 起始-结束")
+    if start_id < 1 or end_id < start_id:
+        raise argparse.ArgumentTypeError(f"无效的区间: {text}")
+    return start_id, end_id
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="宝可梦数据爬取脚本，不带参数时进入交互菜单")
+    subparsers = parser.add_subparsers(dest="command")
+
+    fetching = argparse.ArgumentParser(add_help=False)
+    fetching.add_argument("--workers", type=int, default=settings.SCRAPER_CONCURRENCY, help="并发请求数")
+    fetching.add_argument(
+        "--parse-workers", type=int, default=settings.SCRAPER_PARSE_WORKERS, help="解析进程数（0 为不用进程池）"
+    )
+    fetching.add_argument("--batch-size", type=int, default=100, help="每批编号数（每批结束写入数据库并保存进度）")
+
+    options = argparse.ArgumentParser(add_help=False, parents=[fetching])
+    options.add_argument("--state", default=settings.SCRAPER_STATE_FILE, help="任务状态文件")
+    options.add_argument("--max-attempts", type=int, default=3, help="单个编号最多尝试次数")
+
+    crawl = subparsers.add_parser("crawl", parents=[options], help="创建新任务并运行")
+    for resource, (start_id, end_id) in DEFAULT_RANGES.items():
+        crawl.add_argument(
+            f"--{resource}", type=parse_range, metavar="START-END",
+            help=f"{resource} 编号区间（都不指定时爬取全部，默认 {start_id}-{end_id}）"
+        )
+    crawl.add_argument("--force", action="store_true", help="覆盖已存在的状态文件")
+
+    resume = subparsers.add_parser("resume", parents=[options], help="从状态文件继续未完成的任务")
+    resume.add_argument("--retry-failed", action="store_true", help="清零失败次数，重新尝试失败的编号")
+
+    subparsers.add_parser("status", parents=[options], help="查看任务进度")
+
+    sync = subparsers.add_parser("sync", parents=[fetching], help="按上游索引增量同步，只写入新增和变化的记录")
+    sync.add_argument(
+        "resources", nargs="*", metavar="RESOURCE",
+        help=f"要同步的资源（{'/'.join(DEFAULT_RANGES)}，默认全部）"
+    )
+    sync.add_argument("--max-id", type=int, help="忽略大于该编号的条目（如 9999 跳过宝可梦特殊形态）")
+    sync.add_argument("--page-size", type=int, default=500, help="索引每页条目数")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        interactive()
+        return
+
+    if args.command == "sync":
+        unknown = set(args.resources) - set(DEFAULT_RANGES)
+        if unknown:
+            parser.error(f"未知资源类型: {', '.join(sorted(unknown))}")
+        sync = DeltaSync(
+            SessionLocal, resources=args.resources or DEFAULT_RANGES,
+            workers=args.workers, batch_size=args.batch_size, page_size=args.page_size,
+            max_id=args.max_id, parse_workers=args.parse_workers
+        )
+        sync.run()
+        return
+
+    if args.command == "crawl":
+        if os.path.exists(args.state) and not args.force:
+            print(f"状态文件 {args.state} 已存在，继续请用 resume，重新开始请加 --force")
+            sys.exit(1)
+        ranges = {resource: getattr(args, resource) for resource in DEFAULT_RANGES if getattr(args, resource)}
+        state = CrawlState.create(args.state, ranges or DEFAULT_RANGES)
+    else:
+        if not os.path.exists(args.state):
+            print(f"状态文件 {args.state} 不存在，请先用 crawl 创建任务")
+            sys.exit(1)
+        state = CrawlState.load(args.state)
+
+    if args.command == "status":
+        print(json.dumps(state.summary(args.max_attempts), ensure_ascii=False, indent=2))
+        return
+    if args.command == "resume" and args.retry_failed:
+        state.reset_failed()
+
+    job = CrawlJob(
+        state, SessionLocal,
+        workers=args.workers, batch_size=args.batch_size, max_attempts=args.max_attempts,
+        parse_workers=args.parse_workers
+    )
+    job.run()
+    print(json.dumps(state.summary(args.max_attempts), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
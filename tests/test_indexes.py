@@ -0,0 +1,43 @@
+"""
+索引回归测试：列表、计数、游标分页的筛选查询和表数据版本探针在 SQLite 上都不能退化为全表扫描
+
+执行计划由 EXPLAIN QUERY PLAN 给出，出现不带索引的 "SCAN 表名" 即失败。
+对 MySQL 的检查见 benchmarks/explain_indexes.py --url。
+"""
+import pytest
+from sqlalchemy import create_engine
+
+from app.crud import pokemon_crud, move_crud, ability_crud, item_crud
+
+from benchmarks.explain_indexes import CASES, explain, seed, statements
+
+ROWS = 2000
+
+
+@pytest.fixture(scope="module")
+def conn(tmp_path_factory):
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('indexes') / 'explain.db'}")
+    seed(engine, ROWS)
+    with engine.connect() as conn:
+        yield conn
+    engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "crud, filters, kind",
+    [
+        pytest.param(crud, filters, kind, id=f"{label}-{kind}")
+        for label, crud, filters in CASES
+        for kind in ("页面+总数", "计数", "游标分页")
+    ],
+)
+def test_filtered_queries_use_indexes(conn, crud, filters, kind):
+    stmt = dict(statements(crud, filters))[kind]
+    lines, scans = explain(conn, stmt)
+    assert not scans, "全表扫描:\n" + "\n".join(lines)
+
+
+@pytest.mark.parametrize("crud", [pokemon_crud, move_crud, ability_crud, item_crud], ids=lambda crud: crud.model.__tablename__)
+def test_version_probe_uses_index(conn, crud):
+    lines, scans = explain(conn, crud.version.statement())
+    assert not scans, "全表扫描:\n" + "\n".join(lines)